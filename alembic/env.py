@@ -73,6 +73,12 @@ def sort_tables_by_foreign_key_dependency(metadata):
 # ✅ Apply sorted metadata
 target_metadata = sort_tables_by_foreign_key_dependency(Base.metadata)
 
+def include_object(object, name, type_, reflected, compare_to):
+    """chat_messages' partitions belong to app.core.partitions, not to autogenerate"""
+    if type_ == "table" and reflected and compare_to is None and name.startswith("chat_messages_r"):
+        return False
+    return True
+
 # -----------------------------
 # 🧩 2. Database connection URL
 # -----------------------------
@@ -96,6 +102,7 @@ def run_migrations_offline() -> None:
         dialect_opts={"paramstyle": "named"},
         compare_type=True,
         render_as_batch=True,
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -105,7 +112,8 @@ def do_run_migrations(connection: Connection) -> None:
     context.configure(
         connection=connection,
         target_metadata=target_metadata,
-        compare_type=True
+        compare_type=True,
+        include_object=include_object
     )
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,26 @@
+"""add website webhook secret
+
+Revision ID: c41e7a9b2d58
+Revises: 8d2b6e4f1c07
+Create Date: 2026-10-19 15:21:47.730164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9b2d58'
+down_revision: Union[str, None] = '8d2b6e4f1c07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('websites', sa.Column('webhook_secret', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('websites', 'webhook_secret')
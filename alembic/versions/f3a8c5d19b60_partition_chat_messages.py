@@ -0,0 +1,148 @@
+"""partition chat_messages by retention class and month
+
+Revision ID: f3a8c5d19b60
+Revises: c41e7a9b2d58
+Create Date: 2026-10-19 18:42:05.118734
+
+On Postgres chat_messages becomes LIST (retention_days) partitioned, each
+class RANGE (created_at) partitioned by month; app.core.partitions keeps
+the months ahead and drops expired ones. Existing rows are copied into
+the new table, so run this in a maintenance window on a large table.
+
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c5d19b60'
+down_revision: Union[str, None] = 'c41e7a9b2d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Retention classes at the time of this migration (0 = kept forever)
+RETENTION_CLASSES = (30, 90, 180, 365, 730, 1825, 0)
+PREMAKE_MONTHS = 3
+
+COLUMNS = (
+    "message_id, session_id, message_type, message_content, message_metadata, "
+    "created_at, response_time_ms, tokens_used, is_user_message"
+)
+
+
+def _month(day: date, months: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.add_column('resource_plans', sa.Column('chat_retention_days', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE resource_plans SET chat_retention_days = CASE plan_type "
+        "WHEN 'starter' THEN 90 WHEN 'professional' THEN 365 WHEN 'enterprise' THEN 730 END"
+    )
+    op.add_column('chat_sessions', sa.Column('retention_days', sa.Integer(), server_default='0', nullable=False))
+
+    if bind.dialect.name != 'postgresql':
+        op.add_column('chat_messages', sa.Column('retention_days', sa.Integer(), server_default='0', nullable=False))
+        return
+
+    classes = ", ".join(str(days) for days in RETENTION_CLASSES if days)
+    # A plan's retention rounds up to a class; no limit, or one beyond every class, is 0
+    op.execute(f"""
+        UPDATE chat_sessions s
+        SET retention_days = COALESCE(
+            (SELECT min(c) FROM unnest(ARRAY[{classes}]) AS c WHERE c >= p.chat_retention_days), 0
+        )
+        FROM websites w
+        JOIN client_companies cc ON cc.id = w.company_id
+        JOIN resource_plans p ON p.id = cc.resource_plan_id
+        WHERE w.id = s.website_id AND p.chat_retention_days IS NOT NULL
+    """)
+
+    op.execute("ALTER TABLE chat_messages RENAME TO chat_messages_unpartitioned")
+    op.execute("ALTER INDEX chat_messages_pkey RENAME TO chat_messages_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_chat_messages_message_id RENAME TO ix_chat_messages_unpartitioned_message_id")
+    op.execute("ALTER SEQUENCE chat_messages_message_id_seq OWNED BY NONE")
+
+    # The primary key has to contain both partition keys
+    op.execute("""
+        CREATE TABLE chat_messages (
+            message_id integer NOT NULL DEFAULT nextval('chat_messages_message_id_seq'),
+            session_id integer NOT NULL REFERENCES chat_sessions (session_id),
+            message_type varchar(50) NOT NULL,
+            message_content text NOT NULL,
+            message_metadata json,
+            created_at timestamp without time zone NOT NULL,
+            response_time_ms integer,
+            tokens_used numeric(10, 2),
+            is_user_message boolean NOT NULL,
+            retention_days integer NOT NULL DEFAULT 0,
+            CONSTRAINT chat_messages_pkey PRIMARY KEY (message_id, retention_days, created_at)
+        ) PARTITION BY LIST (retention_days)
+    """)
+    op.execute("ALTER SEQUENCE chat_messages_message_id_seq OWNED BY chat_messages.message_id")
+    op.create_index(op.f('ix_chat_messages_message_id'), 'chat_messages', ['message_id'], unique=False)
+    op.create_index('ix_chat_messages_session_id_message_id', 'chat_messages', ['session_id', 'message_id'])
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM chat_messages_unpartitioned")).scalar()
+    today = datetime.utcnow().date()
+    first = _month(min(oldest.date(), today) if oldest else today)
+    last = _month(today, PREMAKE_MONTHS)
+    for days in RETENTION_CLASSES:
+        op.execute(
+            f"CREATE TABLE chat_messages_r{days} PARTITION OF chat_messages "
+            f"FOR VALUES IN ({days}) PARTITION BY RANGE (created_at)"
+        )
+        month = first
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE chat_messages_r{days}_{month:%Y_%m} PARTITION OF chat_messages_r{days} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_month(month, 1).isoformat()}')"
+            )
+            month = _month(month, 1)
+
+    op.execute(f"""
+        INSERT INTO chat_messages ({COLUMNS}, retention_days)
+        SELECT {', '.join('m.' + column.strip() for column in COLUMNS.split(','))}, s.retention_days
+        FROM chat_messages_unpartitioned m
+        JOIN chat_sessions s ON s.session_id = m.session_id
+    """)
+    op.execute("DROP TABLE chat_messages_unpartitioned")
+    op.execute("ANALYZE chat_messages")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("ALTER TABLE chat_messages RENAME TO chat_messages_partitioned")
+        op.execute("ALTER INDEX chat_messages_pkey RENAME TO chat_messages_partitioned_pkey")
+        op.execute("ALTER INDEX ix_chat_messages_message_id RENAME TO ix_chat_messages_partitioned_message_id")
+        op.execute("ALTER SEQUENCE chat_messages_message_id_seq OWNED BY NONE")
+        op.execute("""
+            CREATE TABLE chat_messages (
+                message_id integer NOT NULL DEFAULT nextval('chat_messages_message_id_seq'),
+                session_id integer NOT NULL REFERENCES chat_sessions (session_id),
+                message_type varchar(50) NOT NULL,
+                message_content text NOT NULL,
+                message_metadata json,
+                created_at timestamp without time zone NOT NULL,
+                response_time_ms integer,
+                tokens_used numeric(10, 2),
+                is_user_message boolean NOT NULL,
+                CONSTRAINT chat_messages_pkey PRIMARY KEY (message_id)
+            )
+        """)
+        op.execute("ALTER SEQUENCE chat_messages_message_id_seq OWNED BY chat_messages.message_id")
+        op.create_index(op.f('ix_chat_messages_message_id'), 'chat_messages', ['message_id'], unique=False)
+        op.execute(f"INSERT INTO chat_messages ({COLUMNS}) SELECT {COLUMNS} FROM chat_messages_partitioned")
+        # Drops every partition with it
+        op.execute("DROP TABLE chat_messages_partitioned")
+    else:
+        op.drop_column('chat_messages', 'retention_days')
+    op.drop_column('chat_sessions', 'retention_days')
+    op.drop_column('resource_plans', 'chat_retention_days')
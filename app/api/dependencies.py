@@ -1,92 +1,145 @@
-from typing import Annotated
-from fastapi import Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.services.company_service import CompanyService
-from app.services.website_service import WebsiteService  
-from app.services.user_service import UserService  
-from app.repositories.company_repository import CompanyRepository
-from app.repositories.user_repository import UserRepository
-from app.repositories.website_repository import WebsiteRepository  
-
-
-# ========================
-# Repository Dependencies
-# ========================
-
-def get_company_repository(
-    db: AsyncSession = Depends(get_db)
-) -> CompanyRepository:
-    """Get company repository instance"""
-    return CompanyRepository(db)
-
-
-def get_user_repository(
-    db: AsyncSession = Depends(get_db)
-) -> UserRepository:
-    """Get user repository instance"""
-    return UserRepository(db)
-
-
-def get_website_repository(
-    db: AsyncSession = Depends(get_db)
-) -> WebsiteRepository:
-    """Get website repository instance"""
-    return WebsiteRepository(db)
-
-
-# ========================
-# Service Dependencies
-# ========================
-
-def get_company_service(
-    db: AsyncSession = Depends(get_db)
-) -> CompanyService:
-    """Get company service instance"""
-    return CompanyService(db)
-
-
-def get_website_service(
-    db: AsyncSession = Depends(get_db)
-) -> WebsiteService:
-    """Get website service instance"""
-    return WebsiteService(db)
-
-
-def get_user_service(
-    db: AsyncSession = Depends(get_db)
-) -> UserService:
-    """Get user service instance"""
-    return UserService(db)
-
-
-# ========================
-# Pagination Dependencies
-# ========================
-
-def get_pagination_params(
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(10, ge=1, le=100, description="Items per page")
-) -> dict:
-    """Get pagination parameters"""
-    skip = (page - 1) * page_size
-    return {
-        "skip": skip,
-        "limit": page_size,
-        "page": page,
-        "page_size": page_size
-    }
-
-
-# ========================
-# Type Aliases (for FastAPI dependency injection)
-# ========================
-
-CompanyServiceDep = Annotated[CompanyService, Depends(get_company_service)]
-WebsiteServiceDep = Annotated[WebsiteService, Depends(get_website_service)]  
-UserServiceDep = Annotated[UserService, Depends(get_user_service)] 
-CompanyRepositoryDep = Annotated[CompanyRepository, Depends(get_company_repository)]
-UserRepositoryDep = Annotated[UserRepository, Depends(get_user_repository)]
-WebsiteRepositoryDep = Annotated[WebsiteRepository, Depends(get_website_repository)] 
-PaginationDep = Annotated[dict, Depends(get_pagination_params)]
+from typing import Annotated, Optional, Type
+from fastapi import Depends, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.sql_instrumentation import current_request_queries
+from app.services.company_service import CompanyService
+from app.services.website_service import WebsiteService  
+from app.services.user_service import UserService  
+from app.repositories.company_repository import CompanyRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.website_repository import WebsiteRepository  
+from app.schemas.fieldsets import Fieldset, parse_fieldset
+
+
+# ========================
+# Repository Dependencies
+# ========================
+
+def get_company_repository(
+    db: AsyncSession = Depends(get_db)
+) -> CompanyRepository:
+    """Get company repository instance"""
+    return CompanyRepository(db)
+
+
+def get_user_repository(
+    db: AsyncSession = Depends(get_db)
+) -> UserRepository:
+    """Get user repository instance"""
+    return UserRepository(db)
+
+
+def get_website_repository(
+    db: AsyncSession = Depends(get_db)
+) -> WebsiteRepository:
+    """Get website repository instance"""
+    return WebsiteRepository(db)
+
+
+# ========================
+# Service Dependencies
+# ========================
+
+def get_company_service(
+    db: AsyncSession = Depends(get_db)
+) -> CompanyService:
+    """Get company service instance"""
+    return CompanyService(db)
+
+
+def get_website_service(
+    db: AsyncSession = Depends(get_db)
+) -> WebsiteService:
+    """Get website service instance"""
+    return WebsiteService(db)
+
+
+def get_user_service(
+    db: AsyncSession = Depends(get_db)
+) -> UserService:
+    """Get user service instance"""
+    return UserService(db)
+
+
+# ========================
+# Pagination Dependencies
+# ========================
+
+def get_pagination_params(
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(10, ge=1, le=100, description="Items per page")
+) -> dict:
+    """Get pagination parameters"""
+    skip = (page - 1) * page_size
+    return {
+        "skip": skip,
+        "limit": page_size,
+        "page": page,
+        "page_size": page_size
+    }
+
+
+# ========================
+# Sparse Fieldset Dependencies
+# ========================
+
+class FieldsetParams:
+    """
+    Parses ?fields= against a response model.
+    
+    Usage: fieldset: Fieldset = Depends(FieldsetParams(WebsiteResponse))
+    """
+    
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        default_model: Optional[Type[BaseModel]] = None
+    ):
+        self.model = model
+        self.default_model = default_model
+    
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None,
+            description="Comma-separated fields to return, e.g. id,website_name,widget_status"
+        )
+    ) -> Fieldset:
+        return parse_fieldset(self.model, fields, self.default_model)
+
+
+# ========================
+# Query Budget Dependencies
+# ========================
+
+class QueryBudget:
+    """
+    Declares the most SQL statements an endpoint may run per request,
+    enforced by QueryBudgetMiddleware.
+    
+    Usage: @router.get(..., dependencies=[Depends(QueryBudget(4))])
+    """
+    
+    def __init__(self, max_queries: int):
+        self.max_queries = max_queries
+    
+    async def __call__(self) -> None:
+        queries = current_request_queries()
+        if queries is not None:
+            queries.budget = self.max_queries
+
+
+# ========================
+# Type Aliases (for FastAPI dependency injection)
+# ========================
+
+CompanyServiceDep = Annotated[CompanyService, Depends(get_company_service)]
+WebsiteServiceDep = Annotated[WebsiteService, Depends(get_website_service)]  
+UserServiceDep = Annotated[UserService, Depends(get_user_service)] 
+CompanyRepositoryDep = Annotated[CompanyRepository, Depends(get_company_repository)]
+UserRepositoryDep = Annotated[UserRepository, Depends(get_user_repository)]
+WebsiteRepositoryDep = Annotated[WebsiteRepository, Depends(get_website_repository)] 
+PaginationDep = Annotated[dict, Depends(get_pagination_params)]
 DatabaseDep = Annotated[AsyncSession, Depends(get_db)]
\ No newline at end of file
@@ -1,3 +1,3 @@
-from . import auth, companies, websites, users
-
-__all__ = ["auth", "companies", "websites", "users"]
\ No newline at end of file
+from . import auth, companies, websites, users, widget, admin, exports, chat
+
+__all__ = ["auth", "companies", "websites", "users", "widget", "admin", "exports", "chat"]
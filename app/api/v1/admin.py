@@ -0,0 +1,318 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import AuthDependencies
+from app.core.config import settings
+from app.core.database import get_db, replica_set
+from app.core.outbox import dead_jobs, outbox_stats, retry_job
+from app.core.partitions import chat_partition_maintainer, partition_status
+from app.core.profiler import collapse, sampling_profiler, triggered_profiler
+from app.core.sql_instrumentation import query_stats
+from app.core.timing import route_timings
+from app.middleware.compression import compression_stats
+from app.exceptions import BaseAPIException, ResourceNotFoundException
+from app.models.system_admin import SystemAdmin
+from app.services.context_service import context_engine
+from app.services.inference_service import inference_gateway
+from app.services.response_cache import response_cache
+from app.services.semantic_cache import semantic_cache
+from app.services.webhook_service import webhook_dispatcher
+
+router = APIRouter()
+auth_deps = AuthDependencies()
+
+
+@router.get(
+    "/metrics/compression",
+    summary="[Admin] Compression metrics",
+    description="Bytes saved by response compression versus CPU time spent on it"
+)
+async def get_compression_metrics(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get response compression counters for this worker"""
+    return {
+        "success": True,
+        "data": compression_stats.snapshot()
+    }
+
+
+@router.get(
+    "/database/replicas",
+    summary="[Admin] Replica status",
+    description="Health and replication lag of each read replica, as last checked"
+)
+async def get_replica_status(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get read replica health for this worker"""
+    return {
+        "success": True,
+        "data": replica_set.status()
+    }
+
+
+@router.get(
+    "/metrics/sql",
+    summary="[Admin] SQL statement metrics",
+    description="Per-fingerprint statement counts and latency percentiles"
+)
+async def get_sql_metrics(
+    limit: int = Query(50, ge=1, le=500, description="Number of fingerprints to return"),
+    order_by: Literal["total", "mean", "p99", "max", "calls"] = Query("total", description="Sort key"),
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get SQL statement counters for this worker"""
+    return {
+        "success": True,
+        "data": query_stats.snapshot(limit=limit, order_by=order_by)
+    }
+
+
+@router.get(
+    "/metrics/timing",
+    summary="[Admin] Request phase timing",
+    description="Per-route histograms of auth, principal, db, validation, serialization and error-handler time"
+)
+async def get_timing_metrics(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get per-route phase histograms for this worker"""
+    return {
+        "success": True,
+        "data": route_timings.snapshot()
+    }
+
+
+# ========================
+# Profiling
+# ========================
+
+def _collapsed_response(stacks, name: str) -> PlainTextResponse:
+    return PlainTextResponse(
+        collapse(stacks),
+        headers={"Content-Disposition": f'attachment; filename="{name}.folded"'}
+    )
+
+
+@router.get(
+    "/profiler/sample",
+    response_class=PlainTextResponse,
+    summary="[Admin] Sample the event loop",
+    description="Samples this worker's event loop for N seconds and returns collapsed stacks "
+                "(flamegraph.pl / speedscope input)"
+)
+async def sample_profile(
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Profile this worker under its current load"""
+    if sampling_profiler.running:
+        raise BaseAPIException("A profile is already running", status_code=status.HTTP_409_CONFLICT)
+    stacks = await sampling_profiler.profile(seconds)
+    return _collapsed_response(stacks, f"profile-{datetime.utcnow():%Y%m%dT%H%M%SZ}")
+
+
+@router.post(
+    "/profiler/trigger",
+    summary="[Admin] Profile slow requests",
+    description="Captures stacks of requests slower than threshold_ms (optionally one route "
+                "template, e.g. /api/v1/websites/{website_id}) until max_captures or ttl_seconds"
+)
+async def arm_profiler_trigger(
+    threshold_ms: float = Query(1000.0, gt=0),
+    route: Optional[str] = Query(None, description="Route template; all routes when omitted"),
+    max_captures: int = Query(5, ge=1, le=settings.PROFILER_MAX_CAPTURES),
+    ttl_seconds: float = Query(300.0, gt=0, le=3600),
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Arm triggered profiling on this worker"""
+    return {
+        "success": True,
+        "data": triggered_profiler.arm(threshold_ms, route, max_captures, ttl_seconds)
+    }
+
+
+@router.delete(
+    "/profiler/trigger",
+    summary="[Admin] Stop profiling slow requests"
+)
+async def disarm_profiler_trigger(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Disarm triggered profiling; captures are kept"""
+    triggered_profiler.disarm()
+    return {
+        "success": True,
+        "data": triggered_profiler.status()
+    }
+
+
+@router.get(
+    "/profiler/trigger",
+    summary="[Admin] Triggered profiling status",
+    description="Trigger state and the captures taken so far"
+)
+async def get_profiler_trigger(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get triggered profiling status for this worker"""
+    return {
+        "success": True,
+        "data": triggered_profiler.status()
+    }
+
+
+@router.get(
+    "/profiler/captures/{capture_id}",
+    response_class=PlainTextResponse,
+    summary="[Admin] Download a slow-request capture",
+    description="Collapsed stacks sampled while the captured request ran"
+)
+async def get_profiler_capture(
+    capture_id: int,
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get one capture as collapsed stacks"""
+    capture = triggered_profiler.capture(capture_id)
+    if capture is None:
+        raise ResourceNotFoundException("Profile capture", capture_id)
+    return _collapsed_response(capture["stacks"], f"capture-{capture_id}")
+
+
+@router.get(
+    "/outbox",
+    summary="[Admin] Outbox status",
+    description="Background job counts per type and status, and the age of the oldest due job"
+)
+async def get_outbox_status(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get outbox queue depth"""
+    return {
+        "success": True,
+        "data": await outbox_stats(db)
+    }
+
+
+@router.get(
+    "/outbox/dead",
+    summary="[Admin] Dead-lettered jobs",
+    description="Jobs that used up their attempts, most recent first"
+)
+async def get_dead_jobs(
+    limit: int = Query(50, ge=1, le=500),
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser),
+    db: AsyncSession = Depends(get_db)
+):
+    """List dead-lettered outbox jobs"""
+    return {
+        "success": True,
+        "data": await dead_jobs(db, limit)
+    }
+
+
+@router.post(
+    "/outbox/{job_id}/retry",
+    summary="[Admin] Retry a dead-lettered job"
+)
+async def retry_dead_job(
+    job_id: int,
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue a dead job again with a fresh attempt budget"""
+    if not await retry_job(db, job_id):
+        raise ResourceNotFoundException("Dead outbox job", job_id)
+    return {
+        "success": True,
+        "message": "Job queued for retry"
+    }
+
+
+@router.get(
+    "/webhooks",
+    summary="[Admin] Webhook delivery status",
+    description="Circuit breaker state of each webhook destination host"
+)
+async def get_webhook_status(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get webhook dispatcher state for this worker"""
+    return {
+        "success": True,
+        "data": webhook_dispatcher.status()
+    }
+
+
+@router.get(
+    "/inference",
+    summary="[Admin] Inference gateway stats",
+    description="Per-model request, coalescing, error and token counts, and context cache use, for this worker"
+)
+async def get_inference_stats(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get inference gateway counters for this worker"""
+    return {
+        "success": True,
+        "data": {**inference_gateway.stats(), "context": context_engine.stats()}
+    }
+
+
+@router.get(
+    "/inference/cache",
+    summary="[Admin] Response cache stats",
+    description="Per-website hit rate, saved tokens and memory of the response caches for this worker"
+)
+async def get_response_cache_stats(
+    website_id: Optional[int] = Query(None, description="Only this website"),
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Get exact and semantic response cache counters for this worker"""
+    data = response_cache.stats(website_id)
+    data["semantic"] = semantic_cache.stats(website_id)
+    return {
+        "success": True,
+        "data": data
+    }
+
+
+@router.get(
+    "/partitions",
+    summary="[Admin] Chat message partitions",
+    description="Monthly chat_messages partitions per retention class with estimated rows and size"
+)
+async def get_chat_partitions(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser),
+    db: AsyncSession = Depends(get_db)
+):
+    """List chat_messages partitions (empty when the table is not partitioned)"""
+    return {
+        "success": True,
+        "data": {
+            "partitions": await partition_status(db),
+            "last_maintenance": chat_partition_maintainer.last_run,
+            "running_out": chat_partition_maintainer.running_out,
+        }
+    }
+
+
+@router.post(
+    "/partitions/maintain",
+    summary="[Admin] Run chat partition maintenance",
+    description="Create upcoming partitions and drop expired ones now instead of at the next scheduled run"
+)
+async def run_partition_maintenance(
+    current_admin: SystemAdmin = Depends(auth_deps.require_superuser)
+):
+    """Run one partition maintenance pass"""
+    return {
+        "success": True,
+        "data": await chat_partition_maintainer.maintain()
+    }
@@ -1,175 +1,101 @@
-from datetime import datetime, timedelta
-from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
-from ...core.database import get_db
-from ...core.security import security_service
-from ...core.config import settings
-from ...models.system_admin import SystemAdmin
-from ...models.company_user import CompanyUser
-from ...schemas.auth import Token, LoginRequest, RefreshTokenRequest
-
-router = APIRouter()
-
-@router.post("/admin/login", response_model=Token)
-async def admin_login(
-    form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db)
-):
-    # Find admin
-    result = await db.execute(
-        select(SystemAdmin).where(
-            SystemAdmin.username == form_data.username,
-            SystemAdmin.is_active == True
-        )
-    )
-    admin = result.scalar_one_or_none()
-    
-    # Verify credentials
-    if not admin or not security_service.verify_password(form_data.password, admin.password_hash):
-        # Update failed login attempts
-        if admin:
-            admin.failed_login_attempts += 1
-            if admin.failed_login_attempts >= 5:
-                admin.locked_until = datetime.utcnow() + timedelta(minutes=30)
-            await db.commit()
-        
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password"
-        )
-    
-    # Check if account is locked
-    if admin.locked_until and admin.locked_until > datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_423_LOCKED,
-            detail="Account is temporarily locked"
-        )
-    
-    # Create tokens
-    access_token = security_service.create_access_token(
-        subject=admin.id,
-        extra_claims={
-            "user_type": "admin",
-            "is_superuser": admin.is_superuser
-        }
-    )
-    refresh_token = security_service.create_refresh_token(
-        subject=admin.id,
-        extra_claims={"user_type": "admin"}
-    )
-    
-    # Update login info
-    admin.last_login_at = datetime.utcnow()
-    admin.failed_login_attempts = 0
-    admin.locked_until = None
-    await db.commit()
-    
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer",
-        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    }
-
-@router.post("/company/login", response_model=Token)
-async def company_user_login(
-    form_data: OAuth2PasswordRequestForm = Depends(),
-    db: AsyncSession = Depends(get_db)
-):
-    # Find user
-    result = await db.execute(
-        select(CompanyUser).where(
-            CompanyUser.username == form_data.username,
-            CompanyUser.is_active == True
-        )
-    )
-    user = result.scalar_one_or_none()
-    
-    # Verify credentials
-    if not user or not security_service.verify_password(form_data.password, user.password_hash):
-        if user:
-            user.failed_login_attempts += 1
-            if user.failed_login_attempts >= 5:
-                user.locked_until = datetime.utcnow() + timedelta(minutes=30)
-            await db.commit()
-        
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password"
-        )
-    
-    # Check if account is locked
-    if user.locked_until and user.locked_until > datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_423_LOCKED,
-            detail="Account is temporarily locked"
-        )
-    
-    # Create tokens
-    access_token = security_service.create_access_token(
-        subject=user.id,
-        extra_claims={
-            "user_type": "company_user",
-            "company_id": user.company_id,
-            "role": user.role,
-            "is_master": user.is_master_user
-        }
-    )
-    refresh_token = security_service.create_refresh_token(
-        subject=user.id,
-        extra_claims={
-            "user_type": "company_user",
-            "company_id": user.company_id
-        }
-    )
-    
-    # Update login info
-    user.last_login_at = datetime.utcnow()
-    user.failed_login_attempts = 0
-    user.locked_until = None
-    await db.commit()
-    
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh_token,
-        "token_type": "bearer",
-        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    }
-
-
-@router.post("/refresh", response_model=Token)
-async def refresh_token(
-    refresh: RefreshTokenRequest = Body(...)
-):
-    payload = security_service.decode_token(refresh.refresh_token)
-    if not payload or payload.get("type") != "refresh":
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
-    user_id = payload.get("sub")
-    user_type = payload.get("user_type")
-    access_token = security_service.create_access_token(
-        subject=user_id,
-        extra_claims={"user_type": user_type}
-    )
-    return {
-        "access_token": access_token,
-        "refresh_token": refresh.refresh_token,
-        "token_type": "bearer",
-        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
-    }
-
-
-@router.post("/logout")
-async def logout():
-    # Stateless JWT: logout is handled client-side
-    return {"message": "Logged out"}
-
-
-@router.post("/password-reset-request")
-async def password_reset_request(
-    req: LoginRequest = Body(...)
-):
-    # TODO: Implement password reset email logic
-    return {"message": "Password reset instructions sent if email exists."}
\ No newline at end of file
+from typing import Annotated, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Body
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...core.database import get_db
+from ...core.security import security_service
+from ...core.config import settings
+from ...core.token_revocation import revocation_list
+from ..deps import get_current_token
+from ...services.auth_service import AuthService
+from ...schemas.auth import Token, PasswordResetRequest, PasswordResetConfirm, RefreshTokenRequest
+
+router = APIRouter()
+
+@router.post("/admin/login", response_model=Token)
+async def admin_login(
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    service = AuthService(db)
+    return await service.admin_login(
+        form_data.username, form_data.password, background_tasks
+    )
+
+@router.post("/company/login", response_model=Token)
+async def company_user_login(
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    service = AuthService(db)
+    return await service.company_user_login(
+        form_data.username, form_data.password, background_tasks
+    )
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_token(
+    refresh: RefreshTokenRequest = Body(...)
+):
+    payload = security_service.decode_token(refresh.refresh_token)
+    # Rotate: revoking the presented token is the check, so of two concurrent
+    # requests with the same refresh token only one gets new tokens
+    if (
+        not payload
+        or payload.get("type") != "refresh"
+        or not await revocation_list.revoke(payload)
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    user_id = payload.get("sub")
+    claims = {
+        key: payload[key] for key in ("user_type", "company_id") if key in payload
+    }
+    access_token = security_service.create_access_token(
+        subject=user_id,
+        extra_claims=claims
+    )
+    new_refresh_token = security_service.create_refresh_token(
+        subject=user_id,
+        extra_claims=claims
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": new_refresh_token,
+        "token_type": "bearer",
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+
+@router.post("/logout")
+async def logout(
+    token_data: dict = Depends(get_current_token),
+    refresh: Optional[RefreshTokenRequest] = Body(None)
+):
+    # Revoke the presented access token and, if sent, its refresh token
+    await revocation_list.revoke(token_data)
+    if refresh:
+        payload = security_service.decode_token(refresh.refresh_token)
+        if payload and payload.get("type") == "refresh" and payload.get("sub") == token_data.get("sub"):
+            await revocation_list.revoke(payload)
+    return {"message": "Logged out"}
+
+
+@router.post("/password-reset-request")
+async def password_reset_request(
+    req: PasswordResetRequest = Body(...),
+    db: AsyncSession = Depends(get_db)
+):
+    # The email goes out through the outbox; the response is the same either way
+    await AuthService(db).request_password_reset(req.email)
+    return {"message": "Password reset instructions sent if email exists."}
+
+
+@router.post("/password-reset")
+async def password_reset(
+    req: PasswordResetConfirm = Body(...),
+    db: AsyncSession = Depends(get_db)
+):
+    await AuthService(db).reset_password(req.token, req.new_password)
+    return {"message": "Password has been reset."}
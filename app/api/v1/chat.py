@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, status, HTTPException
+
+from app.api.dependencies import DatabaseDep, QueryBudget
+from app.api.deps import AuthDependencies
+from app.services.chat_service import ChatService
+from app.schemas.chat import (
+    ChatSessionCreate,
+    ChatSessionResponse,
+    ChatMessageCreate,
+    ChatMessageResponse,
+    ChatReplyResponse
+)
+from app.schemas.responses import SuccessResponse, success_json
+from app.models.company_user import CompanyUser
+from app.models.website import Website
+
+router = APIRouter()
+auth_deps = AuthDependencies()
+
+
+def _check_access(website: Website, current_user: CompanyUser) -> None:
+    if website.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this website"
+        )
+
+
+@router.post(
+    "/sessions",
+    dependencies=[Depends(QueryBudget(8))],
+    response_model=SuccessResponse[ChatSessionResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Start chat session",
+    description="Open a chat session on the website's AI model"
+)
+async def start_session(
+    session_data: ChatSessionCreate,
+    db: DatabaseDep,
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """Start a chat session"""
+    service = ChatService(db)
+    website = await service.get_website(session_data.website_id)
+    _check_access(website, current_user)
+
+    session = await service.start_session(website, current_user.id, session_data.session_name)
+
+    return success_json(
+        data=ChatSessionResponse.model_validate(session),
+        message="Chat session started",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.post(
+    "/sessions/{session_id}/messages",
+    dependencies=[Depends(QueryBudget(12))],
+    response_model=SuccessResponse[ChatReplyResponse],
+    summary="Send chat message",
+    description="Send a message and get the AI model's reply"
+)
+async def send_message(
+    session_id: int,
+    message_data: ChatMessageCreate,
+    db: DatabaseDep,
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """
+    Send a message:
+    - Stores the message
+    - Calls the session's model with the recent conversation
+    - Stores and returns the reply
+    """
+    service = ChatService(db)
+    session, website = await service.get_session(session_id)
+    _check_access(website, current_user)
+
+    user_message, reply = await service.send_message(session, website, message_data.content)
+
+    return success_json(
+        data=ChatReplyResponse(
+            user_message=ChatMessageResponse.model_validate(user_message),
+            assistant_message=ChatMessageResponse.model_validate(reply)
+        )
+    )
+
+
+@router.post(
+    "/sessions/{session_id}/end",
+    dependencies=[Depends(QueryBudget(4))],
+    response_model=SuccessResponse[ChatSessionResponse],
+    summary="End chat session"
+)
+async def end_session(
+    session_id: int,
+    db: DatabaseDep,
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """End a chat session"""
+    service = ChatService(db)
+    session, website = await service.get_session(session_id)
+    _check_access(website, current_user)
+
+    session = await service.end_session(session, website)
+
+    return success_json(
+        data=ChatSessionResponse.model_validate(session),
+        message="Chat session ended"
+    )
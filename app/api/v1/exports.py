@@ -0,0 +1,105 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.sql import Select
+
+from app.api.dependencies import DatabaseDep
+from app.api.deps import AuthDependencies
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+from app.services.website_service import WebsiteService
+from app.models.company_user import CompanyUser
+from app.models.system_admin import SystemAdmin
+
+router = APIRouter()
+auth_deps = AuthDependencies()
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+def _export_response(
+    service: ExportService,
+    query: Select,
+    export_format: str,
+    name: str
+) -> StreamingResponse:
+    timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        service.stream(query, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}-{timestamp}.{export_format}"'
+        }
+    )
+
+
+@router.get(
+    "/companies",
+    summary="[Admin] Export companies",
+    description="Stream all companies as NDJSON or CSV"
+)
+async def export_companies(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="ndjson or csv"),
+    since: Optional[datetime] = Query(None, description="Only rows changed at or after this time"),
+    current_admin: SystemAdmin = Depends(auth_deps.get_current_admin)
+):
+    """Export companies (ordered by last change, for incremental syncs)"""
+    service = ExportService()
+    return _export_response(service, service.companies_query(since), export_format, "companies")
+
+
+@router.get(
+    "/users",
+    summary="Export users",
+    description="Stream the company's users as NDJSON or CSV (master only)"
+)
+async def export_users(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="ndjson or csv"),
+    since: Optional[datetime] = Query(None, description="Only rows changed at or after this time"),
+    current_user: CompanyUser = Depends(auth_deps.require_master_user)
+):
+    """Export company users (credentials are never exported)"""
+    service = ExportService()
+    query = service.users_query(current_user.company_id, since)
+    return _export_response(service, query, export_format, "users")
+
+
+@router.get(
+    "/websites",
+    summary="Export websites",
+    description="Stream the company's websites as NDJSON or CSV"
+)
+async def export_websites(
+    export_format: ExportFormat = Query("ndjson", alias="format", description="ndjson or csv"),
+    since: Optional[datetime] = Query(None, description="Only rows changed at or after this time"),
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """Export company websites"""
+    service = ExportService()
+    query = service.websites_query(current_user.company_id, since)
+    return _export_response(service, query, export_format, "websites")
+
+
+@router.get(
+    "/websites/{website_id}/chat-messages",
+    summary="Export chat history",
+    description="Stream all chat messages of a website as NDJSON or CSV"
+)
+async def export_chat_messages(
+    website_id: int,
+    db: DatabaseDep,
+    export_format: ExportFormat = Query("ndjson", alias="format", description="ndjson or csv"),
+    since: Optional[datetime] = Query(None, description="Only messages created at or after this time"),
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """Export a website's chat messages, oldest first"""
+    website = await WebsiteService(db).get_website(website_id)
+    if website.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this website"
+        )
+
+    service = ExportService()
+    query = service.chat_messages_query(website_id, since)
+    return _export_response(service, query, export_format, f"website-{website_id}-chat-messages")
@@ -1,260 +1,345 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status, HTTPException
-
-from app.api.dependencies import PaginationDep, DatabaseDep
-from app.api.deps import AuthDependencies
-from app.services.website_service import WebsiteService
-from app.schemas.website import (
-    WebsiteCreate,
-    WebsiteUpdate,
-    WebsiteResponse,
-    WebsiteListResponse
-)
-from app.schemas.responses import (
-    SuccessResponse,
-    PaginatedResponse,
-    MessageResponse,
-    success_response,
-    paginated_response
-)
-from app.models.company_user import CompanyUser
-from app.models.system_admin import SystemAdmin
-
-router = APIRouter()
-auth_deps = AuthDependencies()
-
-
-@router.post(
-    "",
-    response_model=SuccessResponse[WebsiteResponse],
-    status_code=status.HTTP_201_CREATED,
-    summary="Create new website",
-    description="Create a new website for the company"
-)
-async def create_website(
-    website_data: WebsiteCreate,
-    db: DatabaseDep,
-    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
-):
-    """
-    Create a new website:
-    - Checks website limit based on plan
-    - Generates embed code
-    - Creates API endpoint
-    - Updates resource allocation
-    """
-    service = WebsiteService(db)
-    
-    # Check if user has permission (company_id must match)
-    if website_data.company_id != current_user.company_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Cannot create website for another company"
-        )
-    
-    # Convert Pydantic model to dict
-    website_dict = website_data.model_dump()
-    
-    website = await service.create_website(
-        website_dict,
-        current_user.company_id
-    )
-    
-    return success_response(
-        data=WebsiteResponse.model_validate(website),
-        message="Website created successfully"
-    )
-
-
-@router.get(
-    "",
-    response_model=PaginatedResponse[WebsiteListResponse],
-    summary="List websites",
-    description="Get all websites for the current user's company"
-)
-async def list_websites(
-    db: DatabaseDep,
-    pagination: PaginationDep,
-    active_only: bool = Query(False, description="Show only active websites"),
-    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
-):
-    """Get all websites for the company"""
-    service = WebsiteService(db)
-    
-    websites, total = await service.get_company_websites(
-        current_user.company_id,
-        skip=pagination["skip"],
-        limit=pagination["limit"],
-        active_only=active_only
-    )
-    
-    website_responses = [
-        WebsiteListResponse.model_validate(w) for w in websites
-    ]
-    
-    return paginated_response(
-        data=website_responses,
-        total=total,
-        page=pagination["page"],
-        page_size=pagination["page_size"]
-    )
-
-
-@router.get(
-    "/search",
-    response_model=SuccessResponse[List[WebsiteListResponse]],
-    summary="Search websites",
-    description="Search websites by name or domain"
-)
-async def search_websites(
-    db: DatabaseDep,
-    pagination: PaginationDep,
-    current_user: CompanyUser = Depends(auth_deps.get_current_company_user),
-    q: str = Query(..., min_length=2, description="Search query")
-):
-    """Search websites"""
-    service = WebsiteService(db)
-    
-    websites = await service.search_websites(
-        current_user.company_id,
-        q,
-        skip=pagination["skip"],
-        limit=pagination["limit"]
-    )
-    
-    website_responses = [
-        WebsiteListResponse.model_validate(w) for w in websites
-    ]
-    
-    return success_response(
-        data=website_responses,
-        message=f"Found {len(website_responses)} websites"
-    )
-
-
-@router.get(
-    "/{website_id}",
-    response_model=SuccessResponse[WebsiteResponse],
-    summary="Get website details",
-    description="Get detailed information about a specific website"
-)
-async def get_website(
-    website_id: int,
-    db: DatabaseDep,
-    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
-):
-    """Get website by ID"""
-    service = WebsiteService(db)
-    website = await service.get_website_with_details(website_id)
-    
-    # Check if user has access
-    if website.company_id != current_user.company_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to this website"
-        )
-    
-    return success_response(
-        data=WebsiteResponse.model_validate(website)
-    )
-
-
-@router.put(
-    "/{website_id}",
-    response_model=SuccessResponse[WebsiteResponse],
-    summary="Update website",
-    description="Update website information"
-)
-async def update_website(
-    website_id: int,
-    website_data: WebsiteUpdate,
-    db: DatabaseDep,
-    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
-):
-    """Update website"""
-    service = WebsiteService(db)
-    website = await service.get_website(website_id)
-    
-    # Check permissions
-    if website.company_id != current_user.company_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to this website"
-        )
-    
-    # Convert to dict and exclude unset values
-    update_dict = website_data.model_dump(exclude_unset=True)
-    
-    updated_website = await service.update_website(website_id, update_dict)
-    
-    return success_response(
-        data=WebsiteResponse.model_validate(updated_website),
-        message="Website updated successfully"
-    )
-
-
-@router.delete(
-    "/{website_id}",
-    response_model=MessageResponse,
-    summary="Delete website",
-    description="Soft delete a website"
-)
-async def delete_website(
-    website_id: int,
-    db: DatabaseDep,
-    current_user: CompanyUser = Depends(auth_deps.require_master_user)
-):
-    """Delete website (requires master user)"""
-    service = WebsiteService(db)
-    website = await service.get_website(website_id)
-    
-    # Check permissions
-    if website.company_id != current_user.company_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied to this website"
-        )
-    
-    await service.delete_website(website_id)
-    
-    return {
-        "success": True,
-        "message": "Website deleted successfully"
-    }
-
-
-# ========================
-# Admin Endpoints
-# ========================
-
-@router.get(
-    "/admin/company/{company_id}",
-    response_model=PaginatedResponse[WebsiteListResponse],
-    summary="[Admin] List company websites",
-    description="Admin: Get all websites for any company"
-)
-async def admin_list_company_websites(
-    company_id: int,
-    db: DatabaseDep,
-    pagination: PaginationDep,
-    current_admin: SystemAdmin = Depends(auth_deps.get_current_admin)
-):
-    """Admin: Get all websites for a company"""
-    service = WebsiteService(db)
-    
-    websites, total = await service.get_company_websites(
-        company_id,
-        skip=pagination["skip"],
-        limit=pagination["limit"]
-    )
-    
-    website_responses = [
-        WebsiteListResponse.model_validate(w) for w in websites
-    ]
-    
-    return paginated_response(
-        data=website_responses,
-        total=total,
-        page=pagination["page"],
-        page_size=pagination["page_size"]
-    )
\ No newline at end of file
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
+
+from app.api.dependencies import PaginationDep, DatabaseDep, FieldsetParams, QueryBudget
+from app.api.deps import AuthDependencies
+from app.services.website_service import WebsiteService
+from app.schemas.website import (
+    WebsiteCreate,
+    WebsiteUpdate,
+    WebsiteResponse,
+    WebsiteListResponse,
+    WebsiteWithSecretResponse,
+    WebhookSecretResponse
+)
+from app.schemas.fieldsets import Fieldset
+from app.schemas.responses import (
+    SuccessResponse,
+    PaginatedResponse,
+    MessageResponse,
+    success_json,
+    paginated_json,
+    validate_all
+)
+from app.models.company_user import CompanyUser
+from app.models.system_admin import SystemAdmin
+from app.models.website import Website
+from app.utils.conditional import CacheValidators
+
+router = APIRouter()
+auth_deps = AuthDependencies()
+
+# List endpoints default to the compact list schema but may ask for any field
+list_fields = FieldsetParams(WebsiteResponse, default_model=WebsiteListResponse)
+detail_fields = FieldsetParams(WebsiteResponse)
+
+
+@router.post(
+    "",
+    response_model=SuccessResponse[WebsiteWithSecretResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create new website",
+    description="Create a new website for the company"
+)
+async def create_website(
+    website_data: WebsiteCreate,
+    db: DatabaseDep,
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """
+    Create a new website:
+    - Checks website limit based on plan
+    - Generates embed code
+    - Creates API endpoint
+    - Updates resource allocation
+    - Returns the webhook secret, if any; it is not shown again
+    """
+    service = WebsiteService(db)
+    
+    # Check if user has permission (company_id must match)
+    if website_data.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot create website for another company"
+        )
+    
+    # Convert Pydantic model to dict
+    website_dict = website_data.model_dump()
+    
+    website = await service.create_website(
+        website_dict,
+        current_user.company_id
+    )
+    
+    return success_json(
+        data=WebsiteWithSecretResponse.model_validate(website),
+        message="Website created successfully",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.get(
+    "",
+    dependencies=[Depends(QueryBudget(5))],
+    response_model=PaginatedResponse[WebsiteListResponse],
+    summary="List websites",
+    description="Get all websites for the current user's company"
+)
+async def list_websites(
+    request: Request,
+    db: DatabaseDep,
+    pagination: PaginationDep,
+    active_only: bool = Query(False, description="Show only active websites"),
+    fieldset: Fieldset = Depends(list_fields),
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """Get all websites for the company (supports If-None-Match)"""
+    service = WebsiteService(db)
+    
+    version = await service.get_company_websites_version(
+        current_user.company_id, active_only
+    )
+    validators = CacheValidators.for_collection(
+        request, f"websites:{current_user.company_id}", version
+    )
+    if validators.is_not_modified(request):
+        return validators.not_modified()
+    
+    websites, total = await service.get_company_websites(
+        current_user.company_id,
+        skip=pagination["skip"],
+        limit=pagination["limit"],
+        active_only=active_only,
+        columns=fieldset.columns(Website)
+    )
+    
+    website_responses = validate_all(fieldset.model, websites)
+    
+    return validators.apply(paginated_json(
+        data=website_responses,
+        total=total,
+        page=pagination["page"],
+        page_size=pagination["page_size"]
+    ))
+
+
+@router.get(
+    "/search",
+    dependencies=[Depends(QueryBudget(4))],
+    response_model=SuccessResponse[List[WebsiteListResponse]],
+    summary="Search websites",
+    description="Search websites by name or domain"
+)
+async def search_websites(
+    db: DatabaseDep,
+    pagination: PaginationDep,
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user),
+    fieldset: Fieldset = Depends(list_fields),
+    q: str = Query(..., min_length=2, description="Search query")
+):
+    """Search websites"""
+    service = WebsiteService(db)
+    
+    websites = await service.search_websites(
+        current_user.company_id,
+        q,
+        skip=pagination["skip"],
+        limit=pagination["limit"],
+        columns=fieldset.columns(Website)
+    )
+    
+    website_responses = validate_all(fieldset.model, websites)
+    
+    return success_json(
+        data=website_responses,
+        message=f"Found {len(website_responses)} websites"
+    )
+
+
+@router.get(
+    "/{website_id}",
+    dependencies=[Depends(QueryBudget(5))],
+    response_model=SuccessResponse[WebsiteResponse],
+    summary="Get website details",
+    description="Get detailed information about a specific website"
+)
+async def get_website(
+    website_id: int,
+    request: Request,
+    db: DatabaseDep,
+    fieldset: Fieldset = Depends(detail_fields),
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """Get website by ID (supports If-None-Match / If-Modified-Since)"""
+    service = WebsiteService(db)
+    
+    # Revalidation is answered from a version probe, before the full load
+    validators = None
+    version = await service.get_website_version(website_id)
+    if version and version.company_id == current_user.company_id:
+        validators = CacheValidators.for_entity(request, "website", version)
+        if validators.is_not_modified(request):
+            return validators.not_modified()
+    
+    website = await service.get_website_with_details(
+        website_id,
+        columns=fieldset.columns(Website, Website.company_id)
+    )
+    
+    # Check if user has access
+    if website.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this website"
+        )
+    
+    response = success_json(
+        data=fieldset.model.model_validate(website)
+    )
+    return validators.apply(response) if validators else response
+
+
+@router.put(
+    "/{website_id}",
+    response_model=SuccessResponse[WebsiteWithSecretResponse],
+    summary="Update website",
+    description="Update website information"
+)
+async def update_website(
+    website_id: int,
+    website_data: WebsiteUpdate,
+    db: DatabaseDep,
+    current_user: CompanyUser = Depends(auth_deps.get_current_company_user)
+):
+    """Update website"""
+    service = WebsiteService(db)
+    website = await service.get_website(website_id)
+    
+    # Check permissions
+    if website.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this website"
+        )
+    
+    # Convert to dict and exclude unset values
+    update_dict = website_data.model_dump(exclude_unset=True)
+    had_secret = bool(website.webhook_secret)
+    
+    updated_website = await service.update_website(website_id, update_dict)
+    
+    # A secret generated for a first webhook URL is shown this once
+    if not had_secret and updated_website.webhook_secret:
+        data = WebsiteWithSecretResponse.model_validate(updated_website)
+    else:
+        data = WebsiteResponse.model_validate(updated_website)
+    return success_json(
+        data=data,
+        message="Website updated successfully"
+    )
+
+
+@router.post(
+    "/{website_id}/webhook-secret",
+    response_model=SuccessResponse[WebhookSecretResponse],
+    summary="Rotate webhook secret",
+    description="Generate a new webhook signing secret and return it once"
+)
+async def rotate_webhook_secret(
+    website_id: int,
+    db: DatabaseDep,
+    current_user: CompanyUser = Depends(auth_deps.require_master_user)
+):
+    """Rotate the webhook secret (requires master user)"""
+    service = WebsiteService(db)
+    website = await service.get_website(website_id)
+    
+    # Check permissions
+    if website.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this website"
+        )
+    
+    website = await service.rotate_webhook_secret(website_id)
+    
+    return success_json(
+        data=WebhookSecretResponse(website_id=website.id, webhook_secret=website.webhook_secret),
+        message="Webhook secret rotated"
+    )
+
+
+@router.delete(
+    "/{website_id}",
+    response_model=MessageResponse,
+    summary="Delete website",
+    description="Soft delete a website"
+)
+async def delete_website(
+    website_id: int,
+    db: DatabaseDep,
+    current_user: CompanyUser = Depends(auth_deps.require_master_user)
+):
+    """Delete website (requires master user)"""
+    service = WebsiteService(db)
+    website = await service.get_website(website_id)
+    
+    # Check permissions
+    if website.company_id != current_user.company_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied to this website"
+        )
+    
+    await service.delete_website(website_id)
+    
+    return {
+        "success": True,
+        "message": "Website deleted successfully"
+    }
+
+
+# ========================
+# Admin Endpoints
+# ========================
+
+@router.get(
+    "/admin/company/{company_id}",
+    dependencies=[Depends(QueryBudget(5))],
+    response_model=PaginatedResponse[WebsiteListResponse],
+    summary="[Admin] List company websites",
+    description="Admin: Get all websites for any company"
+)
+async def admin_list_company_websites(
+    company_id: int,
+    request: Request,
+    db: DatabaseDep,
+    pagination: PaginationDep,
+    fieldset: Fieldset = Depends(list_fields),
+    current_admin: SystemAdmin = Depends(auth_deps.get_current_admin)
+):
+    """Admin: Get all websites for a company"""
+    service = WebsiteService(db)
+    
+    version = await service.get_company_websites_version(company_id)
+    validators = CacheValidators.for_collection(
+        request, f"websites:{company_id}", version
+    )
+    if validators.is_not_modified(request):
+        return validators.not_modified()
+    
+    websites, total = await service.get_company_websites(
+        company_id,
+        skip=pagination["skip"],
+        limit=pagination["limit"],
+        columns=fieldset.columns(Website)
+    )
+    
+    website_responses = validate_all(fieldset.model, websites)
+    
+    return validators.apply(paginated_json(
+        data=website_responses,
+        total=total,
+        page=pagination["page"],
+        page_size=pagination["page_size"]
+    ))
\ No newline at end of file
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+
+from app.api.dependencies import DatabaseDep, QueryBudget
+from app.services.website_service import WebsiteService
+from app.schemas.website import WidgetConfigResponse
+from app.schemas.responses import SuccessResponse, success_json
+
+router = APIRouter()
+
+# Widget config changes rarely; browsers and CDNs may reuse it for a minute
+WIDGET_CONFIG_CACHE_CONTROL = "public, max-age=60"
+
+
+@router.get(
+    "/{widget_api_key}/config",
+    dependencies=[Depends(QueryBudget(2))],
+    response_model=SuccessResponse[WidgetConfigResponse],
+    summary="Get widget configuration",
+    description="Public: configuration loaded by the embedded chat widget"
+)
+async def get_widget_config(
+    widget_api_key: str,
+    db: DatabaseDep
+):
+    """Get widget configuration (no authentication, rate limited per widget key)"""
+    service = WebsiteService(db)
+    website = await service.get_widget_config(widget_api_key)
+    
+    # Stamped with the last change instead of now, so identical configs
+    # are identical bodies and the compressed copy is reused
+    response = success_json(
+        data=WidgetConfigResponse.model_validate(website),
+        timestamp=website.updated_at or website.created_at
+    )
+    response.headers["Cache-Control"] = WIDGET_CONFIG_CACHE_CONTROL
+    return response
@@ -1,69 +1,192 @@
-from typing import List, Optional
-from pydantic_settings import BaseSettings
-from pydantic import Field, validator
-import secrets
-
-class Settings(BaseSettings):
-    # Project Details
-    PROJECT_NAME: str = "Chatbot SaaS Platform"
-    VERSION: str = "1.0.0"
-    API_V1_STR: str = "/api/v1"
-    
-    # Security
-    SECRET_KEY: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
-    ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
-    
-    # CORS
-    BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
-    
-    # Database
-    POSTGRES_SERVER: str = "localhost"
-    POSTGRES_USER: str = "chatbot_user"
-    POSTGRES_PASSWORD: str = "chatbot_pass"
-    POSTGRES_DB: str = "chatbot_saas"
-    DATABASE_URL: Optional[str] = None
-    
-    @validator("DATABASE_URL", pre=True)
-    def assemble_db_connection(cls, v: Optional[str], values: dict) -> str:
-        if isinstance(v, str):
-            return v
-        return f"postgresql+asyncpg://{values.get('POSTGRES_USER')}:" \
-               f"{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}/" \
-               f"{values.get('POSTGRES_DB')}"
-    
-    # Redis
-    REDIS_HOST: str = "localhost"
-    REDIS_PORT: int = 6379
-    REDIS_PASSWORD: Optional[str] = None
-    REDIS_DB: int = 0
-    
-    # Email
-    SMTP_TLS: bool = True
-    SMTP_PORT: Optional[int] = 587
-    SMTP_HOST: Optional[str] = "smtp.gmail.com"
-    SMTP_USER: Optional[str] = None
-    SMTP_PASSWORD: Optional[str] = None
-    EMAILS_FROM_EMAIL: Optional[str] = None
-    EMAILS_FROM_NAME: Optional[str] = None
-    
-    # Superadmin
-    FIRST_SUPERUSER_EMAIL: str = "admin@chatbot-saas.com"
-    FIRST_SUPERUSER_PASSWORD: str = "changeme123"
-    FIRST_SUPERUSER_FIRSTNAME: str = "Super"
-    FIRST_SUPERUSER_LASTNAME: str = "Admin"
-    
-    # Rate Limiting
-    RATE_LIMIT_ENABLED: bool = True
-    RATE_LIMIT_PER_MINUTE: int = 60
-    
-    # Monitoring
-    SENTRY_DSN: Optional[str] = None
-    ENVIRONMENT: str = "development"
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-
+from typing import List, Optional
+from pydantic_settings import BaseSettings
+from pydantic import Field, validator
+import secrets
+
+class Settings(BaseSettings):
+    # Project Details
+    PROJECT_NAME: str = "Chatbot SaaS Platform"
+    VERSION: str = "1.0.0"
+    API_V1_STR: str = "/api/v1"
+    
+    # Security
+    SECRET_KEY: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    MAX_FAILED_LOGIN_ATTEMPTS: int = 5
+    ACCOUNT_LOCKOUT_MINUTES: int = 30
+    LOGIN_BOOKKEEPING_DEFERRED: bool = True
+    LOGIN_BOOKKEEPING_FLUSH_SECONDS: float = 5.0
+    
+    # Password Hashing
+    BCRYPT_ROUNDS: Optional[int] = None  # Pin the cost; None = calibrate at startup
+    BCRYPT_TARGET_VERIFY_MS: float = 100.0
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+    BCRYPT_REHASH_TOLERANCE: int = 1  # Rounds a stored hash may differ before rehash
+    
+    # Token Revocation
+    TOKEN_REVOCATION_BACKEND: str = "database"  # database, redis
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 5.0
+    TOKEN_REVOCATION_BLOOM_CAPACITY: int = 100_000
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    
+    # CORS
+    BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
+    
+    # Database
+    POSTGRES_SERVER: str = "localhost"
+    POSTGRES_USER: str = "chatbot_user"
+    POSTGRES_PASSWORD: str = "chatbot_pass"
+    POSTGRES_DB: str = "chatbot_saas"
+    DATABASE_URL: Optional[str] = None
+    
+    @validator("DATABASE_URL", pre=True)
+    def assemble_db_connection(cls, v: Optional[str], values: dict) -> str:
+        if isinstance(v, str):
+            return v
+        return f"postgresql+asyncpg://{values.get('POSTGRES_USER')}:" \
+               f"{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}/" \
+               f"{values.get('POSTGRES_DB')}"
+    
+    # Database Engine
+    DB_POOL_MODE: str = "internal"  # internal (pool per process), external (pgbouncer: NullPool)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a pooled connection
+    DB_POOL_RECYCLE: int = 3600
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None  # asyncpg prepared statements; None = 100 internal, 0 external
+    DB_ECHO: bool = False  # Log every statement (local debugging only)
+    DB_READ_ONLY_FAST_PATH: bool = True  # Safe-method requests skip BEGIN/COMMIT
+    DB_QUERY_CACHE_SIZE: int = 1200  # Compiled SQL cache entries per engine
+    
+    # SQL Instrumentation
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0  # Statements at or above this are logged
+    SQL_STATS_MAX_FINGERPRINTS: int = 500
+    SQL_STATS_SAMPLE_SIZE: int = 1000  # Recent durations kept per fingerprint for percentiles
+    SERVER_TIMING_ENABLED: bool = True
+    QUERY_REPEAT_THRESHOLD: int = 5  # Same fingerprint this often in one request = likely N+1
+    QUERY_BUDGET_STRICT: bool = False  # Tests/CI: over-budget and N+1 responses become 500s
+    QUERY_RAISE_ON_LAZY_LOAD: bool = False  # Tests/CI: implicit relationship lazy loads raise
+    
+    # Profiling
+    PROFILER_INTERVAL_MS: float = 5.0  # Stack sampling interval
+    PROFILER_MAX_SECONDS: int = 60
+    PROFILER_TRIGGER_WINDOW_SECONDS: float = 30.0  # Samples kept while a trigger is armed
+    PROFILER_MAX_CAPTURES: int = 20
+    
+    # Read Replicas
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Lagging replicas leave the rotation
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # Reads stay on the primary after a write
+    READ_YOUR_WRITES_BACKEND: str = "memory"  # memory, redis
+    
+    # Redis
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_PASSWORD: Optional[str] = None
+    REDIS_DB: int = 0
+    
+    # Email
+    SMTP_TLS: bool = True
+    SMTP_PORT: Optional[int] = 587
+    SMTP_HOST: Optional[str] = "smtp.gmail.com"
+    SMTP_USER: Optional[str] = None
+    SMTP_PASSWORD: Optional[str] = None
+    EMAILS_FROM_EMAIL: Optional[str] = None
+    EMAILS_FROM_NAME: Optional[str] = None
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30
+    
+    # Outbox
+    OUTBOX_WORKERS: int = 2  # In-process workers; 0 = only enqueue (another process drains)
+    OUTBOX_CLAIM_SIZE: int = 50  # Jobs claimed per worker round trip
+    OUTBOX_POLL_SECONDS: float = 2.0  # Idle poll; commits in this process wake workers at once
+    OUTBOX_LEASE_SECONDS: float = 300.0  # Claimed jobs are retried after this if never finished
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE_SECONDS: float = 10.0
+    OUTBOX_BACKOFF_MAX_SECONDS: float = 3600.0
+    OUTBOX_RETENTION_HOURS: float = 72.0  # Delivered jobs are deleted after this
+    
+    # Webhooks
+    WEBHOOK_TIMEOUT_SECONDS: float = 5.0
+    WEBHOOK_HTTP2: bool = True  # Needs the optional h2 package
+    WEBHOOK_MAX_CONNECTIONS: int = 200  # Shared keep-alive pool across all destinations
+    WEBHOOK_MAX_CONCURRENCY_PER_HOST: int = 4
+    WEBHOOK_BATCH_WINDOW_SECONDS: float = 1.0  # Events published within a window share a POST
+    WEBHOOK_BATCH_MAX_EVENTS: int = 50  # 1 = one POST per event
+    WEBHOOK_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures before a host is skipped
+    WEBHOOK_CIRCUIT_RESET_SECONDS: float = 60.0
+    WEBHOOK_ALLOW_LOCAL_DESTINATIONS: bool = False  # Allows http and private addresses; local development only
+    
+    # Inference
+    INFERENCE_DEFAULT_BACKEND: str = "openai"  # "openai" (any /chat/completions API) or "fake"
+    INFERENCE_OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    INFERENCE_OPENAI_API_KEY: Optional[str] = None
+    INFERENCE_TIMEOUT_SECONDS: float = 60.0
+    INFERENCE_MAX_CONNECTIONS: int = 100  # Keep-alive pool per backend
+    INFERENCE_MAX_CONCURRENCY_PER_MODEL: int = 16  # model_config "max_concurrency" overrides
+    INFERENCE_QUEUE_TIMEOUT_SECONDS: float = 10.0  # Wait for a model slot before answering 503
+    INFERENCE_MODEL_CACHE_SECONDS: float = 30.0
+    INFERENCE_HISTORY_MESSAGES: int = 20  # Most turns kept verbatim; older ones are summarized
+    INFERENCE_FAKE_LATENCY_MS: int = 0
+    CONTEXT_WINDOW_TOKENS: int = 3000  # Recent turns sent verbatim; model_config "context_tokens" overrides
+    CONTEXT_SUMMARY_TOKENS: int = 500
+    CONTEXT_SUMMARIZER: str = "extractive"  # Or "model": the session's model writes the summary
+    CONTEXT_CACHE_SESSIONS: int = 10000  # Session windows kept per worker
+    CONTEXT_CACHE_IDLE_SECONDS: float = 1800
+    
+    # Chat history partitions (Postgres)
+    CHAT_RETENTION_CLASSES_DAYS: List[int] = [30, 90, 180, 365, 730, 1825]  # Plan retention rounds up to one
+    CHAT_PARTITION_PREMAKE_MONTHS: int = 3  # Monthly partitions created ahead of time
+    CHAT_PARTITION_MAINTENANCE_HOURS: float = 6.0
+    CHAT_PARTITION_LOCK_TIMEOUT_SECONDS: float = 5.0  # DDL gives up (until the next run) rather than queue
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Per worker, replies plus bookkeeping
+    RESPONSE_CACHE_TTL_SECONDS: float = 24 * 3600
+    SEMANTIC_CACHE_ENABLED: bool = False  # Needs the optional numpy package
+    SEMANTIC_CACHE_DIR: str = "data/semantic_cache"
+    SEMANTIC_CACHE_EMBEDDER: str = "hashing"  # Or "package.module:factory" returning an Embedder
+    SEMANTIC_CACHE_DIM: int = 256  # Hashing embedder dimensions
+    # Cosine similarity, from benchmarks/semantic_threshold.py with the hashing embedder: midway between
+    # the closest near miss (0.87) and the next paraphrase (0.93). model_config "semantic_threshold" overrides
+    SEMANTIC_CACHE_THRESHOLD: float = 0.9
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 20000  # Per website and model version; oldest overwritten first
+    
+    # Superadmin
+    FIRST_SUPERUSER_EMAIL: str = "admin@chatbot-saas.com"
+    FIRST_SUPERUSER_PASSWORD: str = "changeme123"
+    FIRST_SUPERUSER_FIRSTNAME: str = "Super"
+    FIRST_SUPERUSER_LASTNAME: str = "Admin"
+    
+    # Rate Limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_BACKEND: str = "memory"  # memory, redis
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10
+    RATE_LIMIT_COMPANY_PER_MINUTE: int = 600
+    RATE_LIMIT_WIDGET_PER_MINUTE: int = 120
+    
+    # Response Compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller bodies are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    COMPRESSION_PRECOMPRESS_PATHS: List[str] = ["/api/v1/openapi.json"]
+    
+    # Bulk Export
+    EXPORT_BATCH_SIZE: int = 1000  # Rows fetched per server-side cursor round trip
+    
+    # Monitoring
+    SENTRY_DSN: Optional[str] = None
+    ENVIRONMENT: str = "development"
+    
+    class Config:
+        env_file = ".env"
+        case_sensitive = True
+
 settings = Settings()
\ No newline at end of file
@@ -1,38 +1,227 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
-from .config import settings
-
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True if settings.ENVIRONMENT == "development" else False,
-    pool_size=20,
-    max_overflow=40,
-    pool_pre_ping=True,
-    pool_recycle=3600
-)
-
-# Create session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False
-)
-
-# Base class for models
-Base = declarative_base()
-
-# Dependency to get DB session
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
\ No newline at end of file
+import itertools
+import os
+import socket
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import declarative_base, Session
+from typing import AsyncGenerator, Dict, Optional
+from .config import settings
+from .replicas import ReplicaSet, ReadYourWritesTracker
+from .sql_instrumentation import instrument_engine
+
+# Unique across workers and hosts sharing one proxy; readable in pg logs
+_STATEMENT_PREFIX = f"__app_{socket.gethostname()[:16]}_{os.getpid()}"
+_statement_ids = itertools.count(1)
+
+
+def _statement_name() -> str:
+    return f"{_STATEMENT_PREFIX}_{next(_statement_ids)}__"
+
+
+def _asyncpg_connect_args() -> dict:
+    """
+    Prepared statement settings. Behind a transaction-pooling proxy a
+    statement prepared on one server connection is not there on the next,
+    so caching defaults to off and names never collide between processes.
+    """
+    external = settings.DB_POOL_MODE == "external"
+    cache_size = settings.DB_STATEMENT_CACHE_SIZE
+    if cache_size is None:
+        cache_size = 0 if external else 100
+    connect_args = {
+        "statement_cache_size": cache_size,
+        "prepared_statement_cache_size": cache_size,
+    }
+    if external:
+        connect_args["prepared_statement_name_func"] = _statement_name
+    return connect_args
+
+
+def engine_options(url: str) -> dict:
+    """
+    create_async_engine() keyword arguments for DB_POOL_MODE:
+    - internal: a pool per process (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    - external: NullPool, pooling is left to pgbouncer or a similar proxy
+    """
+    options = {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
+    if url.startswith("sqlite"):
+        return options
+
+    if settings.DB_POOL_MODE == "external":
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE
+        )
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = _asyncpg_connect_args()
+    return options
+
+
+def _read_only(read_engine: AsyncEngine) -> AsyncEngine:
+    """
+    Engine view for read sessions. In autocommit mode no BEGIN/COMMIT is
+    sent, saving two round trips per request; the pool is shared.
+    """
+    if settings.DB_READ_ONLY_FAST_PATH:
+        return read_engine.execution_options(isolation_level="AUTOCOMMIT")
+    return read_engine
+
+
+# Create async engine (primary)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    **engine_options(settings.DATABASE_URL)
+)
+instrument_engine(engine)
+
+# Read replicas (optional)
+replica_set = ReplicaSet(
+    [create_async_engine(url, **engine_options(url)) for url in settings.DATABASE_REPLICA_URLS],
+    max_lag=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_HEALTH_CHECK_SECONDS
+)
+for replica_engine in replica_set.engines:
+    instrument_engine(replica_engine)
+
+# Autocommit views, built once per engine
+_read_views: Dict[AsyncEngine, AsyncEngine] = {
+    read_engine: _read_only(read_engine)
+    for read_engine in [engine, *replica_set.engines]
+}
+
+
+def _build_read_your_writes() -> ReadYourWritesTracker:
+    redis_client = None
+    if settings.READ_YOUR_WRITES_BACKEND == "redis":
+        from .redis import get_redis
+        redis_client = get_redis()
+    return ReadYourWritesTracker(settings.READ_YOUR_WRITES_SECONDS, redis_client)
+
+
+read_your_writes = _build_read_your_writes()
+
+# Create session factory
+AsyncSessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
+
+class ReadOnlySession(Session):
+    """Session for safe-method requests; writes are rejected"""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_flush(session, flush_context, instances):
+    raise RuntimeError("Read-only session: writes belong in non-GET endpoints")
+
+
+@event.listens_for(ReadOnlySession, "do_orm_execute")
+def _reject_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        raise RuntimeError("Read-only session: writes belong in non-GET endpoints")
+
+
+if settings.QUERY_RAISE_ON_LAZY_LOAD:
+    @event.listens_for(Session, "do_orm_execute")
+    def _reject_lazy_load(orm_execute_state):
+        """Implicit lazy loads fail loudly instead of becoming N+1 queries"""
+        # lazy_loaded_from only exists on SELECTs; ORM UPDATE/DELETE raise on it
+        if orm_execute_state.is_select and orm_execute_state.lazy_loaded_from is not None:
+            raise InvalidRequestError(
+                f"Lazy load of {orm_execute_state.loader_strategy_path.prop} is disabled "
+                "(QUERY_RAISE_ON_LAZY_LOAD); load it with selectinload()/joinedload()"
+            )
+
+
+# Read sessions are bound per session to a replica or the primary
+ReadSessionLocal = async_sessionmaker(
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
+# Base class for models
+Base = declarative_base()
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _principal_key(request: Request) -> Optional[str]:
+    """Principal set on request.state by RequestContextMiddleware"""
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        return None
+    return f"{getattr(request.state, 'user_type', None)}:{user_id}"
+
+
+def _read_bind(sticky: bool) -> Optional[AsyncEngine]:
+    """A healthy replica, else the primary (None: plain primary session)"""
+    replica = None if sticky else replica_set.pick()
+    if replica is not None:
+        return _read_views[replica]
+    return _read_views[engine] if settings.DB_READ_ONLY_FAST_PATH else None
+
+
+def read_session() -> AsyncSession:
+    """
+    Session for background reads (e.g. exports): a healthy replica or the
+    primary. Never autocommit: server-side cursors need a transaction.
+    """
+    replica = replica_set.pick()
+    if replica is not None:
+        return ReadSessionLocal(bind=replica)
+    return AsyncSessionLocal()
+
+
+# Dependency to get DB session
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Request-scoped session:
+    - GET/HEAD/OPTIONS get a read-only session on a healthy replica (or on
+      the primary when the principal wrote within READ_YOUR_WRITES_SECONDS);
+      nothing is committed
+    - Everything else uses the primary and commits when a transaction is open
+    """
+    principal = _principal_key(request)
+
+    if request.method in SAFE_METHODS:
+        bind = _read_bind(await read_your_writes.is_sticky(principal))
+        if bind is not None:
+            async with ReadSessionLocal(bind=bind) as session:
+                yield session
+            return
+    else:
+        # Marked before the write too: the response can reach the client
+        # before this dependency's teardown runs
+        await read_your_writes.mark(principal)
+
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+            # Services commit their own writes; only commit when something
+            # ran after the last commit
+            if session.in_transaction():
+                await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    if request.method not in SAFE_METHODS:
+        await read_your_writes.mark(principal)
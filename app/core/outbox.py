@@ -0,0 +1,339 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, event, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import AsyncSessionLocal
+from app.models.outbox_job import OutboxJob
+
+logger = logging.getLogger(__name__)
+
+# Receives the payloads of one batch; may return {index: error} for the
+# payloads that failed, everything else in the batch counts as delivered.
+# Raising fails the whole batch.
+Handler = Callable[[List[dict]], Awaitable[Optional[Dict[int, str]]]]
+
+# Maps a payload to the destination it goes to (see OutboxWorker.handler)
+PartitionKey = Callable[[dict], Hashable]
+
+
+def enqueue(
+    db: AsyncSession,
+    job_type: str,
+    payload: dict,
+    delay_seconds: float = 0,
+    max_attempts: Optional[int] = None
+) -> OutboxJob:
+    """
+    Add a job to the caller's transaction.
+
+    The job is only visible to workers once that transaction commits, and
+    disappears with it on rollback, so side effects never run for changes
+    that were not persisted.
+    """
+    job = OutboxJob(
+        job_type=job_type,
+        payload=payload,
+        status="pending",
+        attempts=0,
+        max_attempts=max_attempts or settings.OUTBOX_MAX_ATTEMPTS,
+        run_after=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+    )
+    db.add(job)
+    db.sync_session.info["outbox_enqueued"] = True
+    return job
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session) -> None:
+    # Start on committed jobs right away instead of at the next poll
+    if session.info.pop("outbox_enqueued", False):
+        outbox_worker.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_enqueued(session) -> None:
+    session.info.pop("outbox_enqueued", None)
+
+
+class OutboxWorker:
+    """
+    In-process worker pool for outbox jobs.
+
+    Each worker claims up to `claim_size` due jobs in one short transaction
+    (SELECT ... FOR UPDATE SKIP LOCKED, then marked running under a lease),
+    so any number of workers and processes can share the table. Claimed
+    jobs are handed to their handler in batches of the handler's
+    batch_size. Failures are retried with exponential backoff and jitter;
+    after max_attempts a job is dead-lettered (status "dead") and kept for
+    inspection. A job whose lease expires, e.g. after a crash, is claimed
+    again.
+
+    Handlers registered with partition_by run detached: each destination's
+    part of a batch gets its own task that finishes its jobs itself, and
+    the worker goes on claiming. A slow destination then holds up only its
+    own jobs, not the claim, other tenants or other job types.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        claim_size: int,
+        poll_interval: float,
+        lease_seconds: float,
+        backoff_base: float,
+        backoff_max: float,
+        retention_hours: float
+    ):
+        self.workers = workers
+        self.claim_size = claim_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retention_hours = retention_hours
+        self._handlers: Dict[str, Tuple[Handler, int, Optional[PartitionKey]]] = {}
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._detached: Set[asyncio.Task] = set()
+        self._next_purge = 0.0
+
+    def handler(self, job_type: str, batch_size: int = 1, partition_by: Optional[PartitionKey] = None):
+        """
+        Register the coroutine that runs jobs of job_type. With
+        partition_by, batches are split by that key and run detached.
+        """
+        def decorator(func: Handler) -> Handler:
+            self._handlers[job_type] = (func, batch_size, partition_by)
+            return func
+        return decorator
+
+    def notify(self) -> None:
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        tasks = self._tasks + list(self._detached)
+        for task in tasks:
+            task.cancel()
+        # Claimed but unfinished jobs are picked up again when their lease expires
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def drain(self) -> None:
+        """Wait for detached batches started so far"""
+        while self._detached:
+            await asyncio.gather(*self._detached, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.run_once():
+                    continue  # Keep draining while there is work
+                await self._purge()
+            except Exception as e:
+                logger.error(f"Outbox worker iteration failed: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_once(self) -> int:
+        """Claim and run one round of due jobs; returns how many were claimed"""
+        jobs = await self._claim()
+        by_type: Dict[str, list] = {}
+        for job in jobs:
+            by_type.setdefault(job.job_type, []).append(job)
+
+        for job_type, group in by_type.items():
+            registered = self._handlers.get(job_type)
+            if registered is None:
+                await self._finish([], {job.id: f"No handler for {job_type}" for job in group}, group, dead=True)
+                continue
+            handler, batch_size, partition_by = registered
+            for start in range(0, len(group), batch_size):
+                batch = group[start:start + batch_size]
+                if partition_by is None:
+                    await self._run_batch(handler, batch)
+                    continue
+                parts: Dict[Hashable, list] = {}
+                for job in batch:
+                    parts.setdefault(partition_by(job.payload), []).append(job)
+                for part in parts.values():
+                    task = asyncio.create_task(self._run_detached(handler, part))
+                    self._detached.add(task)
+                    task.add_done_callback(self._detached.discard)
+        return len(jobs)
+
+    async def _run_batch(self, handler: Handler, batch: list) -> None:
+        try:
+            failed = await handler([job.payload for job in batch]) or {}
+        except Exception as e:
+            failed = {i: f"{type(e).__name__}: {e}" for i in range(len(batch))}
+        errors = {batch[i].id: error for i, error in failed.items()}
+        done = [job.id for job in batch if job.id not in errors]
+        await self._finish(done, errors, batch)
+
+    async def _run_detached(self, handler: Handler, batch: list) -> None:
+        try:
+            await self._run_batch(handler, batch)
+        except Exception as e:
+            # Unfinished jobs are claimed again when their lease expires
+            logger.error(f"Outbox batch of {len(batch)} {batch[0].job_type} jobs failed to finish: {str(e)}")
+
+    async def _claim(self) -> list:
+        now = datetime.now(timezone.utc)
+        due = or_(
+            and_(OutboxJob.status == "pending", OutboxJob.run_after <= now),
+            and_(OutboxJob.status == "running", OutboxJob.locked_until < now)
+        )
+        async with AsyncSessionLocal() as db:
+            ids = (await db.scalars(
+                select(OutboxJob.id)
+                .where(due)
+                .order_by(OutboxJob.run_after)
+                .limit(self.claim_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+            if not ids:
+                return []
+            # Re-checking `due` keeps the claim exclusive on databases
+            # without row locks
+            result = await db.execute(
+                update(OutboxJob)
+                .where(OutboxJob.id.in_(ids), due)
+                .values(
+                    status="running",
+                    locked_until=now + timedelta(seconds=self.lease_seconds),
+                    attempts=OutboxJob.attempts + 1
+                )
+                .returning(
+                    OutboxJob.id, OutboxJob.job_type, OutboxJob.payload,
+                    OutboxJob.attempts, OutboxJob.max_attempts
+                )
+                .execution_options(synchronize_session=False)
+            )
+            jobs = result.all()
+            await db.commit()
+        return jobs
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _finish(self, done: List[int], errors: Dict[int, str], jobs: list, dead: bool = False) -> None:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {"id": job_id, "status": "done", "completed_at": now, "locked_until": None, "last_error": None}
+            for job_id in done
+        ]
+        for job in jobs:
+            if job.id not in errors:
+                continue
+            if dead or job.attempts >= job.max_attempts:
+                logger.error(
+                    f"Outbox job {job.id} ({job.job_type}) dead-lettered after "
+                    f"{job.attempts} attempts: {errors[job.id]}"
+                )
+                rows.append({"id": job.id, "status": "dead", "locked_until": None, "last_error": errors[job.id]})
+            else:
+                rows.append({
+                    "id": job.id,
+                    "status": "pending",
+                    "locked_until": None,
+                    "run_after": now + timedelta(seconds=self._backoff(job.attempts)),
+                    "last_error": errors[job.id]
+                })
+        if not rows:
+            return
+        async with AsyncSessionLocal() as db:
+            # Group by key set: one executemany per shape of update
+            shapes: Dict[tuple, list] = {}
+            for row in rows:
+                shapes.setdefault(tuple(row), []).append(row)
+            for shape_rows in shapes.values():
+                await db.execute(update(OutboxJob), shape_rows)
+            await db.commit()
+
+    async def _purge(self) -> None:
+        """Delete delivered jobs past the retention period; dead jobs stay"""
+        if time.monotonic() < self._next_purge:
+            return
+        self._next_purge = time.monotonic() + 3600
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=self.retention_hours)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(OutboxJob).where(OutboxJob.status == "done", OutboxJob.completed_at < cutoff)
+            )
+            await db.commit()
+
+
+async def outbox_stats(db: AsyncSession) -> dict:
+    """Job counts per type and status, and how far behind the pending queue is"""
+    counts = (await db.execute(
+        select(OutboxJob.job_type, OutboxJob.status, func.count())
+        .group_by(OutboxJob.job_type, OutboxJob.status)
+    )).all()
+    oldest = await db.scalar(
+        select(func.min(OutboxJob.run_after)).where(OutboxJob.status == "pending")
+    )
+    by_type: Dict[str, Dict[str, int]] = {}
+    for job_type, status, count in counts:
+        by_type.setdefault(job_type, {})[status] = count
+    if oldest is not None and oldest.tzinfo is None:
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return {
+        "jobs": by_type,
+        "oldest_pending_due_seconds": (
+            round((datetime.now(timezone.utc) - oldest).total_seconds(), 1) if oldest else None
+        ),
+    }
+
+
+async def dead_jobs(db: AsyncSession, limit: int) -> List[dict]:
+    """Most recent dead-lettered jobs, without payloads"""
+    rows = (await db.execute(
+        select(
+            OutboxJob.id, OutboxJob.job_type, OutboxJob.attempts,
+            OutboxJob.last_error, OutboxJob.created_at
+        )
+        .where(OutboxJob.status == "dead")
+        .order_by(OutboxJob.id.desc())
+        .limit(limit)
+    )).all()
+    return [row._asdict() for row in rows]
+
+
+async def retry_job(db: AsyncSession, job_id: int) -> bool:
+    """Send a dead-lettered job back to the queue with a fresh attempt budget"""
+    result = await db.execute(
+        update(OutboxJob)
+        .where(OutboxJob.id == job_id, OutboxJob.status == "dead")
+        .values(status="pending", attempts=0, run_after=func.now(), last_error=None)
+    )
+    await db.commit()
+    if result.rowcount:
+        outbox_worker.notify()
+    return bool(result.rowcount)
+
+
+outbox_worker = OutboxWorker(
+    workers=settings.OUTBOX_WORKERS,
+    claim_size=settings.OUTBOX_CLAIM_SIZE,
+    poll_interval=settings.OUTBOX_POLL_SECONDS,
+    lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+    backoff_base=settings.OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max=settings.OUTBOX_BACKOFF_MAX_SECONDS,
+    retention_hours=settings.OUTBOX_RETENTION_HOURS
+)
@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from .config import settings
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+PARENT = "chat_messages"
+
+# Any two-int64 key; only has to be the same in every worker
+_ADVISORY_LOCK = 0x63686174  # "chat"
+
+_PARTITION = re.compile(rf"^{PARENT}_r(\d+)_(\d{{4}})_(\d{{2}})$")
+_CLASS = re.compile(rf"^{PARENT}_r(\d+)$")
+
+
+def retention_class(days: Optional[int]) -> int:
+    """
+    The smallest CHAT_RETENTION_CLASSES_DAYS class that keeps at least
+    `days`; 0 (kept forever) for no limit or a limit beyond every class.
+    Rounding up means history is never dropped before a plan promises.
+    Once maintenance has run, only classes whose partitions exist count,
+    so a class just added to the setting is not used before its tables.
+    """
+    if not days:
+        return 0
+    usable = chat_partition_maintainer.usable_classes
+    for retention in sorted(settings.CHAT_RETENTION_CLASSES_DAYS):
+        if retention >= days and (usable is None or retention in usable):
+            return retention
+    return 0
+
+
+def retention_classes() -> List[int]:
+    return sorted(set(settings.CHAT_RETENTION_CLASSES_DAYS)) + [0]
+
+
+def _month(day: date, months: int = 0) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def class_partition(retention: int) -> str:
+    return f"{PARENT}_r{retention}"
+
+
+def month_partition(retention: int, month: date) -> str:
+    return f"{PARENT}_r{retention}_{month:%Y_%m}"
+
+
+def create_class_sql(retention: int) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {class_partition(retention)} PARTITION OF {PARENT} "
+        f"FOR VALUES IN ({retention}) PARTITION BY RANGE (created_at)"
+    )
+
+
+def create_month_sql(retention: int, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {month_partition(retention, month)} "
+        f"PARTITION OF {class_partition(retention)} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_month(month, 1).isoformat()}')"
+    )
+
+
+class ChatPartitionMaintainer:
+    """
+    Keeps chat_messages' partitions ahead of time and drops expired ones.
+
+    On Postgres (after the partitioning migration) chat_messages is list
+    partitioned by retention class, and each class by month of created_at:
+    chat_messages_r90_2026_10 holds October 2026 messages of sessions
+    whose plan keeps 90 days. Each run creates the current and the next
+    CHAT_PARTITION_PREMAKE_MONTHS months for every class, and drops the
+    months of a class that ended more than its retention ago, so expiring
+    history costs a catalog update instead of a DELETE. Class 0 is never
+    dropped.
+
+    There is no DEFAULT partition (a row in it would block creating the
+    month it belongs to), so a message without a partition fails to
+    insert. Two things keep that from happening: the first pass runs at
+    startup, and retention_class() only hands out classes that have this
+    and next month's partitions (usable_classes). A class whose newest
+    month is this month, i.e. that runs out within a month, is logged as
+    an error and reported by /health (running_out).
+
+    Every statement runs on its own with a short lock_timeout, so DDL never
+    queues in front of chat traffic; anything that timed out is retried on
+    the next run. An advisory lock keeps workers from running at once.
+    Without a partitioned chat_messages (SQLite, or before the migration)
+    runs do nothing.
+    """
+
+    def __init__(
+        self,
+        interval_hours: float,
+        premake_months: int,
+        lock_timeout: float,
+        bind: Optional[AsyncEngine] = None
+    ):
+        self.interval_hours = interval_hours
+        self.premake_months = premake_months
+        self.lock_timeout = lock_timeout
+        self.engine = bind or engine
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Optional[dict] = None
+        # None until a run has seen the partitions (or when there are none)
+        self.usable_classes: Optional[Set[int]] = None
+        self.running_out: Dict[int, Optional[str]] = {}
+
+    async def start(self) -> None:
+        if self._task is None:
+            # Before traffic: sessions must not get a class without partitions
+            await self._maintain_logged()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_hours * 3600)
+            await self._maintain_logged()
+
+    async def _maintain_logged(self) -> None:
+        try:
+            await self.maintain()
+        except Exception as e:
+            logger.error(f"Chat partition maintenance failed: {str(e)}")
+
+    @staticmethod
+    async def is_partitioned(conn: AsyncConnection) -> bool:
+        if conn.dialect.name != "postgresql":
+            return False
+        return bool(await conn.scalar(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"
+        ), {"name": PARENT}))
+
+    @staticmethod
+    async def _partitions(conn: AsyncConnection) -> List[str]:
+        """Every partition below chat_messages, at both levels"""
+        return list((await conn.scalars(text(
+            "SELECT c.relname FROM pg_partition_tree(to_regclass(:name)) t "
+            "JOIN pg_class c ON c.oid = t.relid WHERE t.level > 0"
+        ), {"name": PARENT})).all())
+
+    async def _execute(self, conn: AsyncConnection, statement: str) -> bool:
+        try:
+            await conn.execute(text(statement))
+            return True
+        except DBAPIError as e:
+            logger.warning(f"Chat partition DDL deferred to the next run ({statement}): {str(e)}")
+            return False
+
+    @staticmethod
+    def _expired(retention: int, month: date, today: date) -> bool:
+        """Whether every message in the month is older than the class keeps"""
+        return retention > 0 and _month(month, 1) <= today - timedelta(days=retention)
+
+    def _check_coverage(self, partitions: Set[str], classes: List[int], today: date) -> None:
+        """Sets usable_classes and running_out from the partitions that exist"""
+        newest: Dict[int, date] = {}
+        for name in partitions:
+            match = _PARTITION.match(name)
+            if match is not None:
+                month = date(int(match.group(2)), int(match.group(3)), 1)
+                retention = int(match.group(1))
+                newest[retention] = max(newest.get(retention, month), month)
+        this_month, next_month = _month(today), _month(today, 1)
+        self.usable_classes = {
+            retention for retention in classes
+            if class_partition(retention) in partitions
+            and month_partition(retention, this_month) in partitions
+            and month_partition(retention, next_month) in partitions
+        }
+        self.running_out = {
+            retention: newest[retention].isoformat() if retention in newest else None
+            for retention in classes
+            if newest.get(retention, date.min) < next_month
+        }
+        if self.running_out:
+            logger.error(
+                f"Chat partitions run out within a month (class: newest month): {self.running_out}; "
+                f"inserts fail once they do"
+            )
+
+    async def maintain(self, since: Optional[date] = None, today: Optional[date] = None) -> dict:
+        """
+        One maintenance pass; `since` also creates the months from that date
+        (for back-dated loads). Returns the partitions created and dropped.
+        """
+        today = today or datetime.utcnow().date()
+        result: Dict[str, object] = {"partitioned": False, "created": [], "dropped": []}
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            if not await self.is_partitioned(conn):
+                self.usable_classes = None
+                self.running_out = {}
+                return result
+            result["partitioned"] = True
+            existing = set(await self._partitions(conn))
+            # Classes dropped from the setting keep their partitions while sessions may use them
+            classes = sorted(
+                set(retention_classes())
+                | {int(match.group(1)) for match in map(_CLASS.match, existing) if match is not None}
+            )
+            if not await conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": _ADVISORY_LOCK}):
+                result["skipped"] = "another worker is running maintenance"
+                self._check_coverage(existing, classes, today)
+                result["running_out"] = self.running_out
+                return result
+            try:
+                await conn.execute(text(f"SET lock_timeout = '{int(self.lock_timeout * 1000)}ms'"))
+                concurrent_detach = int(await conn.scalar(text("SHOW server_version_num"))) >= 140000
+
+                first = _month(since or today)
+                months = []
+                month = min(first, _month(today))
+                while month <= _month(today, self.premake_months):
+                    months.append(month)
+                    month = _month(month, 1)
+
+                for retention in classes:
+                    if class_partition(retention) not in existing:
+                        if not await self._execute(conn, create_class_sql(retention)):
+                            continue
+                        result["created"].append(class_partition(retention))
+                    for month in months:
+                        name = month_partition(retention, month)
+                        if name in existing or self._expired(retention, month, today):
+                            continue
+                        if await self._execute(conn, create_month_sql(retention, month)):
+                            result["created"].append(name)
+
+                for name in sorted(existing):
+                    match = _PARTITION.match(name)
+                    if match is None:
+                        continue
+                    retention = int(match.group(1))
+                    if not self._expired(retention, date(int(match.group(2)), int(match.group(3)), 1), today):
+                        continue
+                    # Detaching first (concurrently on PG 14+) keeps the
+                    # parent's exclusive lock off the hot path
+                    detach = f"ALTER TABLE {class_partition(retention)} DETACH PARTITION {name}"
+                    if concurrent_detach:
+                        # FINALIZE completes a concurrent detach an earlier run left pending
+                        detached = (
+                            await self._execute(conn, f"{detach} CONCURRENTLY")
+                            or await self._execute(conn, f"{detach} FINALIZE")
+                        )
+                    else:
+                        detached = await self._execute(conn, detach)
+                    if detached and await self._execute(conn, f"DROP TABLE {name}"):
+                        result["dropped"].append(name)
+                self._check_coverage(existing.union(result["created"]).difference(result["dropped"]), classes, today)
+                result["running_out"] = self.running_out
+            finally:
+                # The connection goes back to the pool
+                await conn.execute(text("RESET lock_timeout"))
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK})
+
+        if result["created"] or result["dropped"]:
+            logger.info(
+                f"Chat partitions: created {len(result['created'])}, dropped {result['dropped']}"
+            )
+        self.last_run = {**result, "at": datetime.utcnow().isoformat()}
+        return result
+
+
+async def partition_status(db: AsyncSession) -> List[dict]:
+    """Month partitions with estimated rows and size; empty unless chat_messages is partitioned"""
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+    rows = (await db.execute(text(
+        "SELECT c.relname AS name, c.reltuples::bigint AS estimated_rows, "
+        "pg_total_relation_size(c.oid) AS bytes "
+        "FROM pg_partition_tree(to_regclass(:name)) t JOIN pg_class c ON c.oid = t.relid "
+        "WHERE t.isleaf ORDER BY c.relname"
+    ), {"name": PARENT})).all()
+    return [row._asdict() for row in rows]
+
+
+chat_partition_maintainer = ChatPartitionMaintainer(
+    interval_hours=settings.CHAT_PARTITION_MAINTENANCE_HOURS,
+    premake_months=settings.CHAT_PARTITION_PREMAKE_MONTHS,
+    lock_timeout=settings.CHAT_PARTITION_LOCK_TIMEOUT_SECONDS
+)
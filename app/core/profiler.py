@@ -0,0 +1,198 @@
+import asyncio
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Deque, List, Optional, Tuple
+
+from .config import settings
+
+# Trim library paths so frame labels stay short and stable across hosts
+_PATH_PREFIXES = sorted(
+    {os.path.dirname(os.path.dirname(os.path.abspath(__file__)))} | {p for p in sys.path if p},
+    key=len,
+    reverse=True
+)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix):].lstrip(os.sep)
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _stack(frame) -> str:
+    """Collapsed stack of one thread, root first"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def collapse(stacks: Counter) -> str:
+    """Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope)"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class SamplingProfiler:
+    """
+    Wall-clock stack sampler for the event loop thread.
+
+    A helper thread reads sys._current_frames() every `interval` seconds,
+    so the profiled code is not instrumented and the overhead is one stack
+    walk per sample. Idle time shows up as the loop's selector frame.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def _sample(self, thread_id: int, seconds: float) -> Counter:
+        stacks: Counter = Counter()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[_stack(frame)] += 1
+            time.sleep(self.interval)
+        return stacks
+
+    async def profile(self, seconds: float) -> Counter:
+        """Sample this process's event loop for `seconds`; one profile at a time"""
+        async with self._lock:
+            thread_id = threading.get_ident()
+            return await asyncio.to_thread(self._sample, thread_id, seconds)
+
+
+class TriggeredProfiler:
+    """
+    Captures the stacks behind slow requests.
+
+    While armed, a sampler thread keeps the last `window` seconds of event
+    loop samples in memory. A request slower than the threshold (optionally
+    only for one route) takes the samples from its own start to end as a
+    capture. The loop is shared, so concurrent requests appear in the same
+    samples. Disarms itself after `max_captures` or when the arm expires.
+    """
+
+    def __init__(self, interval: float, window: float, keep: int):
+        self.interval = interval
+        self.window = window
+        self._captures: Deque[dict] = deque(maxlen=keep)
+        self._ids = itertools.count(1)
+        self._samples: Deque[Tuple[float, str]] = deque()
+        self._stop: Optional[threading.Event] = None
+        self._trigger: Optional[dict] = None
+
+    @property
+    def armed(self) -> bool:
+        trigger = self._trigger
+        if trigger is None:
+            return False
+        if time.monotonic() >= trigger["expires"]:
+            self.disarm()
+            return False
+        return True
+
+    def arm(self, threshold_ms: float, route: Optional[str], max_captures: int, ttl: float) -> dict:
+        self._trigger = {
+            "threshold_ms": threshold_ms,
+            "route": route,
+            "remaining": max_captures,
+            "expires": time.monotonic() + ttl,
+        }
+        if self._stop is None:
+            # Fresh buffer and stop event per arm: a sampler thread that is
+            # still winding down never writes into the next arm's samples
+            self._stop = threading.Event()
+            self._samples = deque()
+            threading.Thread(
+                target=self._run,
+                args=(threading.get_ident(), self._samples, self._stop),
+                name="triggered-profiler",
+                daemon=True
+            ).start()
+        return self.status()
+
+    def disarm(self) -> None:
+        self._trigger = None
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def _run(self, thread_id: int, samples: Deque[Tuple[float, str]], stop: threading.Event) -> None:
+        while not stop.is_set():
+            now = time.perf_counter()
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                samples.append((now, _stack(frame)))
+            while samples and samples[0][0] < now - self.window:
+                samples.popleft()
+            stop.wait(self.interval)
+
+    def observe(self, method: str, route: str, started: float, finished: float) -> None:
+        """Called for every request while armed (perf_counter timestamps)"""
+        trigger = self._trigger
+        if trigger is None:
+            return
+        duration_ms = (finished - started) * 1000
+        if duration_ms < trigger["threshold_ms"]:
+            return
+        if trigger["route"] is not None and trigger["route"] != route:
+            return
+
+        stacks = Counter(stack for at, stack in list(self._samples) if started <= at <= finished)
+        self._captures.append({
+            "id": next(self._ids),
+            "method": method,
+            "route": route,
+            "duration_ms": round(duration_ms, 3),
+            "samples": sum(stacks.values()),
+            "captured_at": datetime.utcnow().isoformat(),
+            "stacks": stacks,
+        })
+        trigger["remaining"] -= 1
+        if trigger["remaining"] <= 0:
+            self.disarm()
+
+    def status(self) -> dict:
+        trigger = self._trigger if self.armed else None
+        return {
+            "armed": trigger is not None,
+            "threshold_ms": trigger["threshold_ms"] if trigger else None,
+            "route": trigger["route"] if trigger else None,
+            "remaining": trigger["remaining"] if trigger else None,
+            "expires_in_seconds": round(trigger["expires"] - time.monotonic(), 1) if trigger else None,
+            "captures": self.captures(),
+        }
+
+    def captures(self) -> List[dict]:
+        return [
+            {key: value for key, value in capture.items() if key != "stacks"}
+            for capture in self._captures
+        ]
+
+    def capture(self, capture_id: int) -> Optional[dict]:
+        for capture in self._captures:
+            if capture["id"] == capture_id:
+                return capture
+        return None
+
+
+sampling_profiler = SamplingProfiler(settings.PROFILER_INTERVAL_MS / 1000)
+triggered_profiler = TriggeredProfiler(
+    settings.PROFILER_INTERVAL_MS / 1000,
+    window=settings.PROFILER_TRIGGER_WINDOW_SECONDS,
+    keep=settings.PROFILER_MAX_CAPTURES
+)
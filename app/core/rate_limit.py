@@ -0,0 +1,263 @@
+import math
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a single rate limit check"""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+
+def evaluate_sliding_window(
+    limit: int,
+    window: int,
+    current: int,
+    previous: int,
+    elapsed: float,
+    cost: int = 1
+) -> RateLimitResult:
+    """
+    Sliding window counter decision.
+
+    The previous fixed window is weighted by how much of it still overlaps
+    the sliding window, so two integer counters per key approximate a true
+    sliding log without storing timestamps.
+    """
+    weight = max(0.0, 1.0 - elapsed / window)
+    used = previous * weight + current
+
+    if used + cost <= limit:
+        remaining = int(limit - used - cost)
+        return RateLimitResult(
+            allowed=True,
+            limit=limit,
+            remaining=max(0, remaining),
+            reset_after=window - elapsed
+        )
+
+    # Time until enough of the previous window has slid out
+    if current + cost > limit:
+        wait = window - elapsed
+        if current > 0:
+            wait += max(0.0, window * (1.0 - (limit - cost) / current))
+    else:
+        wait = window * (1.0 - (limit - current - cost) / previous) - elapsed
+
+    retry_after = max(0.0, wait)
+    return RateLimitResult(
+        allowed=False,
+        limit=limit,
+        remaining=0,
+        reset_after=retry_after,
+        retry_after=retry_after
+    )
+
+
+class MemoryRateLimitBackend:
+    """
+    In-process backend (per worker, no I/O).
+
+    Counters are kept in least-recently-hit order and capped at max_keys:
+    each new key past the cap evicts the one hit longest ago, which has
+    usually slid out of its window already. Memory stays bounded and no
+    hit pays for more than one eviction.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self._counters: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._max_keys = max_keys
+
+    async def hit(self, key: str, limit: int, window: int, cost: int = 1) -> RateLimitResult:
+        now = time.time()
+        window_id = int(now // window)
+        elapsed = now - window_id * window
+
+        entry = self._counters.get(key)
+        if entry is None or entry[0] < window_id - 1:
+            entry = [window_id, 0, 0]
+        elif entry[0] == window_id - 1:
+            entry = [window_id, 0, entry[1]]
+
+        result = evaluate_sliding_window(limit, window, entry[1], entry[2], elapsed, cost)
+        if result.allowed:
+            entry[1] += cost
+        self._counters[key] = entry
+        self._counters.move_to_end(key)
+
+        if len(self._counters) > self._max_keys:
+            self._counters.popitem(last=False)
+        return result
+
+
+# Atomically read both windows and increment the current one when allowed.
+# Both keys share a hash tag so the script also works on Redis Cluster.
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local window_id = math.floor(now / window)
+local elapsed = now - window_id * window
+local cur_key = KEYS[1] .. ':' .. window_id
+local prev_key = KEYS[1] .. ':' .. (window_id - 1)
+local current = tonumber(redis.call('GET', cur_key) or '0')
+local previous = tonumber(redis.call('GET', prev_key) or '0')
+local used = previous * math.max(0, 1 - elapsed / window) + current
+if used + cost <= limit then
+    redis.call('INCRBY', cur_key, cost)
+    redis.call('EXPIRE', cur_key, window * 2)
+end
+return {current, previous, tostring(elapsed)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Redis backend shared by all workers (one round trip per check)"""
+
+    def __init__(self, redis_client, prefix: str = "ratelimit"):
+        self._redis = redis_client
+        self._prefix = prefix
+        self._script = redis_client.register_script(SLIDING_WINDOW_LUA)
+
+    async def hit(self, key: str, limit: int, window: int, cost: int = 1) -> RateLimitResult:
+        current, previous, elapsed = await self._script(
+            keys=[f"{self._prefix}:{{{key}}}"],
+            args=[limit, window, cost]
+        )
+        return evaluate_sliding_window(
+            limit, window, int(current), int(previous), float(elapsed), cost
+        )
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    Per-route rate limit policy.
+
+    scope is one of: ip, principal, company, widget.
+    Requests without a value for the scope (e.g. anonymous requests and the
+    company scope) are not counted by that rule.
+    """
+    name: str
+    limit: int
+    window_seconds: int = 60
+    scope: str = "ip"
+    paths: Tuple[str, ...] = ()
+    methods: Tuple[str, ...] = ()
+    exact: bool = False
+
+    def matches(self, method: str, path: str) -> bool:
+        if self.methods and method not in self.methods:
+            return False
+        if self.exact:
+            return path in self.paths
+        return any(path.startswith(p) for p in self.paths)
+
+    @property
+    def policy(self) -> str:
+        return f"{self.limit};w={self.window_seconds}"
+
+
+def default_rate_limit_rules() -> List[RateLimitRule]:
+    """Rate limit rules built from settings, most specific first"""
+    api = settings.API_V1_STR
+    return [
+        RateLimitRule(
+            name="login",
+            limit=settings.RATE_LIMIT_LOGIN_PER_MINUTE,
+            scope="ip",
+            paths=(
+                f"{api}/auth/admin/login",
+                f"{api}/auth/company/login",
+                f"{api}/auth/refresh",
+                f"{api}/auth/password-reset-request",
+                f"{api}/auth/password-reset",
+            ),
+            methods=("POST",),
+            exact=True
+        ),
+        RateLimitRule(
+            name="widget",
+            limit=settings.RATE_LIMIT_WIDGET_PER_MINUTE,
+            scope="widget",
+            paths=(api,)
+        ),
+        RateLimitRule(
+            name="company",
+            limit=settings.RATE_LIMIT_COMPANY_PER_MINUTE,
+            scope="company",
+            paths=(api,)
+        ),
+        RateLimitRule(
+            name="default",
+            limit=settings.RATE_LIMIT_PER_MINUTE,
+            scope="principal",
+            paths=(api,)
+        ),
+    ]
+
+
+class RateLimiter:
+    """Evaluates rules against a backend"""
+
+    def __init__(self, backend, rules: Optional[List[RateLimitRule]] = None):
+        self.backend = backend
+        self.rules = rules if rules is not None else default_rate_limit_rules()
+
+    def rules_for(self, method: str, path: str) -> List[RateLimitRule]:
+        return [rule for rule in self.rules if rule.matches(method, path)]
+
+    async def check(self, rule: RateLimitRule, identity: str) -> RateLimitResult:
+        key = f"{rule.name}:{rule.scope}:{identity}"
+        try:
+            return await self.backend.hit(key, rule.limit, rule.window_seconds)
+        except Exception as e:
+            # Fail open: a limiter outage must not take the API down
+            logger.warning(f"Rate limit backend error: {str(e)}")
+            return RateLimitResult(
+                allowed=True,
+                limit=rule.limit,
+                remaining=rule.limit,
+                reset_after=float(rule.window_seconds)
+            )
+
+
+def build_rate_limit_headers(rule: RateLimitRule, result: RateLimitResult) -> Dict[str, str]:
+    """Standard RateLimit-* response headers"""
+    headers = {
+        "RateLimit-Limit": str(result.limit),
+        "RateLimit-Remaining": str(result.remaining),
+        "RateLimit-Reset": str(math.ceil(result.reset_after)),
+        "RateLimit-Policy": rule.policy,
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+    return headers
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter for the configured backend"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            from .redis import get_redis
+            backend = RedisRateLimitBackend(get_redis())
+        else:
+            backend = MemoryRateLimitBackend()
+        _rate_limiter = RateLimiter(backend)
+    return _rate_limiter
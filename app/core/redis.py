@@ -0,0 +1,28 @@
+from .config import settings
+
+# Shared async Redis client (created lazily so Redis stays optional)
+_redis_client = None
+
+
+def get_redis():
+    """Get the shared async Redis client"""
+    global _redis_client
+    if _redis_client is None:
+        import redis.asyncio as redis
+
+        _redis_client = redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD or None,
+            db=settings.REDIS_DB,
+            decode_responses=True
+        )
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client if it was ever created"""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.close()
+        _redis_client = None
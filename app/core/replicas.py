@@ -0,0 +1,136 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds behind the primary; 0 when the replica has replayed everything it
+# received (an idle primary would otherwise look like growing lag)
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaSet:
+    """
+    Read replicas with background health and lag checks.
+
+    pick() round-robins over replicas that answered the last check within
+    max_lag seconds; it returns None when there are none, so callers fall
+    back to the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], max_lag: float, check_interval: float):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._healthy: List[AsyncEngine] = []
+        self._status: Dict[str, dict] = {}
+        self._cycle = itertools.cycle(())
+        self._task = None
+
+    def pick(self) -> Optional[AsyncEngine]:
+        if not self._healthy:
+            return None
+        return next(self._cycle)
+
+    async def start(self) -> None:
+        if not self.engines:
+            return
+        await self.check()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.engines:
+            await replica.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    async def _lag(self, replica: AsyncEngine) -> float:
+        async with replica.connect() as conn:
+            if replica.dialect.name == "postgresql":
+                return float((await conn.execute(POSTGRES_LAG_QUERY)).scalar() or 0)
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+
+    async def check(self) -> None:
+        """Probe every replica and rebuild the healthy rotation"""
+        healthy = []
+        for replica in self.engines:
+            name = replica.url.render_as_string(hide_password=True)
+            try:
+                lag = await asyncio.wait_for(self._lag(replica), timeout=self.check_interval)
+            except Exception as e:
+                logger.warning(f"Replica {name} failed health check: {str(e)}")
+                self._status[name] = {"healthy": False, "lag_seconds": None, "error": str(e)}
+                continue
+
+            is_healthy = lag <= self.max_lag
+            if not is_healthy:
+                logger.warning(f"Replica {name} is lagging by {lag:.1f}s; removed from rotation")
+            self._status[name] = {"healthy": is_healthy, "lag_seconds": round(lag, 3)}
+            if is_healthy:
+                healthy.append(replica)
+
+        self._healthy = healthy
+        self._cycle = itertools.cycle(healthy)
+
+    def status(self) -> Dict[str, dict]:
+        return dict(self._status)
+
+
+class ReadYourWritesTracker:
+    """
+    Pins a principal's reads to the primary for a short window after it
+    writes, so it never reads its own write from a lagging replica.
+
+    The memory backend is per worker; use the redis backend when one
+    client's requests are spread across workers or hosts.
+    """
+
+    def __init__(self, window: float, redis_client=None, prefix: str = "ryw"):
+        self.window = window
+        self._redis = redis_client
+        self._prefix = prefix
+        self._until: Dict[str, float] = {}
+
+    async def mark(self, principal: Optional[str]) -> None:
+        if not principal or self.window <= 0:
+            return
+        if self._redis is not None:
+            try:
+                await self._redis.set(f"{self._prefix}:{principal}", 1, px=int(self.window * 1000))
+            except Exception as e:
+                logger.warning(f"Read-your-writes mark failed: {str(e)}")
+            return
+        now = time.monotonic()
+        self._until[principal] = now + self.window
+        if len(self._until) > 10_000:
+            self._until = {key: until for key, until in self._until.items() if until > now}
+
+    async def is_sticky(self, principal: Optional[str]) -> bool:
+        if not principal or self.window <= 0:
+            return False
+        if self._redis is not None:
+            try:
+                return bool(await self._redis.exists(f"{self._prefix}:{principal}"))
+            except Exception:
+                # The primary is always a correct answer
+                return True
+        return self._until.get(principal, 0.0) > time.monotonic()
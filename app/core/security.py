@@ -1,117 +1,222 @@
-from datetime import datetime, timedelta
-from typing import Optional, Union, Any
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-import secrets
-import string
-import hashlib
-from .config import settings
-
-#  Password hashing with bcrypt - FIXED
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=12  
-)
-
-
-class SecurityService:
-    @staticmethod
-    def _prepare_password(password: str) -> bytes:
-        """
-        Prepare password for bcrypt (max 72 bytes)
-        Uses SHA256 to hash long passwords first
-        """
-        if len(password.encode('utf-8')) > 72:
-            # Hash long passwords with SHA256 first
-            return hashlib.sha256(password.encode('utf-8')).hexdigest().encode('utf-8')
-        return password.encode('utf-8')
-    
-    @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """Verify a password against its hash"""
-        try:
-            # Prepare password (handle long passwords)
-            prepared = SecurityService._prepare_password(plain_password)
-            return pwd_context.verify(prepared, hashed_password)
-        except Exception as e:
-            print(f"Password verification error: {e}")
-            return False
-    
-    @staticmethod
-    def get_password_hash(password: str) -> str:
-        """Hash a password"""
-        try:
-            # Prepare password (handle long passwords)
-            prepared = SecurityService._prepare_password(password)
-            return pwd_context.hash(prepared)
-        except Exception as e:
-            print(f"Password hashing error: {e}")
-            raise ValueError(f"Failed to hash password: {str(e)}")
-    
-    @staticmethod
-    def create_access_token(
-        subject: Union[str, Any],
-        expires_delta: Optional[timedelta] = None,
-        extra_claims: dict = None
-    ) -> str:
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        
-        to_encode = {
-            "exp": expire,
-            "sub": str(subject),
-            "type": "access"
-        }
-        
-        if extra_claims:
-            to_encode.update(extra_claims)
-        
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-        return encoded_jwt
-    
-    @staticmethod
-    def create_refresh_token(
-        subject: Union[str, Any],
-        extra_claims: dict = None
-    ) -> str:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        
-        to_encode = {
-            "exp": expire,
-            "sub": str(subject),
-            "type": "refresh"
-        }
-        
-        if extra_claims:
-            to_encode.update(extra_claims)
-        
-        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-        return encoded_jwt
-    
-    @staticmethod
-    def decode_token(token: str) -> Optional[dict]:
-        try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            return payload
-        except JWTError:
-            return None
-    
-    @staticmethod
-    def generate_password(length: int = 12) -> str:
-        """Generate a secure random password"""
-        if length > 64:
-            length = 64  # Limit to safe length
-        alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-        password = ''.join(secrets.choice(alphabet) for _ in range(length))
-        return password
-    
-    @staticmethod
-    def generate_api_key() -> str:
-        """Generate a secure API key"""
-        return secrets.token_urlsafe(32)
-
-
+from datetime import datetime, timedelta
+from typing import Optional, Union, Any
+from jose import JWTError, jwt
+from passlib.context import CryptContext
+import logging
+import secrets
+import string
+import hashlib
+import time
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_RESET_AUDIENCE = "password-reset"
+
+#  Password hashing with bcrypt - FIXED
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS or 12
+)
+
+
+def measure_bcrypt_ms(rounds: int, samples: int = 3) -> float:
+    """Median time in ms to hash (= verify) one password at the given cost"""
+    handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float,
+    min_rounds: int,
+    max_rounds: int
+) -> int:
+    """
+    Pick the highest cost whose verify time stays within target_ms.
+
+    Each extra round doubles the work, so measuring stops at the first
+    cost over budget. Never goes below min_rounds.
+    """
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        if measure_bcrypt_ms(rounds) > target_ms:
+            break
+        chosen = rounds
+    return chosen
+
+
+def configure_password_hashing(rounds: int, tolerance: int = 0) -> None:
+    """
+    Hash new passwords at `rounds` and flag stored hashes outside
+    rounds +/- tolerance so they get rehashed on the next login.
+    """
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=max(4, rounds - tolerance),
+        bcrypt__max_rounds=min(31, rounds + tolerance)
+    )
+
+
+class SecurityService:
+    @staticmethod
+    def _prepare_password(password: str) -> bytes:
+        """
+        Prepare password for bcrypt (max 72 bytes)
+        Uses SHA256 to hash long passwords first
+        """
+        if len(password.encode('utf-8')) > 72:
+            # Hash long passwords with SHA256 first
+            return hashlib.sha256(password.encode('utf-8')).hexdigest().encode('utf-8')
+        return password.encode('utf-8')
+    
+    @staticmethod
+    def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash"""
+        try:
+            # Prepare password (handle long passwords)
+            prepared = SecurityService._prepare_password(plain_password)
+            return pwd_context.verify(prepared, hashed_password)
+        except Exception as e:
+            print(f"Password verification error: {e}")
+            return False
+    
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """Check if a stored hash was made with outdated settings"""
+        try:
+            return pwd_context.needs_update(hashed_password)
+        except Exception:
+            return False
+    
+    @staticmethod
+    def tune_password_hashing() -> int:
+        """Apply the pinned or calibrated bcrypt cost (run once at startup)"""
+        if settings.BCRYPT_ROUNDS:
+            rounds = settings.BCRYPT_ROUNDS
+        else:
+            rounds = calibrate_bcrypt_rounds(
+                settings.BCRYPT_TARGET_VERIFY_MS,
+                settings.BCRYPT_MIN_ROUNDS,
+                settings.BCRYPT_MAX_ROUNDS
+            )
+        configure_password_hashing(rounds, settings.BCRYPT_REHASH_TOLERANCE)
+        logger.info(f"bcrypt cost set to {rounds} rounds")
+        return rounds
+    
+    @staticmethod
+    def get_password_hash(password: str) -> str:
+        """Hash a password"""
+        try:
+            # Prepare password (handle long passwords)
+            prepared = SecurityService._prepare_password(password)
+            return pwd_context.hash(prepared)
+        except Exception as e:
+            print(f"Password hashing error: {e}")
+            raise ValueError(f"Failed to hash password: {str(e)}")
+    
+    @staticmethod
+    def create_access_token(
+        subject: Union[str, Any],
+        expires_delta: Optional[timedelta] = None,
+        extra_claims: dict = None
+    ) -> str:
+        if expires_delta:
+            expire = datetime.utcnow() + expires_delta
+        else:
+            expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        
+        to_encode = {
+            "exp": expire,
+            "sub": str(subject),
+            "type": "access",
+            "jti": secrets.token_urlsafe(16)
+        }
+        
+        if extra_claims:
+            to_encode.update(extra_claims)
+        
+        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        return encoded_jwt
+    
+    @staticmethod
+    def create_refresh_token(
+        subject: Union[str, Any],
+        extra_claims: dict = None
+    ) -> str:
+        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        
+        to_encode = {
+            "exp": expire,
+            "sub": str(subject),
+            "type": "refresh",
+            "jti": secrets.token_urlsafe(16)
+        }
+        
+        if extra_claims:
+            to_encode.update(extra_claims)
+        
+        encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        return encoded_jwt
+    
+    @staticmethod
+    def create_password_reset_token(subject: Union[str, Any]) -> str:
+        """
+        Single-use reset token. Its audience makes decode_token reject it,
+        so it can never be used as a bearer token; the jti is revoked when
+        the reset is confirmed.
+        """
+        expire = datetime.utcnow() + timedelta(minutes=settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES)
+        to_encode = {
+            "exp": expire,
+            "sub": str(subject),
+            "aud": PASSWORD_RESET_AUDIENCE,
+            "type": "password_reset",
+            "jti": secrets.token_urlsafe(16)
+        }
+        return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    
+    @staticmethod
+    def decode_token(token: str) -> Optional[dict]:
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            return payload
+        except JWTError:
+            return None
+    
+    @staticmethod
+    def decode_password_reset_token(token: str) -> Optional[dict]:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+                audience=PASSWORD_RESET_AUDIENCE
+            )
+        except JWTError:
+            return None
+        if payload.get("type") != "password_reset" or not payload.get("jti"):
+            return None
+        return payload
+    
+    @staticmethod
+    def generate_password(length: int = 12) -> str:
+        """Generate a secure random password"""
+        if length > 64:
+            length = 64  # Limit to safe length
+        alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+        password = ''.join(secrets.choice(alphabet) for _ in range(length))
+        return password
+    
+    @staticmethod
+    def generate_api_key() -> str:
+        """Generate a secure API key"""
+        return secrets.token_urlsafe(32)
+
+
 security_service = SecurityService()
\ No newline at end of file
@@ -0,0 +1,249 @@
+import hashlib
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+from .logging_config import db_logger
+from .timing import record_phase
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|__\[POSTCOMPILE_\w+\]")
+_IN_LIST = re.compile(r"\bIN \((?:\?, )*\?\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\((?:\?, )*\?\))(?:, \1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+MAX_LOGGED_STATEMENT = 2000
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """
+    (id, normalized text) of a statement: literals and placeholders become
+    ?, IN lists and multi-row VALUES collapse, so statements that differ
+    only in their parameters share a fingerprint.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1, ...", normalized)
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+    return digest, normalized
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Bound parameters with every value replaced by its type name"""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _percentile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class _FingerprintStats:
+    __slots__ = ("statement", "calls", "errors", "total", "max", "samples")
+
+    def __init__(self, statement: str, sample_size: int):
+        self.statement = statement
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+
+
+class QueryStats:
+    """
+    Process-wide per-fingerprint counters. Percentiles come from the most
+    recent `sample_size` durations of each fingerprint; at most
+    `max_fingerprints` are tracked, later ones only count as dropped.
+    """
+
+    def __init__(self, max_fingerprints: int, sample_size: int):
+        self.max_fingerprints = max_fingerprints
+        self.sample_size = sample_size
+        self.reset()
+
+    def reset(self) -> None:
+        self.statements = 0
+        self.slow_statements = 0
+        self.dropped = 0
+        self._by_fingerprint: Dict[str, _FingerprintStats] = {}
+
+    def record(self, fingerprint_id: str, statement: str, seconds: float, error: bool = False) -> None:
+        self.statements += 1
+        stats = self._by_fingerprint.get(fingerprint_id)
+        if stats is None:
+            if len(self._by_fingerprint) >= self.max_fingerprints:
+                self.dropped += 1
+                return
+            stats = self._by_fingerprint[fingerprint_id] = _FingerprintStats(statement, self.sample_size)
+        stats.calls += 1
+        stats.errors += error
+        stats.total += seconds
+        stats.max = max(stats.max, seconds)
+        stats.samples.append(seconds)
+
+    def snapshot(self, limit: int = 50, order_by: str = "total") -> dict:
+        rows = []
+        for fingerprint_id, stats in self._by_fingerprint.items():
+            ordered = sorted(stats.samples)
+            rows.append({
+                "fingerprint": fingerprint_id,
+                "statement": stats.statement,
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "total_ms": round(stats.total * 1000, 3),
+                "mean_ms": round(stats.total * 1000 / stats.calls, 3),
+                "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+                "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+                "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+                "max_ms": round(stats.max * 1000, 3),
+            })
+        sort_key = "calls" if order_by == "calls" else f"{order_by}_ms"
+        rows.sort(key=lambda row: row[sort_key], reverse=True)
+        return {
+            "statements": self.statements,
+            "slow_statements": self.slow_statements,
+            "fingerprints": len(self._by_fingerprint),
+            "dropped_fingerprints": self.dropped,
+            "slow_query_threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+            "queries": rows[:limit],
+        }
+
+
+query_stats = QueryStats(settings.SQL_STATS_MAX_FINGERPRINTS, settings.SQL_STATS_SAMPLE_SIZE)
+
+
+class RequestQueries:
+    """Statements executed while handling one request"""
+
+    __slots__ = ("count", "seconds", "budget", "_fingerprints")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.budget: Optional[int] = None
+        self._fingerprints: Dict[str, List] = {}
+
+    def record(self, fingerprint_id: str, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        entry = self._fingerprints.get(fingerprint_id)
+        if entry is None:
+            self._fingerprints[fingerprint_id] = [statement, 1]
+        else:
+            entry[1] += 1
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def repeated(self, threshold: int) -> List[dict]:
+        """Fingerprints run at least `threshold` times: likely N+1 loads"""
+        return [
+            {"fingerprint": fingerprint_id, "statement": statement, "count": count}
+            for fingerprint_id, (statement, count) in self._fingerprints.items()
+            if count >= threshold
+        ]
+
+
+_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def begin_request_queries():
+    """Start counting statements for the current request; returns (log, reset token)"""
+    queries = RequestQueries()
+    return queries, _request_queries.set(queries)
+
+
+def end_request_queries(token) -> None:
+    _request_queries.reset(token)
+
+
+def current_request_queries() -> Optional[RequestQueries]:
+    return _request_queries.get()
+
+
+class SQLInstrumentation:
+    """
+    Cursor-level timing for an engine: every statement is fingerprinted and
+    counted, and statements slower than SLOW_QUERY_THRESHOLD_MS are logged
+    with their parameters redacted.
+    """
+
+    def __init__(self, stats: QueryStats):
+        self.stats = stats
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - conn.info["query_started"].pop()
+        self._record(statement, parameters, executemany, seconds, error=False)
+
+    def _handle_error(self, exception_context):
+        conn = exception_context.connection
+        started = conn.info.get("query_started") if conn is not None else None
+        if not started or exception_context.statement is None:
+            return
+        seconds = time.perf_counter() - started.pop()
+        self._record(
+            exception_context.statement,
+            exception_context.parameters,
+            bool(exception_context.execution_context and exception_context.execution_context.executemany),
+            seconds,
+            error=True
+        )
+
+    def _record(self, statement: str, parameters: Any, executemany: bool, seconds: float, error: bool) -> None:
+        fingerprint_id, normalized = fingerprint(statement)
+        self.stats.record(fingerprint_id, normalized, seconds, error)
+        request_queries = _request_queries.get()
+        if request_queries is not None:
+            request_queries.record(fingerprint_id, normalized, seconds)
+        record_phase("db", seconds)
+
+        if seconds * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.stats.slow_statements += 1
+            db_logger.warning(
+                f"Slow query: {seconds * 1000:.1f}ms",
+                extra={
+                    "fingerprint": fingerprint_id,
+                    "duration_ms": round(seconds * 1000, 3),
+                    "statement": statement[:MAX_LOGGED_STATEMENT],
+                    "parameters": redact_parameters(parameters, executemany),
+                    "failed": error
+                }
+            )
+
+
+sql_instrumentation = SQLInstrumentation(query_stats)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the instrumentation when SQL_INSTRUMENTATION_ENABLED"""
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        sql_instrumentation.attach(engine)
@@ -0,0 +1,146 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Histogram bucket upper bounds in milliseconds (the last bucket is +Inf)
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class RequestTimings:
+    """
+    Per-phase durations of one request. Phases may overlap (principal
+    includes its own db time), so they do not add up to the total.
+    """
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        # phase -> [seconds, count]
+        self.phases: Dict[str, List] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value"""
+        entries = []
+        for name, (seconds, count) in self.phases.items():
+            entry = f"{name};dur={seconds * 1000:.2f}"
+            if name == "db":
+                entry += f';desc="{count} queries"'
+            entries.append(entry)
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def begin_request_timings():
+    """Start timing the current request; returns (timings, reset token)"""
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+
+def end_request_timings(token) -> None:
+    _request_timings.reset(token)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.record(name, seconds)
+
+
+@contextmanager
+def timing_phase(name: str) -> Iterator[None]:
+    """Time a block as a phase of the current request"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started)
+
+
+def timed(name: str):
+    """Decorator form of timing_phase() for coroutine functions"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timing_phase(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, milliseconds: float) -> None:
+        self.counts[bisect_left(BUCKETS_MS, milliseconds)] += 1
+        self.sum += milliseconds
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        bounds = [str(bound) for bound in BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum, 3),
+            "mean_ms": round(self.sum / self.count, 3) if self.count else None,
+            "buckets": dict(zip(bounds, self.counts)),
+        }
+
+
+class RouteTimingHistograms:
+    """Process-wide phase histograms per route template"""
+
+    def __init__(self, max_routes: int = 500):
+        self.max_routes = max_routes
+        self.reset()
+
+    def reset(self) -> None:
+        self._routes: Dict[Tuple[str, str], Dict[str, _Histogram]] = {}
+
+    def observe(self, method: str, route: str, timings: RequestTimings, total: float) -> None:
+        key = (method, route)
+        phases = self._routes.get(key)
+        if phases is None:
+            if len(self._routes) >= self.max_routes:
+                return
+            phases = self._routes[key] = {}
+        for name, (seconds, _) in timings.phases.items():
+            phases.setdefault(name, _Histogram()).observe(seconds * 1000)
+        phases.setdefault("total", _Histogram()).observe(total * 1000)
+
+    def snapshot(self) -> dict:
+        return {
+            "bucket_bounds_ms": list(BUCKETS_MS),
+            "routes": [
+                {
+                    "method": method,
+                    "route": route,
+                    "phases": {name: histogram.snapshot() for name, histogram in phases.items()},
+                }
+                for (method, route), phases in sorted(self._routes.items(), key=lambda item: item[0][1])
+            ],
+        }
+
+
+route_timings = RouteTimingHistograms()
@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import select, delete, func
+from sqlalchemy.exc import IntegrityError
+from .config import settings
+from .database import AsyncSessionLocal
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# Full rebuild drops expired entries from the filter
+REBUILD_INTERVAL_SECONDS = 3600
+
+# Ids are allocated at insert but become visible at commit, so a lower id can
+# appear after a higher one was synced; each sync re-reads this many ids back
+SYNC_ID_OVERLAP = 1000
+
+
+class BloomFilter:
+    """Fixed-size bloom filter (double hashing over one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class DatabaseRevocationStore:
+    """Authoritative revocation store in the revoked_tokens table"""
+
+    async def add(self, jti: str, token_type: str, expires_at: datetime) -> bool:
+        """False if the jti was already revoked (the unique index decides)"""
+        async with AsyncSessionLocal() as db:
+            db.add(RevokedToken(jti=jti, token_type=token_type, expires_at=expires_at))
+            try:
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                return False
+        return True
+
+    async def contains(self, jti: str) -> bool:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RevokedToken.id).where(RevokedToken.jti == jti)
+            )
+            return result.first() is not None
+
+    async def changes_since(self, cursor: int) -> Tuple[List[str], int]:
+        """
+        jtis revoked after the cursor, plus the new cursor. Overlaps the
+        previous read by SYNC_ID_OVERLAP ids to pick up late commits;
+        re-adding a jti to the filter is harmless.
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RevokedToken.id, RevokedToken.jti)
+                .where(RevokedToken.id > cursor - SYNC_ID_OVERLAP)
+                .order_by(RevokedToken.id)
+            )
+            rows = result.all()
+        if not rows:
+            return [], cursor
+        return [row.jti for row in rows], max(cursor, rows[-1].id)
+
+    async def active(self) -> Tuple[List[str], int]:
+        """All unexpired revocations (purging expired ones first)"""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                delete(RevokedToken).where(RevokedToken.expires_at < func.now())
+            )
+            await db.commit()
+            result = await db.execute(select(RevokedToken.id, RevokedToken.jti))
+            rows = result.all()
+        cursor = max((row.id for row in rows), default=0)
+        return [row.jti for row in rows], cursor
+
+
+class RedisRevocationStore:
+    """
+    Authoritative revocation store in Redis.
+
+    revoked:jti:<jti> keys expire with the token; the revoked:log sorted set
+    (scored by revocation time) feeds incremental sync.
+    """
+
+    def __init__(self, redis_client, prefix: str = "revoked"):
+        self._redis = redis_client
+        self._prefix = prefix
+        self._log_key = f"{prefix}:log"
+        self._max_age = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+    async def add(self, jti: str, token_type: str, expires_at: datetime) -> bool:
+        """False if the jti was already revoked (SET NX decides)"""
+        now = time.time()
+        ttl = max(1, int(expires_at.timestamp() - now))
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(f"{self._prefix}:jti:{jti}", token_type, ex=ttl, nx=True)
+            pipe.zadd(self._log_key, {jti: now})
+            pipe.zremrangebyscore(self._log_key, "-inf", now - self._max_age)
+            added, _, _ = await pipe.execute()
+        return bool(added)
+
+    async def contains(self, jti: str) -> bool:
+        return bool(await self._redis.exists(f"{self._prefix}:jti:{jti}"))
+
+    async def changes_since(self, cursor: float) -> Tuple[List[str], float]:
+        # Inclusive bound: re-adding a jti to the filter is harmless
+        entries = await self._redis.zrangebyscore(
+            self._log_key, cursor, "+inf", withscores=True
+        )
+        if not entries:
+            return [], cursor
+        return [jti for jti, _ in entries], max(score for _, score in entries)
+
+    async def active(self) -> Tuple[List[str], float]:
+        return await self.changes_since(0)
+
+
+class TokenRevocationList:
+    """
+    Per-worker view of revoked token ids.
+
+    The bloom filter answers "definitely not revoked" in pure CPU; only
+    filter hits are confirmed against the authoritative store. Revocations
+    from other workers become visible after at most one sync interval.
+    """
+
+    def __init__(self, store, capacity: int, error_rate: float, sync_interval: float):
+        self.store = store
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._cursor = 0
+        self._last_rebuild = 0.0
+        self._task = None
+
+    async def start(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception as e:
+            logger.error(f"Token revocation list initial load failed: {str(e)}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                if time.monotonic() - self._last_rebuild > REBUILD_INTERVAL_SECONDS:
+                    await self.rebuild()
+                else:
+                    await self.sync()
+            except Exception as e:
+                logger.warning(f"Token revocation sync failed: {str(e)}")
+
+    async def rebuild(self) -> None:
+        """Reload all active revocations into a fresh, right-sized filter"""
+        jtis, cursor = await self.store.active()
+        capacity = max(self._bloom.capacity, len(jtis) * 2)
+        bloom = BloomFilter(capacity, self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._bloom, self._cursor = bloom, cursor
+        self._last_rebuild = time.monotonic()
+
+    async def sync(self) -> None:
+        """Add revocations made since the last sync"""
+        jtis, self._cursor = await self.store.changes_since(self._cursor)
+        for jti in jtis:
+            # Overlapping reads return jtis already added; count each once
+            if jti not in self._bloom:
+                self._bloom.add(jti)
+        if self._bloom.count > self._bloom.capacity:
+            await self.rebuild()
+
+    async def revoke(self, payload: dict) -> bool:
+        """
+        Revoke a decoded token. Returns False if it was already revoked, so
+        single-use tokens can be consumed with one conditional write.
+        """
+        jti = payload.get("jti")
+        if not jti:
+            return False
+        expires_at = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+        added = await self.store.add(jti, payload.get("type", "access"), expires_at)
+        if jti not in self._bloom:
+            self._bloom.add(jti)
+        return added
+
+    async def is_revoked(self, jti: Optional[str]) -> bool:
+        if not jti or jti not in self._bloom:
+            return False
+        return await self.store.contains(jti)
+
+
+def _build_revocation_list() -> TokenRevocationList:
+    if settings.TOKEN_REVOCATION_BACKEND == "redis":
+        from .redis import get_redis
+        store = RedisRevocationStore(get_redis())
+    else:
+        store = DatabaseRevocationStore()
+    return TokenRevocationList(
+        store,
+        capacity=settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+        error_rate=settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+        sync_interval=settings.TOKEN_REVOCATION_SYNC_SECONDS
+    )
+
+
+revocation_list = _build_revocation_list()
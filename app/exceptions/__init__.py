@@ -1,21 +1,23 @@
-from .base_exception import (
-    BaseAPIException,
-    ValidationException,
-    ResourceNotFoundException,
-    DuplicateResourceException,
-    UnauthorizedException,
-    ForbiddenException,
-    BusinessLogicException,
-    ResourceLimitException
-)
-
-__all__ = [
-    "BaseAPIException",
-    "ValidationException",
-    "ResourceNotFoundException",
-    "DuplicateResourceException",
-    "UnauthorizedException",
-    "ForbiddenException",
-    "BusinessLogicException",
-    "ResourceLimitException"
+from .base_exception import (
+    BaseAPIException,
+    ValidationException,
+    ResourceNotFoundException,
+    DuplicateResourceException,
+    UnauthorizedException,
+    ForbiddenException,
+    BusinessLogicException,
+    ResourceLimitException,
+    ServiceUnavailableException
+)
+
+__all__ = [
+    "BaseAPIException",
+    "ValidationException",
+    "ResourceNotFoundException",
+    "DuplicateResourceException",
+    "UnauthorizedException",
+    "ForbiddenException",
+    "BusinessLogicException",
+    "ResourceLimitException",
+    "ServiceUnavailableException"
 ]
\ No newline at end of file
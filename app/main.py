@@ -1,145 +1,209 @@
-from fastapi import FastAPI, Request, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import logging
-from app.core.config import settings
-from app.core.logging_config import setup_logging
-from app.middleware.error_handler import register_exception_handlers
-from app.middleware.request_logging import RequestLoggingMiddleware, RequestContextMiddleware
-from app.api.v1 import auth, companies, websites, users  
-
-# Setup logging first
-setup_logging()
-logger = logging.getLogger(__name__)
-
-# Create FastAPI app
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json",
-    docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
-    redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
-    description="""
-    # Chatbot SaaS Platform API
-    
-    A comprehensive SaaS platform for managing AI-powered chatbots.
-    
-    ## Features
-    
-    * **Authentication & Authorization**: JWT-based authentication with role-based access control
-    * **Company Management**: Create and manage client companies with resource plans
-    * **User Management**: Multi-level user hierarchy with custom permissions
-    * **Website Management**: Create and manage websites with chatbot widgets
-    * **Resource Allocation**: Track and manage resource usage and limits
-    * **Comprehensive Logging**: Structured logging with request tracking
-    * **Error Handling**: Standardized error responses with detailed information
-    
-    ## Authentication
-    
-    All endpoints (except auth endpoints) require a valid JWT token in the Authorization header:
-```
-    Authorization: Bearer <your_access_token>
-```
-    """,
-    contact={
-        "name": "API Support",
-        "email": settings.FIRST_SUPERUSER_EMAIL,
-    },
-)
-
-# ========================
-# CORS Middleware
-# ========================
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# ========================
-# Custom Middlewares
-# ========================
-app.add_middleware(RequestLoggingMiddleware)
-app.add_middleware(RequestContextMiddleware)
-
-# ========================
-# Exception Handlers
-# ========================
-register_exception_handlers(app)
-
-# ========================
-# Health Check Endpoint
-# ========================
-@app.get("/health", tags=["Health"])
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "environment": settings.ENVIRONMENT,
-        "version": settings.VERSION
-    }
-
-@app.get("/", tags=["Root"])
-async def root():
-    """Root endpoint"""
-    return {
-        "message": f"Welcome to {settings.PROJECT_NAME}",
-        "version": settings.VERSION,
-        "docs_url": "/docs" if settings.ENVIRONMENT != "production" else None,
-        "environment": settings.ENVIRONMENT
-    }
-
-# ========================
-# API Routes
-# ========================
-app.include_router(
-    auth.router,
-    prefix=f"{settings.API_V1_STR}/auth",
-    tags=["Authentication"]
-)
-
-app.include_router(
-    companies.router,
-    prefix=f"{settings.API_V1_STR}/companies",
-    tags=["Companies"]
-)
-
-app.include_router(
-    websites.router,
-    prefix=f"{settings.API_V1_STR}/websites",
-    tags=["Websites"]
-)
-
-
-app.include_router(
-    users.router,
-    prefix=f"{settings.API_V1_STR}/users",
-    tags=["Users"]
-)
-
-# ========================
-# Startup & Shutdown Events
-# ========================
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup"""
-    logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info("Application startup complete")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown"""
-    logger.info("Application shutting down")
-
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True if settings.ENVIRONMENT == "development" else False
+from fastapi import FastAPI, Request, status
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+import logging
+from app.core.config import settings
+from app.core.logging_config import setup_logging
+from app.middleware.error_handler import register_exception_handlers
+from app.middleware.request_logging import RequestLoggingMiddleware, RequestContextMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.core.redis import close_redis
+from app.core.database import replica_set
+from app.core.outbox import outbox_worker
+from app.core.partitions import chat_partition_maintainer
+from app.core.security import security_service
+from app.core.token_revocation import revocation_list
+from app.services.auth_service import login_bookkeeper
+from app.services.inference_service import inference_gateway
+from app.services.webhook_service import webhook_dispatcher
+from app.api.v1 import auth, companies, websites, users, widget, admin, exports, chat
+
+# Setup logging first
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Create FastAPI app
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    version=settings.VERSION,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if settings.ENVIRONMENT != "production" else None,
+    redoc_url="/redoc" if settings.ENVIRONMENT != "production" else None,
+    description="""
+    # Chatbot SaaS Platform API
+    
+    A comprehensive SaaS platform for managing AI-powered chatbots.
+    
+    ## Features
+    
+    * **Authentication & Authorization**: JWT-based authentication with role-based access control
+    * **Company Management**: Create and manage client companies with resource plans
+    * **User Management**: Multi-level user hierarchy with custom permissions
+    * **Website Management**: Create and manage websites with chatbot widgets
+    * **Resource Allocation**: Track and manage resource usage and limits
+    * **Comprehensive Logging**: Structured logging with request tracking
+    * **Error Handling**: Standardized error responses with detailed information
+    
+    ## Authentication
+    
+    All endpoints (except auth endpoints) require a valid JWT token in the Authorization header:
+```
+    Authorization: Bearer <your_access_token>
+```
+    """,
+    contact={
+        "name": "API Support",
+        "email": settings.FIRST_SUPERUSER_EMAIL,
+    },
+)
+
+# ========================
+# CORS Middleware
+# ========================
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.BACKEND_CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# ========================
+# Custom Middlewares
+# ========================
+# Starlette runs the last added middleware first:
+# compression -> server timing -> context -> logging -> rate limit -> query budget
+app.add_middleware(QueryBudgetMiddleware)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(CompressionMiddleware)
+
+# ========================
+# Exception Handlers
+# ========================
+register_exception_handlers(app)
+
+# ========================
+# Health Check Endpoint
+# ========================
+@app.get("/health", tags=["Health"])
+async def health_check():
+    """Health check endpoint"""
+    health = {
+        "status": "healthy",
+        "environment": settings.ENVIRONMENT,
+        "version": settings.VERSION
+    }
+    if chat_partition_maintainer.running_out:
+        # Chat messages stop inserting once their class has no partition
+        health["status"] = "degraded"
+        health["chat_partitions_running_out"] = chat_partition_maintainer.running_out
+    return health
+
+@app.get("/", tags=["Root"])
+async def root():
+    """Root endpoint"""
+    return {
+        "message": f"Welcome to {settings.PROJECT_NAME}",
+        "version": settings.VERSION,
+        "docs_url": "/docs" if settings.ENVIRONMENT != "production" else None,
+        "environment": settings.ENVIRONMENT
+    }
+
+# ========================
+# API Routes
+# ========================
+app.include_router(
+    auth.router,
+    prefix=f"{settings.API_V1_STR}/auth",
+    tags=["Authentication"]
+)
+
+app.include_router(
+    companies.router,
+    prefix=f"{settings.API_V1_STR}/companies",
+    tags=["Companies"]
+)
+
+app.include_router(
+    websites.router,
+    prefix=f"{settings.API_V1_STR}/websites",
+    tags=["Websites"]
+)
+
+
+app.include_router(
+    users.router,
+    prefix=f"{settings.API_V1_STR}/users",
+    tags=["Users"]
+)
+
+app.include_router(
+    exports.router,
+    prefix=f"{settings.API_V1_STR}/exports",
+    tags=["Exports"]
+)
+
+app.include_router(
+    chat.router,
+    prefix=f"{settings.API_V1_STR}/chat",
+    tags=["Chat"]
+)
+
+app.include_router(
+    widget.router,
+    prefix=f"{settings.API_V1_STR}/widget",
+    tags=["Widget"]
+)
+
+app.include_router(
+    admin.router,
+    prefix=f"{settings.API_V1_STR}/admin",
+    tags=["Admin"]
+)
+
+# ========================
+# Startup & Shutdown Events
+# ========================
+@app.on_event("startup")
+async def startup_event():
+    """Run on application startup"""
+    logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
+    logger.info(f"Environment: {settings.ENVIRONMENT}")
+    await run_in_threadpool(security_service.tune_password_hashing)
+    await login_bookkeeper.start()
+    await revocation_list.start()
+    await replica_set.start()
+    await outbox_worker.start()
+    await chat_partition_maintainer.start()
+    logger.info("Application startup complete")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on application shutdown"""
+    logger.info("Application shutting down")
+    await chat_partition_maintainer.stop()
+    await outbox_worker.stop()
+    await webhook_dispatcher.close()
+    await inference_gateway.close()
+    await replica_set.stop()
+    await revocation_list.stop()
+    await login_bookkeeper.stop()
+    await close_redis()
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True if settings.ENVIRONMENT == "development" else False
     )
\ No newline at end of file
@@ -0,0 +1,285 @@
+import gzip
+import hashlib
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+# Bodies still growing past this size are compressed as a stream
+STREAM_BUFFER_BYTES = 64 * 1024
+
+
+class CompressionStats:
+    """Process-wide counters for bytes saved vs CPU spent"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.compressed = 0
+        self.skipped_small = 0
+        self.cache_hits = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.cpu_seconds = 0.0
+        self.by_encoding: Dict[str, int] = {}
+
+    def record(
+        self,
+        encoding: str,
+        bytes_in: int,
+        bytes_out: int,
+        seconds: float,
+        completed: bool = True
+    ) -> None:
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        self.cpu_seconds += seconds
+        if completed:
+            self.compressed += 1
+            self.by_encoding[encoding] = self.by_encoding.get(encoding, 0) + 1
+
+    def snapshot(self) -> dict:
+        saved = self.bytes_in - self.bytes_out
+        return {
+            "responses_compressed": self.compressed,
+            "responses_skipped_small": self.skipped_small,
+            "precompressed_cache_hits": self.cache_hits,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": saved,
+            "compression_ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else None,
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "bytes_saved_per_cpu_ms": round(saved / (self.cpu_seconds * 1000), 1) if self.cpu_seconds else None,
+            "by_encoding": dict(self.by_encoding),
+        }
+
+
+compression_stats = CompressionStats()
+
+
+class PrecompressedCache:
+    """Content-addressed LRU of compressed bodies, bounded by total bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[bytes, str], bytes]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: Tuple[bytes, str]) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple[bytes, str], value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self._size += len(value)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from Accept-Encoding, honouring q=0"""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        offered[token.strip()] = q
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str, best: bool) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if best else settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if best else settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    """Incremental compressor for streamed (chunked) responses"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    gzip/brotli response compression (pure ASGI, so streamed responses stay
+    streamed).
+
+    - Bodies under COMPRESSION_MIN_SIZE are sent as-is
+    - Precompress paths (stable documents such as the OpenAPI schema) are
+      compressed once at maximum quality and served from a content-addressed
+      cache afterwards
+    - Cache-Control: public bodies go through the same cache but are
+      compressed at the normal COMPRESSION_* level, so a body that never
+      repeats costs no more than any other response
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.COMPRESSION_MIN_SIZE
+        self.cache = PrecompressedCache(settings.COMPRESSION_CACHE_MAX_BYTES)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        precompress = scope["path"] in settings.COMPRESSION_PRECOMPRESS_PATHS
+        responder = _CompressionResponder(self, send, encoding, precompress)
+        await self.app(scope, receive, responder)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, send: Send, encoding: str, precompress: bool):
+        self.middleware = middleware
+        self.send = send
+        self.encoding = encoding
+        self.precompress = precompress
+        self.cacheable = precompress
+        self.start_message: Optional[Message] = None
+        self.active = False
+        self.buffer = bytearray()
+        self.streamer: Optional[_StreamCompressor] = None
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.active = (
+                "content-encoding" not in headers
+                and message["status"] not in (204, 304)
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            self.cacheable = self.precompress or "public" in headers.get("cache-control", "")
+            self.start_message = message
+            if not self.active:
+                await self.send(message)
+            return
+
+        if message["type"] != "http.response.body" or not self.active:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.streamer is not None:
+            await self._send_stream_chunk(body, more_body)
+            return
+
+        # Responses arrive in chunks even when they are not really streamed
+        # (BaseHTTPMiddleware always ends with an empty chunk), so buffer
+        # until the body is complete or clearly too large to hold
+        self.buffer += body
+        if not more_body:
+            await self._send_whole(bytes(self.buffer))
+            return
+
+        limit = self.middleware.cache.max_bytes if self.cacheable else STREAM_BUFFER_BYTES
+        if len(self.buffer) > limit:
+            self.streamer = _StreamCompressor(self.encoding)
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["content-length"]
+            await self.send(self.start_message)
+            buffered, self.buffer = bytes(self.buffer), bytearray()
+            await self._send_stream_chunk(buffered, more_body)
+
+    async def _send_stream_chunk(self, body: bytes, more_body: bool) -> None:
+        started = time.perf_counter()
+        data = self.streamer.compress(body) if body else b""
+        if not more_body:
+            data += self.streamer.finish()
+        compression_stats.record(
+            self.encoding, len(body), len(data), time.perf_counter() - started,
+            completed=not more_body
+        )
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _send_whole(self, body: bytes) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        headers.add_vary_header("Accept-Encoding")
+
+        if len(body) < self.middleware.minimum_size:
+            compression_stats.skipped_small += 1
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        compressed = None
+        cache_key = None
+        if self.cacheable:
+            cache_key = (hashlib.sha1(body).digest(), self.encoding)
+            compressed = self.middleware.cache.get(cache_key)
+            if compressed is not None:
+                compression_stats.cache_hits += 1
+
+        if compressed is None:
+            started = time.perf_counter()
+            compressed = _compress(body, self.encoding, best=self.precompress)
+            compression_stats.record(self.encoding, len(body), len(compressed), time.perf_counter() - started)
+            if cache_key is not None:
+                self.middleware.cache.put(cache_key, compressed)
+        else:
+            compression_stats.bytes_in += len(body)
+            compression_stats.bytes_out += len(compressed)
+
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        await self.send(self.start_message)
+        await self.send({"type": "http.response.body", "body": compressed})
@@ -0,0 +1,57 @@
+from typing import Callable
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+from app.core.logging_config import api_logger
+from app.core.sql_instrumentation import begin_request_queries, end_request_queries
+
+
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    """
+    Counts SQL statements per request (DB time itself is reported by
+    ServerTimingMiddleware).
+
+    - Warns when an endpoint exceeds the budget declared with the QueryBudget
+      dependency, or runs one fingerprint QUERY_REPEAT_THRESHOLD+ times (N+1)
+    - With QUERY_BUDGET_STRICT (tests/CI) such responses become 500s
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        queries, token = begin_request_queries()
+        try:
+            response = await call_next(request)
+        finally:
+            end_request_queries(token)
+
+        repeated = queries.repeated(settings.QUERY_REPEAT_THRESHOLD)
+        if not queries.over_budget and not repeated:
+            return response
+
+        details = {
+            "queries": queries.count,
+            "budget": queries.budget,
+            "repeated": repeated
+        }
+        api_logger.warning(
+            f"Query budget exceeded: {request.method} {request.url.path}"
+            if queries.over_budget else
+            f"Repeated queries (possible N+1): {request.method} {request.url.path}",
+            extra={
+                "request_id": getattr(request.state, "request_id", None),
+                "path": request.url.path,
+                **details
+            }
+        )
+
+        if settings.QUERY_BUDGET_STRICT:
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={
+                    "success": False,
+                    "error": "Query budget exceeded",
+                    "details": details,
+                    "path": str(request.url.path)
+                }
+            )
+        return response
@@ -0,0 +1,108 @@
+from typing import Callable, Optional
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+from app.core.logging_config import security_logger
+from app.core.rate_limit import RateLimiter, build_rate_limit_headers, get_rate_limiter
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def _widget_key(request: Request) -> Optional[str]:
+    """Widget key from the X-Widget-Key header or a /widget/{key} path segment"""
+    key = request.headers.get("x-widget-key")
+    if key:
+        return key
+    parts = request.url.path.strip("/").split("/")
+    if "widget" in parts:
+        index = parts.index("widget")
+        if index + 1 < len(parts):
+            return parts[index + 1]
+    return None
+
+
+def rate_limit_identity(request: Request, scope: str) -> Optional[str]:
+    """Resolve the identity a rule is keyed by (None = rule does not apply)"""
+    state = request.state
+    if scope == "ip":
+        return _client_ip(request)
+    if scope == "principal":
+        user_id = getattr(state, "user_id", None)
+        if user_id:
+            return f"{getattr(state, 'user_type', None)}:{user_id}"
+        return f"ip:{_client_ip(request)}"
+    if scope == "company":
+        company_id = getattr(state, "company_id", None)
+        return str(company_id) if company_id else None
+    if scope == "widget":
+        return _widget_key(request)
+    return None
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Reject abusive clients before any route, DB or password hashing work.
+
+    Must run inside RequestContextMiddleware, which puts the token principal
+    on request.state.
+    """
+
+    def __init__(self, app, limiter: Optional[RateLimiter] = None):
+        super().__init__(app)
+        self._limiter = limiter
+
+    @property
+    def limiter(self) -> RateLimiter:
+        if self._limiter is None:
+            self._limiter = get_rate_limiter()
+        return self._limiter
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        if not settings.RATE_LIMIT_ENABLED:
+            return await call_next(request)
+
+        tightest = None
+        for rule in self.limiter.rules_for(request.method, request.url.path):
+            identity = rate_limit_identity(request, rule.scope)
+            if identity is None:
+                continue
+
+            result = await self.limiter.check(rule, identity)
+            if not result.allowed:
+                security_logger.warning(
+                    f"Rate limit exceeded: {rule.name}",
+                    extra={
+                        "rule": rule.name,
+                        "scope": rule.scope,
+                        "identity": identity,
+                        "path": request.url.path
+                    }
+                )
+                return JSONResponse(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    content={
+                        "success": False,
+                        "error": "Rate limit exceeded",
+                        "details": {
+                            "rule": rule.name,
+                            "limit": rule.limit,
+                            "window_seconds": rule.window_seconds,
+                            "retry_after": round(result.retry_after, 3)
+                        },
+                        "path": str(request.url.path)
+                    },
+                    headers=build_rate_limit_headers(rule, result)
+                )
+
+            if tightest is None or result.remaining < tightest[1].remaining:
+                tightest = (rule, result)
+
+        response = await call_next(request)
+
+        # Report the policy closest to being exhausted
+        if tightest is not None:
+            response.headers.update(build_rate_limit_headers(*tightest))
+        return response
@@ -0,0 +1,32 @@
+from typing import Callable
+from fastapi import Request, Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+from app.core.profiler import triggered_profiler
+from app.core.timing import begin_request_timings, end_request_timings, route_timings
+
+
+class ServerTimingMiddleware(BaseHTTPMiddleware):
+    """
+    Collects per-phase timings (auth, principal, db, validate, serialize,
+    error) through a contextvar, emits them as a Server-Timing header and
+    feeds the per-route histograms.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        timings, token = begin_request_timings()
+        try:
+            response = await call_next(request)
+        finally:
+            end_request_timings(token)
+        total = timings.total()
+
+        # Route templates keep the histogram count bounded; 404s share one entry
+        route = getattr(request.scope.get("route"), "path", "<unmatched>")
+        route_timings.observe(request.method, route, timings, total)
+        if triggered_profiler.armed:
+            triggered_profiler.observe(request.method, route, timings.started, timings.started + total)
+
+        if settings.SERVER_TIMING_ENABLED:
+            response.headers.append("Server-Timing", timings.server_timing(total))
+        return response
@@ -1,33 +1,37 @@
-from app.core.database import Base
-
-
-from app.models.system_admin import SystemAdmin
-from app.models.client_company import ClientCompany
-from app.models.resource_plan import ResourcePlan
-from app.models.resource_allocation import ResourceAllocation
-from app.models.website import Website
-from app.models.ai_model import AiModel
-from app.models.company_user import CompanyUser
-from app.models.chat_session import ChatSession
-from app.models.chat_message import ChatMessage
-from app.models.usage_analytics import UsageAnalytics
-from app.models.api_key import ApiKey
-from app.models.billing_record import BillingRecord
-from app.models.user_website_access import UserWebsiteAccess
-
-
-__all__ = [
-    "SystemAdmin",
-    "ClientCompany",
-    "ResourcePlan",
-    "ResourceAllocation",
-    "Website",
-    "AiModel",
-    "CompanyUser",
-    "ChatSession",
-    "ChatMessage",
-    "UsageAnalytics",
-    "ApiKey",
-    "BillingRecord",
-    "UserWebsiteAccess",
+from app.core.database import Base
+
+
+from app.models.system_admin import SystemAdmin
+from app.models.client_company import ClientCompany
+from app.models.resource_plan import ResourcePlan
+from app.models.resource_allocation import ResourceAllocation
+from app.models.website import Website
+from app.models.ai_model import AiModel
+from app.models.company_user import CompanyUser
+from app.models.chat_session import ChatSession
+from app.models.chat_message import ChatMessage
+from app.models.usage_analytics import UsageAnalytics
+from app.models.api_key import ApiKey
+from app.models.billing_record import BillingRecord
+from app.models.user_website_access import UserWebsiteAccess
+from app.models.revoked_token import RevokedToken
+from app.models.outbox_job import OutboxJob
+
+
+__all__ = [
+    "SystemAdmin",
+    "ClientCompany",
+    "ResourcePlan",
+    "ResourceAllocation",
+    "Website",
+    "AiModel",
+    "CompanyUser",
+    "ChatSession",
+    "ChatMessage",
+    "UsageAnalytics",
+    "ApiKey",
+    "BillingRecord",
+    "UserWebsiteAccess",
+    "RevokedToken",
+    "OutboxJob",
 ]
\ No newline at end of file
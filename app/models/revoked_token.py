@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from ..core.database import Base
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # Monotonic id doubles as the incremental sync cursor (read with an overlap)
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(64), unique=True, index=True, nullable=False)
+    token_type = Column(String(20), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from typing import List, Optional
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+from app.repositories.base_repository import BaseRepository
+
+# Messages are stamped by the app server; allow for clock differences
+# between the worker that started the session and the one that wrote them
+_CLOCK_SLACK = timedelta(minutes=5)
+
+
+class ChatMessageRepository(BaseRepository[ChatMessage]):
+    """
+    Repository for ChatMessage operations.
+
+    chat_messages is partitioned by retention class and month on Postgres,
+    so every query here carries both partition keys as constants taken
+    from the session: its retention class, and created_at no earlier than
+    the session's start. The planner then only opens that class's months
+    since the session began.
+    """
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(ChatMessage, db)
+
+    @staticmethod
+    def session_scope(session: ChatSession) -> ColumnElement:
+        """Predicates for one session's messages that allow partition pruning"""
+        return and_(
+            ChatMessage.session_id == session.session_id,
+            ChatMessage.retention_days == session.retention_days,
+            ChatMessage.created_at >= session.started_at - _CLOCK_SLACK
+        )
+
+    async def get_after(
+        self,
+        session: ChatSession,
+        after_message_id: int = 0,
+        limit: Optional[int] = None,
+        newest_first: bool = False
+    ) -> List[ChatMessage]:
+        """A session's messages with ids above after_message_id"""
+        query = (
+            select(ChatMessage)
+            .where(self.session_scope(session), ChatMessage.message_id > after_message_id)
+            .order_by(ChatMessage.message_id.desc() if newest_first else ChatMessage.message_id)
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        result = await self.db.execute(query)
+        return result.scalars().all()
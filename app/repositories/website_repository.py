@@ -1,103 +1,140 @@
-from typing import Optional, List
-from sqlalchemy import select, or_
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-
-from app.models.website import Website
-from app.repositories.base_repository import BaseRepository
-
-
-class WebsiteRepository(BaseRepository[Website]):
-    """Repository for Website operations"""
-    
-    def __init__(self, db: AsyncSession):
-        super().__init__(Website, db)
-    
-    async def get_by_company(
-        self,
-        company_id: int,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Website]:
-        """Get all websites for a company"""
-        result = await self.db.execute(
-            select(Website)
-            .where(Website.company_id == company_id)
-            .offset(skip)
-            .limit(limit)
-        )
-        return result.scalars().all()
-    
-    async def get_by_domain(self, domain: str) -> Optional[Website]:
-        """Get website by domain"""
-        result = await self.db.execute(
-            select(Website).where(Website.domain == domain)
-        )
-        return result.scalar_one_or_none()
-    
-    async def get_by_url(self, url: str) -> Optional[Website]:
-        """Get website by URL"""
-        result = await self.db.execute(
-            select(Website).where(Website.website_url == url)
-        )
-        return result.scalar_one_or_none()
-    
-    async def search_websites(
-        self,
-        company_id: int,
-        query: str,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Website]:
-        """Search websites by name or domain"""
-        result = await self.db.execute(
-            select(Website)
-            .where(
-                Website.company_id == company_id,
-                or_(
-                    Website.website_name.ilike(f"%{query}%"),
-                    Website.domain.ilike(f"%{query}%"),
-                    Website.website_url.ilike(f"%{query}%")
-                )
-            )
-            .offset(skip)
-            .limit(limit)
-        )
-        return result.scalars().all()
-    
-    async def get_with_models(self, id: int) -> Optional[Website]:
-        """Get website with AI models"""
-        result = await self.db.execute(
-            select(Website)
-            .options(selectinload(Website.ai_models))
-            .where(Website.id == id)
-        )
-        return result.scalar_one_or_none()
-    
-    async def get_active_by_company(
-        self,
-        company_id: int,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Website]:
-        """Get all active websites for a company"""
-        result = await self.db.execute(
-            select(Website)
-            .where(
-                Website.company_id == company_id,
-                Website.is_active == True
-            )
-            .offset(skip)
-            .limit(limit)
-        )
-        return result.scalars().all()
-    
-    async def count_by_company(self, company_id: int) -> int:
-        """Count websites for a company"""
-        from sqlalchemy import func
-        result = await self.db.execute(
-            select(func.count())
-            .select_from(Website)
-            .where(Website.company_id == company_id)
-        )
+from typing import Any, Optional, List, Sequence
+from sqlalchemy import select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, load_only
+
+from app.models.website import Website
+from app.repositories.base_repository import BaseRepository
+
+
+class WebsiteRepository(BaseRepository[Website]):
+    """Repository for Website operations"""
+    
+    def __init__(self, db: AsyncSession):
+        super().__init__(Website, db)
+    
+    async def get_by_company(
+        self,
+        company_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Website]:
+        """Get all websites for a company"""
+        result = await self.db.execute(
+            self._select(columns)
+            .where(Website.company_id == company_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+    
+    async def get_by_domain(self, domain: str) -> Optional[Website]:
+        """Get website by domain"""
+        result = await self.db.execute(
+            select(Website).where(Website.domain == domain)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_widget_config(self, widget_api_key: str) -> Optional[Website]:
+        """Get the public widget configuration of an active website"""
+        result = await self.db.execute(
+            select(Website)
+            .options(load_only(
+                Website.widget_api_key,
+                Website.widget_position,
+                Website.widget_color,
+                Website.widget_size,
+                Website.widget_icon,
+                Website.welcome_message,
+                Website.placeholder_text,
+                Website.show_powered_by,
+                Website.custom_css,
+                Website.auto_open_delay,
+                Website.enable_sound,
+                Website.business_hours_enabled,
+                Website.business_hours,
+                Website.offline_message,
+                Website.created_at,
+                Website.updated_at
+            ))
+            .where(
+                Website.widget_api_key == widget_api_key,
+                Website.is_active == True,
+                Website.widget_status == "active"
+            )
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_by_url(self, url: str) -> Optional[Website]:
+        """Get website by URL"""
+        result = await self.db.execute(
+            select(Website).where(Website.website_url == url)
+        )
+        return result.scalar_one_or_none()
+    
+    async def search_websites(
+        self,
+        company_id: int,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Website]:
+        """Search websites by name or domain"""
+        result = await self.db.execute(
+            self._select(columns)
+            .where(
+                Website.company_id == company_id,
+                or_(
+                    Website.website_name.ilike(f"%{query}%"),
+                    Website.domain.ilike(f"%{query}%"),
+                    Website.website_url.ilike(f"%{query}%")
+                )
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+    
+    async def get_with_models(
+        self,
+        id: int,
+        columns: Optional[Sequence[Any]] = None
+    ) -> Optional[Website]:
+        """Get website with AI models"""
+        result = await self.db.execute(
+            self._select(columns)
+            .options(selectinload(Website.ai_models))
+            .where(Website.id == id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_active_by_company(
+        self,
+        company_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Website]:
+        """Get all active websites for a company"""
+        result = await self.db.execute(
+            self._select(columns)
+            .where(
+                Website.company_id == company_id,
+                Website.is_active == True
+            )
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.scalars().all()
+    
+    async def count_by_company(self, company_id: int) -> int:
+        """Count websites for a company"""
+        from sqlalchemy import func
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(Website)
+            .where(Website.company_id == company_id)
+        )
         return result.scalar_one()
\ No newline at end of file
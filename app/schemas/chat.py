@@ -0,0 +1,50 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+
+
+class ChatSessionCreate(BaseModel):
+    website_id: int
+    session_name: Optional[str] = Field(None, max_length=255)
+
+
+class ChatSessionResponse(BaseModel):
+    session_id: int
+    website_id: int
+    user_id: int
+    model_id: int
+    session_name: Optional[str] = None
+    started_at: datetime
+    last_activity_at: datetime
+    ended_at: Optional[datetime] = None
+    is_active: bool
+    
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ChatMessageCreate(BaseModel):
+    content: str = Field(..., min_length=1, max_length=8000)
+
+
+class ChatMessageResponse(BaseModel):
+    message_id: int
+    session_id: int
+    message_type: str
+    message_content: str
+    message_metadata: Optional[dict] = None
+    created_at: datetime
+    response_time_ms: Optional[int] = None
+    tokens_used: Optional[Decimal] = None
+    is_user_message: bool
+    
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class ChatReplyResponse(BaseModel):
+    user_message: ChatMessageResponse
+    assistant_message: ChatMessageResponse
@@ -0,0 +1,73 @@
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Type
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect
+
+from app.exceptions import ValidationException
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], names: FrozenSet[str]) -> Type[BaseModel]:
+    """Response model restricted to the given fields (built once per combination)"""
+    fields = {
+        name: (info.annotation, info)
+        for name, info in model.model_fields.items()
+        if name in names
+    }
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__={"from_attributes": True},
+        **fields
+    )
+
+
+class Fieldset:
+    """
+    A sparse fieldset requested with ?fields=.
+
+    - model: response model to validate with (the default model when no
+      fields were requested)
+    - columns(): ORM columns to load, or None for full rows
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        names: Optional[FrozenSet[str]] = None
+    ):
+        self.names = names
+        self.model = model if names is None else partial_model(model, names)
+
+    def columns(self, orm_model: Any, *required: Any) -> Optional[List[Any]]:
+        """Columns for load_only, plus any the endpoint itself reads"""
+        if self.names is None:
+            return None
+        column_keys = inspect(orm_model).column_attrs.keys()
+        if not self.names.issubset(column_keys):
+            # A computed/relationship field needs the full row
+            return None
+        return [getattr(orm_model, name) for name in sorted(self.names)] + list(required)
+
+
+def parse_fieldset(
+    model: Type[BaseModel],
+    fields: Optional[str],
+    default_model: Optional[Type[BaseModel]] = None
+) -> Fieldset:
+    """Parse a comma separated field list against a response model"""
+    if not fields:
+        return Fieldset(default_model or model)
+
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = names - set(model.model_fields)
+    if unknown:
+        raise ValidationException(
+            message="Unknown fields requested",
+            details={
+                "unknown_fields": sorted(unknown),
+                "allowed_fields": list(model.model_fields)
+            }
+        )
+    # id is always returned so clients can key partial records
+    names.add("id")
+    return Fieldset(model, frozenset(names))
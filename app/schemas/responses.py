@@ -1,142 +1,208 @@
-from typing import Generic, TypeVar, Optional, List, Any, Dict
-from pydantic import BaseModel, Field
-from datetime import datetime
-
-T = TypeVar('T')
-
-
-class SuccessResponse(BaseModel, Generic[T]):
-    """Standard success response wrapper"""
-    success: bool = True
-    data: T
-    message: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": {"id": 1, "name": "Example"},
-                "message": "Operation completed successfully",
-                "timestamp": "2025-10-22T12:00:00Z"
-            }
-        }
-
-
-class ErrorResponse(BaseModel):
-    """Standard error response wrapper"""
-    success: bool = False
-    error: str
-    details: Optional[Dict[str, Any]] = None
-    path: Optional[str] = None
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": False,
-                "error": "Resource not found",
-                "details": {"resource": "Company", "id": 123},
-                "path": "/api/v1/companies/123",
-                "timestamp": "2025-10-22T12:00:00Z"
-            }
-        }
-
-
-class PaginatedResponse(BaseModel, Generic[T]):
-    """Standard paginated response wrapper"""
-    success: bool = True
-    data: List[T]
-    pagination: "PaginationMeta"
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "data": [{"id": 1, "name": "Item 1"}],
-                "pagination": {
-                    "total": 100,
-                    "page": 1,
-                    "page_size": 10,
-                    "total_pages": 10
-                },
-                "timestamp": "2025-10-22T12:00:00Z"
-            }
-        }
-
-
-class PaginationMeta(BaseModel):
-    """Pagination metadata"""
-    total: int = Field(..., description="Total number of items")
-    page: int = Field(..., ge=1, description="Current page number")
-    page_size: int = Field(..., ge=1, le=100, description="Number of items per page")
-    total_pages: int = Field(..., description="Total number of pages")
-    
-    @classmethod
-    def create(cls, total: int, page: int, page_size: int) -> "PaginationMeta":
-        """Create pagination metadata"""
-        total_pages = (total + page_size - 1) // page_size if page_size > 0 else 0
-        return cls(
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
-
-
-class MessageResponse(BaseModel):
-    """Simple message response"""
-    success: bool = True
-    message: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "success": True,
-                "message": "Operation completed successfully",
-                "timestamp": "2025-10-22T12:00:00Z"
-            }
-        }
-
-
-# Helper functions for creating responses
-def success_response(data: Any, message: Optional[str] = None) -> dict:
-    """Create a success response"""
-    return {
-        "success": True,
-        "data": data,
-        "message": message,
-        "timestamp": datetime.utcnow()
-    }
-
-
-def error_response(
-    error: str,
-    details: Optional[Dict[str, Any]] = None,
-    path: Optional[str] = None
-) -> dict:
-    """Create an error response"""
-    return {
-        "success": False,
-        "error": error,
-        "details": details,
-        "path": path,
-        "timestamp": datetime.utcnow()
-    }
-
-
-def paginated_response(
-    data: List[Any],
-    total: int,
-    page: int,
-    page_size: int
-) -> dict:
-    """Create a paginated response"""
-    return {
-        "success": True,
-        "data": data,
-        "pagination": PaginationMeta.create(total, page, page_size).dict(),
-        "timestamp": datetime.utcnow()
-    }
\ No newline at end of file
+from typing import Generic, TypeVar, Optional, List, Any, Dict
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
+from fastapi import Response, status
+from datetime import datetime
+from app.core.timing import timing_phase
+
+T = TypeVar('T')
+
+
+class SuccessResponse(BaseModel, Generic[T]):
+    """Standard success response wrapper"""
+    success: bool = True
+    data: T
+    message: Optional[str] = None
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "success": True,
+                "data": {"id": 1, "name": "Example"},
+                "message": "Operation completed successfully",
+                "timestamp": "2025-10-22T12:00:00Z"
+            }
+        }
+
+
+class ErrorResponse(BaseModel):
+    """Standard error response wrapper"""
+    success: bool = False
+    error: str
+    details: Optional[Dict[str, Any]] = None
+    path: Optional[str] = None
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "success": False,
+                "error": "Resource not found",
+                "details": {"resource": "Company", "id": 123},
+                "path": "/api/v1/companies/123",
+                "timestamp": "2025-10-22T12:00:00Z"
+            }
+        }
+
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    """Standard paginated response wrapper"""
+    success: bool = True
+    data: List[T]
+    pagination: "PaginationMeta"
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "success": True,
+                "data": [{"id": 1, "name": "Item 1"}],
+                "pagination": {
+                    "total": 100,
+                    "page": 1,
+                    "page_size": 10,
+                    "total_pages": 10
+                },
+                "timestamp": "2025-10-22T12:00:00Z"
+            }
+        }
+
+
+class PaginationMeta(BaseModel):
+    """Pagination metadata"""
+    total: int = Field(..., description="Total number of items")
+    page: int = Field(..., ge=1, description="Current page number")
+    page_size: int = Field(..., ge=1, le=100, description="Number of items per page")
+    total_pages: int = Field(..., description="Total number of pages")
+    
+    @classmethod
+    def create(cls, total: int, page: int, page_size: int) -> "PaginationMeta":
+        """Create pagination metadata"""
+        total_pages = (total + page_size - 1) // page_size if page_size > 0 else 0
+        return cls(
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages
+        )
+
+
+# Resolve the forward reference to PaginationMeta
+PaginatedResponse.model_rebuild()
+
+
+class MessageResponse(BaseModel):
+    """Simple message response"""
+    success: bool = True
+    message: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "success": True,
+                "message": "Operation completed successfully",
+                "timestamp": "2025-10-22T12:00:00Z"
+            }
+        }
+
+
+# Helper functions for creating responses
+def success_response(data: Any, message: Optional[str] = None) -> dict:
+    """Create a success response"""
+    return {
+        "success": True,
+        "data": data,
+        "message": message,
+        "timestamp": datetime.utcnow()
+    }
+
+
+def error_response(
+    error: str,
+    details: Optional[Dict[str, Any]] = None,
+    path: Optional[str] = None
+) -> dict:
+    """Create an error response"""
+    return {
+        "success": False,
+        "error": error,
+        "details": details,
+        "path": path,
+        "timestamp": datetime.utcnow()
+    }
+
+
+def paginated_response(
+    data: List[Any],
+    total: int,
+    page: int,
+    page_size: int
+) -> dict:
+    """Create a paginated response"""
+    return {
+        "success": True,
+        "data": data,
+        "pagination": PaginationMeta.create(total, page, page_size).model_dump(),
+        "timestamp": datetime.utcnow()
+    }
+
+
+# ========================
+# Fast-path responses
+# ========================
+# Endpoints that already hold validated response models return these instead
+# of dicts: the wrapper is built without re-validation and serialized straight
+# to JSON bytes by pydantic-core, skipping FastAPI's response_model pass and
+# jsonable_encoder. response_model on the route still documents the schema.
+
+class JSONBytesResponse(Response):
+    """Response whose content is already encoded JSON"""
+    media_type = "application/json"
+
+
+def success_json(
+    data: Any,
+    message: Optional[str] = None,
+    status_code: int = status.HTTP_200_OK,
+    timestamp: Optional[datetime] = None
+) -> JSONBytesResponse:
+    """
+    Create a success response from already-validated data. Pass a fixed
+    timestamp (e.g. the resource's updated_at) to keep the body byte-stable
+    for caches.
+    """
+    body = SuccessResponse.model_construct(
+        success=True,
+        data=data,
+        message=message,
+        timestamp=timestamp or datetime.utcnow()
+    )
+    with timing_phase("serialize"):
+        content = to_json(body)
+    return JSONBytesResponse(content=content, status_code=status_code)
+
+
+def paginated_json(
+    data: List[Any],
+    total: int,
+    page: int,
+    page_size: int
+) -> JSONBytesResponse:
+    """Create a paginated response from already-validated data"""
+    body = PaginatedResponse.model_construct(
+        success=True,
+        data=data,
+        pagination=PaginationMeta.create(total, page, page_size),
+        timestamp=datetime.utcnow()
+    )
+    with timing_phase("serialize"):
+        content = to_json(body)
+    return JSONBytesResponse(content=content)
+
+
+def validate_all(model: Any, items: List[Any]) -> List[Any]:
+    """Validate ORM objects into response models (timed as "validate")"""
+    with timing_phase("validate"):
+        return [model.model_validate(item) for item in items]
@@ -0,0 +1,356 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple, Type, Union
+from fastapi import BackgroundTasks, HTTPException, status
+from sqlalchemy import select, update, case, func
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging_config import security_logger
+from app.core.security import security_service
+from app.core.token_revocation import revocation_list
+from app.models.system_admin import SystemAdmin
+from app.models.company_user import CompanyUser
+from app.services.email_service import queue_email
+
+logger = logging.getLogger(__name__)
+
+PrincipalModel = Union[Type[SystemAdmin], Type[CompanyUser]]
+
+
+class LoginBookkeeper:
+    """
+    Batches successful-login bookkeeping (last_login_at) off the request path.
+
+    Repeated logins by the same principal inside one flush interval collapse
+    into a single row update.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int = 1000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[Tuple[PrincipalModel, int], datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def record(self, model: PrincipalModel, principal_id: int, logged_in_at: datetime) -> None:
+        """Queue a last_login_at update"""
+        self._pending[(model, principal_id)] = logged_in_at
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Login bookkeeping flush failed: {str(e)}")
+
+    async def flush(self) -> None:
+        """Write all pending updates, one executemany per model"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+
+        by_model: Dict[PrincipalModel, list] = {}
+        for (model, principal_id), logged_in_at in pending.items():
+            by_model.setdefault(model, []).append(
+                {"id": principal_id, "last_login_at": logged_in_at}
+            )
+
+        async with AsyncSessionLocal() as db:
+            for model, rows in by_model.items():
+                await db.execute(update(model), rows)
+            await db.commit()
+
+
+login_bookkeeper = LoginBookkeeper(settings.LOGIN_BOOKKEEPING_FLUSH_SECONDS)
+
+
+async def rehash_password(
+    model: PrincipalModel,
+    principal_id: int,
+    old_hash: str,
+    password: str
+) -> None:
+    """
+    Re-hash a password with the current cost after the response was sent.
+
+    The update is guarded on the old hash so a password change that raced
+    the login is never overwritten.
+    """
+    try:
+        new_hash = await run_in_threadpool(security_service.get_password_hash, password)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(model)
+                .where(model.id == principal_id, model.password_hash == old_hash)
+                .values(password_hash=new_hash)
+            )
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Password rehash failed: {str(e)}")
+
+
+class AuthService:
+    """Service for login and token issuing"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _load_credentials(
+        self,
+        model: PrincipalModel,
+        username: str,
+        *claim_columns
+    ) -> Row:
+        """Load only what login needs; lock state is evaluated in SQL"""
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            select(
+                model.id,
+                model.password_hash,
+                model.failed_login_attempts,
+                model.locked_until,
+                (model.locked_until > now).label("is_locked"),
+                *claim_columns
+            ).where(
+                model.username == username,
+                model.is_active == True
+            )
+        )
+        return result.one_or_none()
+
+    async def _register_failure(self, model: PrincipalModel, principal_id: int) -> None:
+        """Increment the failure counter and apply the lock in one statement"""
+        attempts = func.coalesce(model.failed_login_attempts, 0) + 1
+        lock_until = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCOUNT_LOCKOUT_MINUTES)
+        result = await self.db.execute(
+            update(model)
+            .where(model.id == principal_id)
+            .values(
+                failed_login_attempts=attempts,
+                locked_until=case(
+                    (attempts >= settings.MAX_FAILED_LOGIN_ATTEMPTS, lock_until),
+                    else_=model.locked_until
+                )
+            )
+            .returning(model.failed_login_attempts, model.locked_until)
+        )
+        counters = result.one()
+        await self.db.commit()
+
+        if counters.failed_login_attempts == settings.MAX_FAILED_LOGIN_ATTEMPTS:
+            security_logger.warning(
+                "Account locked after repeated failed logins",
+                extra={
+                    "user_id": principal_id,
+                    "user_type": model.__tablename__,
+                    "locked_until": str(counters.locked_until)
+                }
+            )
+
+    async def _register_success(self, model: PrincipalModel, credentials: Row) -> None:
+        """Record the login; counter resets are written immediately, timestamps may be batched"""
+        now = datetime.now(timezone.utc)
+        if credentials.failed_login_attempts or credentials.locked_until is not None:
+            await self.db.execute(
+                update(model)
+                .where(model.id == credentials.id)
+                .values(last_login_at=now, failed_login_attempts=0, locked_until=None)
+            )
+            await self.db.commit()
+        elif settings.LOGIN_BOOKKEEPING_DEFERRED:
+            login_bookkeeper.record(model, credentials.id, now)
+        else:
+            await self.db.execute(
+                update(model).where(model.id == credentials.id).values(last_login_at=now)
+            )
+            await self.db.commit()
+
+    async def authenticate(
+        self,
+        model: PrincipalModel,
+        username: str,
+        password: str,
+        *claim_columns,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> Row:
+        """
+        Authenticate a principal:
+        - Rejects locked accounts before the bcrypt verify
+        - Runs the verify in the threadpool so it does not block the event loop
+        - Updates failure counters atomically
+        - Schedules a rehash when the stored hash uses an outdated cost
+        """
+        credentials = await self._load_credentials(model, username, *claim_columns)
+        if not credentials:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password"
+            )
+
+        if credentials.is_locked:
+            raise HTTPException(
+                status_code=status.HTTP_423_LOCKED,
+                detail="Account is temporarily locked"
+            )
+
+        verified = await run_in_threadpool(
+            security_service.verify_password, password, credentials.password_hash
+        )
+        if not verified:
+            await self._register_failure(model, credentials.id)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password"
+            )
+
+        await self._register_success(model, credentials)
+
+        if background_tasks is not None and security_service.needs_rehash(credentials.password_hash):
+            background_tasks.add_task(
+                rehash_password, model, credentials.id, credentials.password_hash, password
+            )
+        return credentials
+
+    @staticmethod
+    def _token_response(access_token: str, refresh_token: str) -> dict:
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        }
+
+    async def admin_login(
+        self,
+        username: str,
+        password: str,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> dict:
+        """Authenticate a system admin and issue tokens"""
+        admin = await self.authenticate(
+            SystemAdmin, username, password, SystemAdmin.is_superuser,
+            background_tasks=background_tasks
+        )
+        access_token = security_service.create_access_token(
+            subject=admin.id,
+            extra_claims={
+                "user_type": "admin",
+                "is_superuser": admin.is_superuser
+            }
+        )
+        refresh_token = security_service.create_refresh_token(
+            subject=admin.id,
+            extra_claims={"user_type": "admin"}
+        )
+        return self._token_response(access_token, refresh_token)
+
+    async def company_user_login(
+        self,
+        username: str,
+        password: str,
+        background_tasks: Optional[BackgroundTasks] = None
+    ) -> dict:
+        """Authenticate a company user and issue tokens"""
+        user = await self.authenticate(
+            CompanyUser, username, password,
+            CompanyUser.company_id,
+            CompanyUser.role,
+            CompanyUser.is_master_user,
+            background_tasks=background_tasks
+        )
+        access_token = security_service.create_access_token(
+            subject=user.id,
+            extra_claims={
+                "user_type": "company_user",
+                "company_id": user.company_id,
+                "role": user.role,
+                "is_master": user.is_master_user
+            }
+        )
+        refresh_token = security_service.create_refresh_token(
+            subject=user.id,
+            extra_claims={
+                "user_type": "company_user",
+                "company_id": user.company_id
+            }
+        )
+        return self._token_response(access_token, refresh_token)
+
+    async def request_password_reset(self, email: str) -> None:
+        """Queue a reset link for an active company user; unknown emails are ignored"""
+        result = await self.db.execute(
+            select(CompanyUser.id, CompanyUser.email, CompanyUser.first_name).where(
+                CompanyUser.email == email,
+                CompanyUser.is_active == True
+            )
+        )
+        user = result.one_or_none()
+        if user is None:
+            return
+        token = security_service.create_password_reset_token(user.id)
+        queue_email(
+            self.db,
+            user.email,
+            "Password reset",
+            f"Hello {user.first_name},\n\n"
+            f"Use this token to reset your password within "
+            f"{settings.PASSWORD_RESET_TOKEN_EXPIRE_MINUTES} minutes:\n\n{token}\n\n"
+            f"If you did not ask for a reset, ignore this email.\n"
+        )
+        await self.db.commit()
+
+    async def reset_password(self, token: str, new_password: str) -> None:
+        """
+        Set a new password with a reset token. Revoking the token's jti is
+        the single-use check, so a token (or a replay of it) works once.
+        """
+        payload = security_service.decode_password_reset_token(token)
+        if not payload or not await revocation_list.revoke(payload):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired reset token"
+            )
+        password_hash = await run_in_threadpool(security_service.get_password_hash, new_password)
+        result = await self.db.execute(
+            update(CompanyUser)
+            .where(CompanyUser.id == int(payload["sub"]), CompanyUser.is_active == True)
+            .values(
+                password_hash=password_hash,
+                password_changed_at=datetime.now(timezone.utc),
+                failed_login_attempts=0,
+                locked_until=None
+            )
+        )
+        if result.rowcount == 0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired reset token"
+            )
+        await self.db.commit()
+        security_logger.info(f"Password reset for company user {payload['sub']}")
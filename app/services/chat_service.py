@@ -0,0 +1,159 @@
+from datetime import datetime
+from typing import Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.partitions import retention_class
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+from app.models.website import Website
+from app.models.client_company import ClientCompany
+from app.models.resource_plan import ResourcePlan
+from app.exceptions import ResourceNotFoundException, BusinessLogicException
+from app.services.context_service import context_engine
+from app.services.inference_service import count_tokens, inference_gateway
+from app.services.webhook_service import (
+    CHAT_SESSION_STARTED,
+    CHAT_MESSAGE_CREATED,
+    CHAT_SESSION_ENDED,
+    publish_event
+)
+
+
+class ChatService:
+    """Service for chat sessions and model replies"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_website(self, website_id: int) -> Website:
+        website = await self.db.get(Website, website_id)
+        if not website:
+            raise ResourceNotFoundException("Website", website_id)
+        return website
+
+    async def get_session(self, session_id: int) -> Tuple[ChatSession, Website]:
+        """Session and its website in one query"""
+        row = (await self.db.execute(
+            select(ChatSession, Website)
+            .join(Website, Website.id == ChatSession.website_id)
+            .where(ChatSession.session_id == session_id)
+        )).one_or_none()
+        if row is None:
+            raise ResourceNotFoundException("Chat session", session_id)
+        return row[0], row[1]
+
+    async def start_session(self, website: Website, user_id: int, session_name: str = None) -> ChatSession:
+        """Open a session on the website's current model"""
+        if not website.is_active:
+            raise BusinessLogicException("Website is not active")
+        model = await inference_gateway.resolve(self.db, website.id)
+        retention_days = await self.db.scalar(
+            select(ResourcePlan.chat_retention_days)
+            .join(ClientCompany, ClientCompany.resource_plan_id == ResourcePlan.id)
+            .where(ClientCompany.id == website.company_id)
+        )
+
+        session = ChatSession(
+            website_id=website.id,
+            user_id=user_id,
+            model_id=model.model_id,
+            session_name=session_name,
+            session_metadata={"model_version": model.model_version},
+            # Fixed for the session's life: its messages expire with this class
+            retention_days=retention_class(retention_days)
+        )
+        self.db.add(session)
+        await self.db.flush()
+
+        publish_event(self.db, website, CHAT_SESSION_STARTED, {
+            "session_id": session.session_id,
+            "model_id": model.model_id,
+        })
+        await self.db.commit()
+        return session
+
+    def _message_event(self, message: ChatMessage) -> dict:
+        return {
+            "session_id": message.session_id,
+            "message_id": message.message_id,
+            "message_type": message.message_type,
+            "content": message.message_content,
+        }
+
+    async def send_message(
+        self,
+        session: ChatSession,
+        website: Website,
+        content: str
+    ) -> Tuple[ChatMessage, ChatMessage]:
+        """
+        Store the user's message, get the model's reply and store that.
+
+        The user message is committed before the model is called, so no
+        transaction (or pooled connection) is held for the model's latency.
+        """
+        if not session.is_active:
+            raise BusinessLogicException("Chat session has ended")
+
+        user_message = ChatMessage(
+            session_id=session.session_id,
+            message_type="user",
+            message_content=content,
+            message_metadata={"tokens": count_tokens(content)},
+            is_user_message=True,
+            retention_days=session.retention_days
+        )
+        self.db.add(user_message)
+        session.last_activity_at = datetime.utcnow()
+        await self.db.flush()
+
+        model = await inference_gateway.get_model(self.db, session.model_id)
+        window = await context_engine.load_window(self.db, session)
+
+        publish_event(self.db, website, CHAT_MESSAGE_CREATED, self._message_event(user_message))
+        await self.db.commit()
+
+        # Summarizing folded turns may itself call the model, so this runs
+        # after the commit too; a new summary is saved with the reply
+        prompt = await context_engine.assemble(session, window, model)
+        completion = await inference_gateway.complete(model, prompt)
+
+        reply = ChatMessage(
+            session_id=session.session_id,
+            message_type="assistant",
+            message_content=completion.content,
+            message_metadata={
+                "model_id": model.model_id,
+                "model_version": model.model_version,
+                "tokens": completion.completion_tokens,
+                "prompt_tokens": completion.prompt_tokens,
+                "completion_tokens": completion.completion_tokens,
+                "coalesced": completion.coalesced,
+                "cached": completion.cached,
+                "similarity": completion.similarity,
+            },
+            response_time_ms=completion.latency_ms,
+            # A cached reply cost no model tokens
+            tokens_used=0 if completion.cached else completion.total_tokens,
+            is_user_message=False,
+            retention_days=session.retention_days
+        )
+        self.db.add(reply)
+        session.last_activity_at = datetime.utcnow()
+        await self.db.flush()
+        context_engine.ingest(reply)
+
+        publish_event(self.db, website, CHAT_MESSAGE_CREATED, self._message_event(reply))
+        await self.db.commit()
+        return user_message, reply
+
+    async def end_session(self, session: ChatSession, website: Website) -> ChatSession:
+        if session.is_active:
+            session.is_active = False
+            session.ended_at = datetime.utcnow()
+            publish_event(self.db, website, CHAT_SESSION_ENDED, {"session_id": session.session_id})
+            await self.db.commit()
+            context_engine.forget(session.session_id)
+        return session
@@ -0,0 +1,253 @@
+import logging
+import re
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+from app.repositories.chat_repository import ChatMessageRepository
+from app.services.inference_service import Messages, ModelProfile, count_tokens, inference_gateway
+
+logger = logging.getLogger(__name__)
+
+# Folding stops once the window is down to this share of its budget, so the
+# summary is rewritten every few turns rather than on every turn
+_FOLD_TO = 0.5
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+@dataclass(frozen=True)
+class Turn:
+    message_id: int
+    role: str
+    content: str
+    tokens: int
+
+
+def message_tokens(message: ChatMessage) -> int:
+    """Token count recorded when the message was stored, else counted now"""
+    metadata = message.message_metadata or {}
+    return metadata.get("tokens") or count_tokens(message.message_content)
+
+
+class ExtractiveSummarizer:
+    """One line per folded turn (its first sentence); the oldest lines go first when over budget"""
+
+    async def summarize(self, model: ModelProfile, summary: str, turns: List[Turn], max_tokens: int) -> str:
+        lines = summary.splitlines() if summary else []
+        for turn in turns:
+            first = _SENTENCE_END.split(turn.content.strip(), 1)[0][:240]
+            lines.append(f"{'User' if turn.role == 'user' else 'Assistant'}: {first}")
+        kept: List[str] = []
+        total = 0
+        for line in reversed(lines):
+            total += count_tokens(line)
+            if total > max_tokens:
+                break
+            kept.append(line)
+        return "\n".join(reversed(kept))
+
+
+class ModelSummarizer:
+    """The session's own model folds the new turns into the running summary"""
+
+    async def summarize(self, model: ModelProfile, summary: str, turns: List[Turn], max_tokens: int) -> str:
+        transcript = "\n".join(f"{turn.role}: {turn.content}" for turn in turns)
+        completion = await inference_gateway.complete(model, [
+            {
+                "role": "system",
+                "content": (
+                    f"Update the summary of a support conversation in at most {max_tokens} tokens. "
+                    "Keep facts, names, numbers, decisions and open questions."
+                ),
+            },
+            {"role": "user", "content": f"Summary so far:\n{summary or '(none)'}\n\nNew turns:\n{transcript}"},
+        ])
+        return completion.content
+
+
+SUMMARIZERS = {
+    "extractive": ExtractiveSummarizer,
+    "model": ModelSummarizer,
+}
+
+
+@dataclass
+class SessionWindow:
+    """The recent turns of one session, and a summary of everything before them"""
+    session_id: int
+    summary: str = ""
+    summarized_through: int = 0
+    turns: Deque[Turn] = field(default_factory=deque)
+    tokens: int = 0
+    last_message_id: int = 0
+    last_used: float = 0.0
+
+    def append(self, turn: Turn) -> None:
+        if turn.message_id <= self.last_message_id:
+            return  # Already in the window (ingested here, then seen in a delta)
+        self.turns.append(turn)
+        self.tokens += turn.tokens
+        self.last_message_id = turn.message_id
+
+
+class ContextEngine:
+    """
+    Builds the prompt for a chat turn without re-reading the conversation.
+
+    Each session's window is cached per worker (LRU, CONTEXT_CACHE_SESSIONS
+    sessions, dropped after CONTEXT_CACHE_IDLE_SECONDS idle). Token counts
+    are taken when messages are stored, replies go into the window as they
+    are generated, and assembling a prompt loads only messages newer than
+    the window (written by another worker, or the turn's own user message).
+    Once the window exceeds its token or message budget, its oldest turns
+    are folded into the summary, which is saved in the session's metadata
+    (by the caller's next commit) so a cold worker starts from it instead
+    of from the first message.
+    """
+
+    def __init__(self):
+        self._windows: "OrderedDict[int, SessionWindow]" = OrderedDict()
+        self._summarizer = None
+        self.hits = 0
+        self.cold_loads = 0
+        self.delta_messages = 0
+        self.folds = 0
+
+    @property
+    def summarizer(self):
+        if self._summarizer is None:
+            self._summarizer = SUMMARIZERS[settings.CONTEXT_SUMMARIZER]()
+        return self._summarizer
+
+    def _get(self, session_id: int) -> Optional[SessionWindow]:
+        window = self._windows.get(session_id)
+        if window is None:
+            return None
+        if time.monotonic() - window.last_used > settings.CONTEXT_CACHE_IDLE_SECONDS:
+            del self._windows[session_id]
+            return None
+        self._windows.move_to_end(session_id)
+        return window
+
+    def _put(self, window: SessionWindow) -> None:
+        self._windows[window.session_id] = window
+        self._windows.move_to_end(window.session_id)
+        while len(self._windows) > settings.CONTEXT_CACHE_SESSIONS:
+            self._windows.popitem(last=False)
+
+    @staticmethod
+    def _turn(message: ChatMessage) -> Turn:
+        return Turn(
+            message.message_id,
+            "user" if message.is_user_message else "assistant",
+            message.message_content,
+            message_tokens(message)
+        )
+
+    async def _cold_load(self, db: AsyncSession, session: ChatSession) -> SessionWindow:
+        saved = (session.session_metadata or {}).get("context") or {}
+        window = SessionWindow(
+            session_id=session.session_id,
+            summary=saved.get("summary", ""),
+            summarized_through=saved.get("through", 0)
+        )
+        window.last_message_id = window.summarized_through
+        messages = await ChatMessageRepository(db).get_after(
+            session,
+            window.summarized_through,
+            limit=settings.INFERENCE_HISTORY_MESSAGES,
+            newest_first=True
+        )
+        for message in reversed(messages):
+            window.append(self._turn(message))
+        return window
+
+    async def _load_delta(self, db: AsyncSession, session: ChatSession, window: SessionWindow) -> None:
+        messages = await ChatMessageRepository(db).get_after(session, window.last_message_id)
+        self.delta_messages += len(messages)
+        for message in messages:
+            window.append(self._turn(message))
+
+    async def _fold(self, session: ChatSession, window: SessionWindow, model: ModelProfile) -> None:
+        budget = model.config.get("context_tokens") or settings.CONTEXT_WINDOW_TOKENS
+        max_turns = settings.INFERENCE_HISTORY_MESSAGES
+        if window.tokens <= budget and len(window.turns) <= max_turns:
+            return
+        folded: List[Turn] = []
+        # The newest turn (the question being answered) always stays verbatim
+        while len(window.turns) > 1 and (
+            window.tokens > budget * _FOLD_TO or len(window.turns) > max_turns * _FOLD_TO
+        ):
+            turn = window.turns.popleft()
+            window.tokens -= turn.tokens
+            folded.append(turn)
+        if not folded:
+            return
+        window.summary = await self.summarizer.summarize(
+            model, window.summary, folded, settings.CONTEXT_SUMMARY_TOKENS
+        )
+        window.summarized_through = folded[-1].message_id
+        self.folds += 1
+        session.session_metadata = {
+            **(session.session_metadata or {}),
+            "context": {"summary": window.summary, "through": window.summarized_through},
+        }
+
+    async def load_window(self, db: AsyncSession, session: ChatSession) -> SessionWindow:
+        """The session's window, brought up to date with messages it has not seen"""
+        window = self._get(session.session_id)
+        if window is None:
+            self.cold_loads += 1
+            window = await self._cold_load(db, session)
+            self._put(window)
+        else:
+            self.hits += 1
+        await self._load_delta(db, session, window)
+        window.last_used = time.monotonic()
+        return window
+
+    async def assemble(self, session: ChatSession, window: SessionWindow, model: ModelProfile) -> Messages:
+        """
+        System prompt, summary of earlier turns, then the recent turns
+        verbatim. Needs no database access, so callers can run it after
+        committing (the "model" summarizer calls the model).
+        """
+        await self._fold(session, window, model)
+        prompt: Messages = []
+        if model.config.get("system_prompt"):
+            prompt.append({"role": "system", "content": model.config["system_prompt"]})
+        if window.summary:
+            prompt.append({"role": "system", "content": f"Summary of the earlier conversation:\n{window.summary}"})
+        prompt.extend({"role": turn.role, "content": turn.content} for turn in window.turns)
+        return prompt
+
+    def ingest(self, message: ChatMessage) -> None:
+        """Add a message just stored by this worker, so the next turn need not load it"""
+        window = self._get(message.session_id)
+        if window is not None:
+            window.append(self._turn(message))
+
+    def forget(self, session_id: int) -> None:
+        self._windows.pop(session_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.cold_loads
+        return {
+            "sessions_cached": len(self._windows),
+            "hits": self.hits,
+            "cold_loads": self.cold_loads,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "delta_messages_loaded": self.delta_messages,
+            "folds": self.folds,
+            "summarizer": settings.CONTEXT_SUMMARIZER,
+        }
+
+
+context_engine = ContextEngine()
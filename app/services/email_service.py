@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import smtplib
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.outbox import enqueue, outbox_worker
+
+logger = logging.getLogger(__name__)
+
+EMAIL_JOB = "email.send"
+
+
+class EmailService:
+    """
+    SMTP delivery. Only called from outbox jobs, so request latency never
+    includes an SMTP conversation; queue_email() is the request-side API.
+    """
+
+    @property
+    def configured(self) -> bool:
+        return bool(settings.SMTP_HOST and settings.EMAILS_FROM_EMAIL)
+
+    @staticmethod
+    def _message(to: str, subject: str, body: str) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = formataddr((settings.EMAILS_FROM_NAME or "", settings.EMAILS_FROM_EMAIL))
+        message["To"] = to
+        message["Subject"] = subject
+        message.set_content(body)
+        return message
+
+    def _send_batch(self, emails: List[dict]) -> Dict[int, str]:
+        """Send over one SMTP connection; returns {index: error} for rejected emails"""
+        failed: Dict[int, str] = {}
+        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS) as smtp:
+            if settings.SMTP_TLS:
+                smtp.starttls()
+            if settings.SMTP_USER:
+                smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD or "")
+            for i, email in enumerate(emails):
+                try:
+                    smtp.send_message(self._message(email["to"], email["subject"], email["body"]))
+                except smtplib.SMTPRecipientsRefused as e:
+                    failed[i] = f"Recipient refused: {e.recipients}"
+                except smtplib.SMTPResponseException as e:
+                    failed[i] = f"SMTP {e.smtp_code}: {e.smtp_error!r}"
+        return failed
+
+    async def send_batch(self, emails: List[dict]) -> Optional[Dict[int, str]]:
+        if not self.configured:
+            for email in emails:
+                logger.info(f"SMTP not configured; email to {email['to']} not sent: {email['subject']}")
+            return None
+        return await asyncio.to_thread(self._send_batch, emails)
+
+
+email_service = EmailService()
+
+
+def queue_email(db: AsyncSession, to: str, subject: str, body: str) -> None:
+    """Send an email once the caller's transaction commits"""
+    enqueue(db, EMAIL_JOB, {"to": to, "subject": subject, "body": body})
+
+
+@outbox_worker.handler(EMAIL_JOB, batch_size=20)
+async def _deliver_emails(emails: List[dict]) -> Optional[Dict[int, str]]:
+    return await email_service.send_batch(emails)
@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Iterable, List, Optional
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.database import read_session
+from app.models.chat_message import ChatMessage
+from app.models.chat_session import ChatSession
+from app.models.client_company import ClientCompany
+from app.models.company_user import CompanyUser
+from app.models.website import Website
+
+logger = logging.getLogger(__name__)
+
+# Never leave the database through an export
+EXCLUDED_COLUMNS = {
+    "password_hash",
+    "two_factor_secret",
+    "failed_login_attempts",
+    "locked_until",
+    "webhook_secret",
+}
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def export_columns(model: Any) -> List[Any]:
+    """Table columns of a model that may be exported"""
+    return [
+        column for column in model.__table__.columns
+        if column.name not in EXCLUDED_COLUMNS
+    ]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(columns: List[str], rows: Iterable[tuple]) -> bytes:
+    return b"".join(
+        orjson.dumps(dict(zip(columns, row)), default=_json_default) + b"\n"
+        for row in rows
+    )
+
+
+class _CSVEncoder:
+    """Incremental CSV encoder; the header is written with the first batch"""
+
+    def __init__(self, columns: List[str]):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(columns)
+
+    def encode(self, rows: Iterable[tuple]) -> bytes:
+        for row in rows:
+            self._writer.writerow([_csv_value(value) for value in row])
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class ExportService:
+    """
+    Streams query results as NDJSON or CSV.
+
+    Rows come from a server-side cursor (stream() + yield_per) on a session
+    owned by the generator (on a replica when one is healthy), so memory
+    stays constant regardless of tenant size and the request session is not
+    held for the whole download.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None):
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+
+    async def stream(self, query: Select, export_format: str) -> AsyncIterator[bytes]:
+        """Encode the rows of a Core select batch by batch"""
+        column_names = [column.key for column in query.selected_columns]
+        csv_encoder = _CSVEncoder(column_names) if export_format == "csv" else None
+        rows_sent = 0
+
+        async with read_session() as db:
+            result = await db.stream(
+                query.execution_options(yield_per=self.batch_size)
+            )
+            async for batch in result.partitions():
+                rows_sent += len(batch)
+                if csv_encoder is not None:
+                    yield csv_encoder.encode(batch)
+                else:
+                    yield encode_ndjson(column_names, batch)
+
+        if csv_encoder is not None and rows_sent == 0:
+            # Header only
+            yield csv_encoder.encode([])
+        logger.info(f"Export finished: {rows_sent} rows")
+
+    # ========================
+    # Export queries
+    # ========================
+
+    @staticmethod
+    def _changed_since(model: Any, query: Select, since: Optional[datetime]) -> Select:
+        """Incremental sync: rows changed at or after `since`, oldest first"""
+        changed_at = func.coalesce(model.updated_at, model.created_at)
+        if since is not None:
+            query = query.where(changed_at >= since)
+        return query.order_by(changed_at, model.id)
+
+    def companies_query(self, since: Optional[datetime] = None) -> Select:
+        query = select(*export_columns(ClientCompany))
+        return self._changed_since(ClientCompany, query, since)
+
+    def users_query(self, company_id: int, since: Optional[datetime] = None) -> Select:
+        query = select(*export_columns(CompanyUser)).where(
+            CompanyUser.company_id == company_id
+        )
+        return self._changed_since(CompanyUser, query, since)
+
+    def websites_query(self, company_id: int, since: Optional[datetime] = None) -> Select:
+        query = select(*export_columns(Website)).where(
+            Website.company_id == company_id
+        )
+        return self._changed_since(Website, query, since)
+
+    def chat_messages_query(self, website_id: int, since: Optional[datetime] = None) -> Select:
+        """Messages are immutable, so `since` applies to created_at"""
+        query = (
+            select(*export_columns(ChatMessage))
+            .join(ChatSession, ChatSession.session_id == ChatMessage.session_id)
+            .where(ChatSession.website_id == website_id)
+        )
+        if since is not None:
+            query = query.where(ChatMessage.created_at >= since)
+        return query.order_by(ChatMessage.created_at, ChatMessage.message_id)
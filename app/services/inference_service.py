@@ -0,0 +1,445 @@
+import asyncio
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import orjson
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.timing import timing_phase
+from app.exceptions import BusinessLogicException, ServiceUnavailableException
+from app.models.ai_model import AiModel
+from app.models.website import Website
+from app.services.response_cache import response_cache
+from app.services.semantic_cache import semantic_cache
+
+logger = logging.getLogger(__name__)
+
+Messages = List[Dict[str, str]]  # [{"role": "system" | "user" | "assistant", "content": ...}]
+
+
+@dataclass(frozen=True)
+class ModelProfile:
+    """What the gateway needs to know about an AiModel (cached, detached from any session)"""
+    model_id: int
+    website_id: int
+    model_name: str
+    model_type: str
+    model_version: str
+    config: dict
+    last_trained_at: Optional[datetime] = None
+
+    @property
+    def backend(self) -> str:
+        return self.config.get("backend") or settings.INFERENCE_DEFAULT_BACKEND
+
+    @property
+    def version_tag(self) -> str:
+        """Changes whenever cached replies of this model stop being valid"""
+        trained = self.last_trained_at.isoformat() if self.last_trained_at else ""
+        return f"{self.model_version}|{trained}"
+
+
+@dataclass(frozen=True)
+class Completion:
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: int
+    coalesced: bool = False
+    cached: bool = False
+    similarity: Optional[float] = None  # Set for answers from the semantic cache
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+
+def prompt_digest(messages: Messages) -> str:
+    return hashlib.sha256(orjson.dumps(messages, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate (about 4 characters per token) for backends that do not report usage"""
+    return max(1, (len(text) + 3) // 4)
+
+
+class InferenceBackend:
+    """One model provider. Instances are shared and keep their own connection pool."""
+
+    async def complete(self, model: ModelProfile, messages: Messages) -> Tuple[str, int, int]:
+        """Returns (content, prompt tokens, completion tokens)"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeBackend(InferenceBackend):
+    """
+    Deterministic local backend for tests and benchmarks: the same model,
+    version and prompt always produce the same reply. model_config
+    "fake_latency_ms" (or INFERENCE_FAKE_LATENCY_MS) simulates model time.
+    """
+
+    async def complete(self, model: ModelProfile, messages: Messages) -> Tuple[str, int, int]:
+        latency_ms = model.config.get("fake_latency_ms", settings.INFERENCE_FAKE_LATENCY_MS)
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        digest = hashlib.sha256(
+            f"{model.model_id}:{model.model_version}:{prompt_digest(messages)}".encode()
+        ).hexdigest()[:12]
+        content = f"[{model.model_name} {model.model_version}] You asked: {question} (ref {digest})"
+        prompt_tokens = sum(count_tokens(m["content"]) for m in messages)
+        return content, prompt_tokens, count_tokens(content)
+
+
+class OpenAICompatibleBackend(InferenceBackend):
+    """Any /chat/completions API (OpenAI, vLLM, Ollama, LiteLLM, ...)"""
+
+    def __init__(self, base_url: str, api_key: Optional[str]):
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=settings.INFERENCE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.INFERENCE_MAX_CONNECTIONS,
+                keepalive_expiry=60.0
+            ),
+            timeout=httpx.Timeout(settings.INFERENCE_TIMEOUT_SECONDS, connect=5.0)
+        )
+
+    async def complete(self, model: ModelProfile, messages: Messages) -> Tuple[str, int, int]:
+        body = {
+            "model": model.config.get("model") or model.model_type,
+            "messages": messages,
+        }
+        for key in ("temperature", "max_tokens", "top_p"):
+            if key in model.config:
+                body[key] = model.config[key]
+        try:
+            response = await self.client.post("/chat/completions", json=body)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Inference backend call for model {model.model_id} failed: {str(e)}")
+            raise ServiceUnavailableException(
+                "AI model backend unavailable",
+                details={"model_id": model.model_id}
+            )
+        data = response.json()
+        content = data["choices"][0]["message"]["content"] or ""
+        usage = data.get("usage") or {}
+        return (
+            content,
+            usage.get("prompt_tokens") or sum(count_tokens(m["content"]) for m in messages),
+            usage.get("completion_tokens") or count_tokens(content),
+        )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+@dataclass
+class _ModelStats:
+    requests: int = 0
+    cache_hits: int = 0
+    semantic_hits: int = 0
+    coalesced: int = 0
+    backend_calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    backend_ms: float = 0.0
+    in_flight: int = 0
+
+
+class InferenceGateway:
+    """
+    Single entry point for model calls.
+
+    - website -> model and model_id -> profile are cached for
+      INFERENCE_MODEL_CACHE_SECONDS, so a chat turn does not re-read them
+    - backends are created once per (backend, base URL) and keep their
+      connection pools for the life of the process
+    - each model has a concurrency limit (model_config "max_concurrency");
+      callers wait up to INFERENCE_QUEUE_TIMEOUT_SECONDS for a slot, then
+      get a 503
+    - a question asked before in the same context is answered from the
+      response cache (model_config "response_cache": false opts out), or,
+      when SEMANTIC_CACHE_ENABLED, from a close enough earlier question
+    - identical prompts to the same model version that arrive while one is
+      in flight share that call instead of starting their own
+    """
+
+    def __init__(self):
+        self._website_models: Dict[int, Tuple[float, int]] = {}
+        self._models: Dict[int, Tuple[float, ModelProfile]] = {}
+        self._backends: Dict[Tuple[str, str], InferenceBackend] = {}
+        self._limits: Dict[int, asyncio.Semaphore] = {}
+        self._inflight: Dict[Tuple[int, str, str], asyncio.Task] = {}
+        self._stats: Dict[int, _ModelStats] = {}
+
+    # Model resolution
+
+    @staticmethod
+    def _profile(model: AiModel) -> ModelProfile:
+        return ModelProfile(
+            model_id=model.model_id,
+            website_id=model.website_id,
+            model_name=model.model_name,
+            model_type=model.model_type,
+            model_version=model.model_version,
+            config=dict(model.model_config or {}),
+            last_trained_at=model.last_trained_at
+        )
+
+    async def get_model(self, db: AsyncSession, model_id: int) -> ModelProfile:
+        cached = self._models.get(model_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        model = await db.get(AiModel, model_id)
+        if model is None:
+            raise BusinessLogicException("AI model no longer exists", details={"model_id": model_id})
+        profile = self._profile(model)
+        if cached is not None and (
+            (cached[1].model_version, cached[1].last_trained_at)
+            != (profile.model_version, profile.last_trained_at)
+        ):
+            # Changed outside this process; replies of the old model are unreachable now
+            _drop_cached_replies(model_id)
+        self._models[model_id] = (time.monotonic() + settings.INFERENCE_MODEL_CACHE_SECONDS, profile)
+        return profile
+
+    async def resolve(self, db: AsyncSession, website_id: int) -> ModelProfile:
+        """The website's primary model, else its first active one"""
+        cached = self._website_models.get(website_id)
+        if cached is not None and cached[0] > time.monotonic():
+            return await self.get_model(db, cached[1])
+
+        model_id = await db.scalar(select(Website.primary_ai_model_id).where(Website.id == website_id))
+        if model_id is None:
+            model_id = await db.scalar(
+                select(AiModel.model_id)
+                .where(AiModel.website_id == website_id, AiModel.status == "active")
+                .order_by(AiModel.model_id)
+                .limit(1)
+            )
+        if model_id is None:
+            raise BusinessLogicException(
+                "Website has no active AI model",
+                details={"website_id": website_id}
+            )
+        self._website_models[website_id] = (
+            time.monotonic() + settings.INFERENCE_MODEL_CACHE_SECONDS, model_id
+        )
+        return await self.get_model(db, model_id)
+
+    def invalidate(self, website_id: Optional[int] = None, model_id: Optional[int] = None) -> None:
+        """Drop cached resolution after a model or a website's primary model changes"""
+        if website_id is not None:
+            self._website_models.pop(website_id, None)
+        if model_id is not None:
+            self._models.pop(model_id, None)
+        if website_id is None and model_id is None:
+            self._website_models.clear()
+            self._models.clear()
+
+    # Calls
+
+    def _backend(self, model: ModelProfile) -> InferenceBackend:
+        name = model.backend
+        base_url = model.config.get("base_url") or settings.INFERENCE_OPENAI_BASE_URL
+        key = (name, base_url if name == "openai" else "")
+        backend = self._backends.get(key)
+        if backend is None:
+            if name == "fake":
+                backend = FakeBackend()
+            elif name == "openai":
+                backend = OpenAICompatibleBackend(base_url, settings.INFERENCE_OPENAI_API_KEY)
+            else:
+                raise BusinessLogicException(
+                    f"Unknown inference backend '{name}'",
+                    details={"model_id": model.model_id}
+                )
+            self._backends[key] = backend
+        return backend
+
+    def _limit(self, model: ModelProfile) -> asyncio.Semaphore:
+        limit = self._limits.get(model.model_id)
+        if limit is None:
+            limit = self._limits[model.model_id] = asyncio.Semaphore(
+                model.config.get("max_concurrency") or settings.INFERENCE_MAX_CONCURRENCY_PER_MODEL
+            )
+        return limit
+
+    def _model_stats(self, model_id: int) -> _ModelStats:
+        stats = self._stats.get(model_id)
+        if stats is None:
+            stats = self._stats[model_id] = _ModelStats()
+        return stats
+
+    @staticmethod
+    def _cache_key(model: ModelProfile, messages: Messages) -> Optional[str]:
+        """Response cache key: the last user message, in the context of everything before it"""
+        if not settings.RESPONSE_CACHE_ENABLED or model.config.get("response_cache") is False:
+            return None
+        if not messages or messages[-1]["role"] != "user":
+            return None
+        return response_cache.key(
+            model.website_id,
+            model.model_id,
+            model.model_version,
+            model.last_trained_at,
+            messages[-1]["content"],
+            prompt_digest(messages[:-1])
+        )
+
+    @staticmethod
+    def _semantic_probe(model: ModelProfile, messages: Messages) -> Optional[tuple]:
+        """(question vector, context hash) for the semantic tier, when it applies"""
+        if not semantic_cache.enabled or model.config.get("semantic_cache") is False:
+            return None
+        if not messages or messages[-1]["role"] != "user":
+            return None
+        question = messages[-1]["content"]
+        return semantic_cache.embed(question), semantic_cache.context_key(question, prompt_digest(messages[:-1]))
+
+    async def complete(self, model: ModelProfile, messages: Messages) -> Completion:
+        """Run a prompt, from the response caches or shared with identical in-flight prompts"""
+        stats = self._model_stats(model.model_id)
+        stats.requests += 1
+        cache_key = self._cache_key(model, messages)
+        if cache_key is not None:
+            cached = response_cache.get(model.website_id, cache_key)
+            if cached is not None:
+                stats.cache_hits += 1
+                return Completion(cached.content, cached.prompt_tokens, cached.completion_tokens, 0, cached=True)
+
+        semantic = self._semantic_probe(model, messages)
+        if semantic is not None:
+            hit = semantic_cache.lookup(
+                model.website_id, model.model_id, model.version_tag, *semantic,
+                threshold=model.config.get("semantic_threshold")
+            )
+            if hit is not None:
+                stats.semantic_hits += 1
+                if cache_key is not None:
+                    # The exact wording is answered by the first tier next time
+                    response_cache.put(
+                        model.website_id, model.model_id, cache_key,
+                        hit.content, hit.prompt_tokens, hit.completion_tokens
+                    )
+                return Completion(
+                    hit.content, hit.prompt_tokens, hit.completion_tokens, 0,
+                    cached=True, similarity=hit.similarity
+                )
+
+        key = (model.model_id, model.model_version, prompt_digest(messages))
+        task = self._inflight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            stats.coalesced += 1
+        else:
+            task = asyncio.create_task(self._call(model, messages, cache_key, semantic))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        with timing_phase("inference"):
+            # Shielded: one caller going away must not cancel the others' call
+            completion = await asyncio.shield(task)
+        return replace(completion, coalesced=True) if coalesced else completion
+
+    async def _call(
+        self,
+        model: ModelProfile,
+        messages: Messages,
+        cache_key: Optional[str],
+        semantic: Optional[tuple]
+    ) -> Completion:
+        stats = self._model_stats(model.model_id)
+        backend = self._backend(model)
+        limit = self._limit(model)
+        try:
+            await asyncio.wait_for(limit.acquire(), timeout=settings.INFERENCE_QUEUE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            stats.errors += 1
+            raise ServiceUnavailableException(
+                "AI model is at capacity, try again shortly",
+                details={"model_id": model.model_id}
+            )
+        stats.in_flight += 1
+        started = time.perf_counter()
+        try:
+            content, prompt_tokens, completion_tokens = await backend.complete(model, messages)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            limit.release()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats.backend_calls += 1
+        stats.backend_ms += elapsed_ms
+        stats.prompt_tokens += prompt_tokens
+        stats.completion_tokens += completion_tokens
+        if cache_key is not None:
+            response_cache.put(model.website_id, model.model_id, cache_key, content, prompt_tokens, completion_tokens)
+        if semantic is not None:
+            semantic_cache.put(
+                model.website_id, model.model_id, model.version_tag, *semantic,
+                content, prompt_tokens, completion_tokens
+            )
+        return Completion(content, prompt_tokens, completion_tokens, round(elapsed_ms))
+
+    def stats(self) -> dict:
+        return {
+            "models": {
+                model_id: {
+                    "requests": stats.requests,
+                    "cache_hits": stats.cache_hits,
+                    "semantic_cache_hits": stats.semantic_hits,
+                    "coalesced": stats.coalesced,
+                    "backend_calls": stats.backend_calls,
+                    "errors": stats.errors,
+                    "in_flight": stats.in_flight,
+                    "prompt_tokens": stats.prompt_tokens,
+                    "completion_tokens": stats.completion_tokens,
+                    "mean_backend_ms": (
+                        round(stats.backend_ms / stats.backend_calls, 1) if stats.backend_calls else None
+                    ),
+                }
+                for model_id, stats in self._stats.items()
+            },
+            "backends": [name for name, _ in self._backends],
+        }
+
+    async def close(self) -> None:
+        for backend in self._backends.values():
+            await backend.close()
+        self._backends.clear()
+        semantic_cache.close()
+
+
+inference_gateway = InferenceGateway()
+
+
+def _drop_cached_replies(model_id: int) -> None:
+    response_cache.invalidate_model(model_id)
+    if semantic_cache.enabled:
+        semantic_cache.invalidate_model(model_id)
+
+
+@event.listens_for(AiModel, "after_update")
+def _model_changed(mapper, connection, target: AiModel) -> None:
+    # A new version or training run must not be answered from the old one's replies
+    state = inspect(target)
+    if state.attrs.model_version.history.has_changes() or state.attrs.last_trained_at.history.has_changes():
+        inference_gateway.invalidate(model_id=target.model_id)
+        _drop_cached_replies(target.model_id)
@@ -0,0 +1,178 @@
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = " ?!.,;:"
+
+# Bookkeeping per entry (key, tuple, OrderedDict slot) on top of the text itself
+_ENTRY_OVERHEAD = 200
+
+
+def normalize_prompt(text: str) -> str:
+    """Case, Unicode form, whitespace and trailing punctuation do not change the question"""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip().rstrip(_TRAILING_PUNCTUATION)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    website_id: int
+    model_id: int
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+    expires_at: float
+    size: int
+
+
+@dataclass
+class _WebsiteStats:
+    hits: int = 0
+    misses: int = 0
+    saved_prompt_tokens: int = 0
+    saved_completion_tokens: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class ResponseCache:
+    """
+    Exact-match cache of model replies, per worker process.
+
+    Keyed by website, model, model version and last training time, the
+    normalized question and a hash of everything sent before it (system
+    prompt and earlier turns), so a reply is only reused for the same
+    question in the same context to the same model. Entries expire after
+    `ttl_seconds`; the least recently used are evicted once the cache
+    holds more than `max_bytes` of replies.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._stats: Dict[int, _WebsiteStats] = {}
+        self.evictions = 0
+
+    @staticmethod
+    def key(
+        website_id: int,
+        model_id: int,
+        model_version: str,
+        last_trained_at: Optional[datetime],
+        question: str,
+        context_hash: str
+    ) -> str:
+        trained = last_trained_at.isoformat() if last_trained_at else ""
+        raw = "\x1f".join((
+            str(website_id), str(model_id), model_version, trained,
+            normalize_prompt(question), context_hash
+        ))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _website_stats(self, website_id: int) -> _WebsiteStats:
+        stats = self._stats.get(website_id)
+        if stats is None:
+            stats = self._stats[website_id] = _WebsiteStats()
+        return stats
+
+    def get(self, website_id: int, key: str) -> Optional[CachedResponse]:
+        stats = self._website_stats(website_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is None:
+            stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        stats.hits += 1
+        stats.saved_prompt_tokens += entry.prompt_tokens
+        stats.saved_completion_tokens += entry.completion_tokens
+        return entry
+
+    def put(
+        self,
+        website_id: int,
+        model_id: int,
+        key: str,
+        content: str,
+        prompt_tokens: int,
+        completion_tokens: int
+    ) -> None:
+        size = len(content.encode()) + len(key) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CachedResponse(
+            website_id, model_id, content, prompt_tokens, completion_tokens,
+            time.monotonic() + self.ttl_seconds, size
+        )
+        self._size += size
+        stats = self._website_stats(website_id)
+        stats.entries += 1
+        stats.bytes += size
+        while self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+        stats = self._website_stats(entry.website_id)
+        stats.entries -= 1
+        stats.bytes -= entry.size
+
+    def invalidate_model(self, model_id: int) -> int:
+        """Drop a model's replies, e.g. after a new version or training run; returns how many"""
+        keys = [key for key, entry in self._entries.items() if entry.model_id == model_id]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def invalidate_website(self, website_id: int) -> int:
+        keys = [key for key, entry in self._entries.items() if entry.website_id == website_id]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def stats(self, website_id: Optional[int] = None) -> dict:
+        websites = {}
+        for stats_website_id, stats in self._stats.items():
+            if website_id is not None and stats_website_id != website_id:
+                continue
+            lookups = stats.hits + stats.misses
+            websites[stats_website_id] = {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "hit_rate": round(stats.hits / lookups, 4) if lookups else None,
+                "saved_tokens": stats.saved_prompt_tokens + stats.saved_completion_tokens,
+                "saved_prompt_tokens": stats.saved_prompt_tokens,
+                "saved_completion_tokens": stats.saved_completion_tokens,
+                "entries": stats.entries,
+                "bytes": stats.bytes,
+            }
+        return {
+            "enabled": settings.RESPONSE_CACHE_ENABLED,
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "websites": websites,
+        }
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.RESPONSE_CACHE_MAX_BYTES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,412 @@
+import hashlib
+import importlib
+import logging
+import os
+import re
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import settings
+from app.services.response_cache import normalize_prompt
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; without it the semantic tier stays off
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # No flock on Windows; every process then uses slot 0
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_ROWS = 1024
+# Answer lines are appended in batches; a crash loses at most this many
+_FLUSH_LINES = 64
+
+_WORDS = re.compile(r"[\w'\u2019]+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_NUMBER_WORDS = frozenset(
+    "zero one two three four five six seven eight nine ten eleven twelve fifteen twenty thirty "
+    "forty fifty sixty seventy eighty ninety hundred thousand million half once twice".split()
+)
+_FUNCTION_WORDS = frozenset(
+    "a an the my your our its i you we me it this that is are am be do does did can could would will "
+    "should to of for on in at there any some how what which please".split()
+)
+_FUNCTION_WORD_WEIGHT = 0.5
+_NEGATIONS = frozenset("no not never none nothing nobody nowhere neither nor without cannot".split())
+
+
+def guard_terms(text: str) -> Tuple[str, ...]:
+    """
+    Numbers and negations of a question, in order. Embeddings score "after
+    30 days" and "after 60 days" (or "can" and "can't") as near identical,
+    so questions only share an answer when these match exactly.
+    """
+    terms = []
+    for word in _WORDS.findall(normalize_prompt(text)):
+        number = _NUMBER.search(word)
+        if number:
+            terms.append(number.group().replace(",", ""))
+        elif word in _NUMBER_WORDS:
+            terms.append(word)
+        elif word in _NEGATIONS or word.endswith(("n't", "n\u2019t")):
+            terms.append("not")
+    return tuple(terms)
+
+
+class Embedder:
+    """
+    Turns a question into a unit-length float32 vector. Runs inline on the
+    event loop, so implementations should be fast (or small local models).
+    """
+    name: str
+    dim: int
+
+    def embed(self, text: str) -> "np.ndarray":
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Signed feature hashing of words and character trigrams: no model, no
+    state, a few microseconds per question. Catches rewordings that share
+    most of their words (word order, plurals, filler words). Function words
+    count half, so "how do I" versus "how can I" weighs less than the
+    subject of the question.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+        # Bumped whenever the features change, which moves indexes to new files
+        self.name = f"hashing-v2-{dim}"
+
+    def embed(self, text: str) -> "np.ndarray":
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in _WORDS.findall(normalize_prompt(text)):
+            scale = _FUNCTION_WORD_WEIGHT if word in _FUNCTION_WORDS else 1.0
+            features = [(f"w:{word}", scale)]
+            padded = f" {word} "
+            features.extend((f"c:{padded[i:i + 3]}", scale / 2) for i in range(len(padded) - 2))
+            for feature, weight in features:
+                h = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vector[h % self.dim] += weight if h >> 63 else -weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+def load_embedder(spec: str) -> Embedder:
+    """"hashing", or "package.module:factory" for any callable returning an Embedder"""
+    if spec == "hashing":
+        return HashingEmbedder(settings.SEMANTIC_CACHE_DIM)
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+@dataclass(frozen=True)
+class SemanticHit:
+    content: str
+    prompt_tokens: int
+    completion_tokens: int
+    similarity: float
+
+
+class VectorIndex:
+    """
+    Answers of one website's model version, on disk:
+
+    - <name>.f32: question vectors, a float32 matrix memory-mapped with
+      numpy, grown by doubling up to `capacity` rows
+    - <name>.jsonl: one line per stored answer (row, context, reply)
+
+    Reopening replays the JSONL file and maps the matrix, so the index is
+    back without re-embedding anything. Answer lines are written in batches
+    of _FLUSH_LINES (and on close) rather than one file append per answer
+    on the event loop. Once full, the oldest row is overwritten. Search is
+    one matrix-vector product over the used rows.
+    """
+
+    def __init__(self, prefix: Path, dim: int, capacity: int):
+        self.vectors_path = prefix.with_suffix(".f32")
+        self.entries_path = prefix.with_suffix(".jsonl")
+        self.dim = dim
+        self.capacity = capacity
+        self.answers: Dict[int, tuple] = {}
+        self._pending: List[bytes] = []
+        self.next_row = 0
+        self.used = 0
+        lines = self._replay()
+        rows = max(_INITIAL_ROWS, self.used)
+        if self.vectors_path.exists():
+            rows = max(rows, self.vectors_path.stat().st_size // (dim * 4))
+        self._map(rows)
+        if lines > 2 * len(self.answers) + _INITIAL_ROWS:
+            self._compact()
+
+    def _replay(self) -> int:
+        if not self.entries_path.exists():
+            return 0
+        lines = 0
+        with open(self.entries_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Torn last line after a crash
+                lines += 1
+                row = entry["row"]
+                self.answers[row] = (entry["ctx"], entry["content"], entry["pt"], entry["ct"])
+                self.next_row = (row + 1) % self.capacity
+                self.used = max(self.used, row + 1)
+        return lines
+
+    def _map(self, rows: int) -> None:
+        size = rows * self.dim * 4
+        with open(self.vectors_path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self.vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(rows, self.dim))
+        self.contexts = np.zeros(rows, dtype=np.int64)
+        for row, answer in self.answers.items():
+            self.contexts[row] = answer[0]
+
+    def _compact(self) -> None:
+        tmp = self.entries_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            for row, (ctx, content, pt, ct) in sorted(self.answers.items()):
+                f.write(orjson.dumps({"row": row, "ctx": ctx, "content": content, "pt": pt, "ct": ct}) + b"\n")
+        os.replace(tmp, self.entries_path)
+
+    def search(self, vector: "np.ndarray", context: int, threshold: float) -> Optional[SemanticHit]:
+        if not self.used:
+            return None
+        scores = self.vectors[:self.used] @ vector
+        scores[self.contexts[:self.used] != context] = -1.0
+        best = int(np.argmax(scores))
+        similarity = float(scores[best])
+        if similarity < threshold or best not in self.answers:
+            return None
+        _, content, prompt_tokens, completion_tokens = self.answers[best]
+        return SemanticHit(content, prompt_tokens, completion_tokens, round(similarity, 4))
+
+    def add(self, vector: "np.ndarray", context: int, content: str, prompt_tokens: int, completion_tokens: int) -> None:
+        row = self.next_row
+        if row >= len(self.vectors):
+            self.vectors.flush()
+            self._map(min(self.capacity, len(self.vectors) * 2))
+        self.vectors[row] = vector
+        self.contexts[row] = context
+        self.answers[row] = (context, content, prompt_tokens, completion_tokens)
+        self._pending.append(orjson.dumps({
+            "row": row, "ctx": context, "content": content, "pt": prompt_tokens, "ct": completion_tokens
+        }) + b"\n")
+        self.next_row = (row + 1) % self.capacity
+        self.used = max(self.used, row + 1)
+        if len(self._pending) >= _FLUSH_LINES:
+            self.flush()
+
+    def flush(self) -> None:
+        # Vectors reach the file before the lines that make their rows visible on reload
+        self.vectors.flush()
+        if self._pending:
+            with open(self.entries_path, "ab") as f:
+                f.write(b"".join(self._pending))
+            self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+
+@dataclass
+class _WebsiteStats:
+    hits: int = 0
+    misses: int = 0
+    saved_prompt_tokens: int = 0
+    saved_completion_tokens: int = 0
+
+
+class SemanticCache:
+    """
+    Second cache tier: answers a question that is close enough to one
+    already answered for the same website, model version and context.
+
+    Indexes live under SEMANTIC_CACHE_DIR/slot-<n>/<website>/<model>-<tag>.
+    Each worker process claims a free slot with an exclusive lock, so
+    workers never write the same files, and a restarted worker takes over
+    a previous worker's indexes.
+    """
+
+    def __init__(self, directory: str, threshold: float, max_entries: int):
+        self.directory = Path(directory)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._embedder: Optional[Embedder] = None
+        self._slot: Optional[Path] = None
+        self._lock = None
+        self._indexes: Dict[Tuple[int, int], Tuple[str, VectorIndex]] = {}
+        self._stats: Dict[int, _WebsiteStats] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.SEMANTIC_CACHE_ENABLED and np is not None
+
+    @property
+    def embedder(self) -> Embedder:
+        if self._embedder is None:
+            self._embedder = load_embedder(settings.SEMANTIC_CACHE_EMBEDDER)
+        return self._embedder
+
+    def embed(self, text: str) -> "np.ndarray":
+        return np.asarray(self.embedder.embed(text), dtype=np.float32)
+
+    def _claim_slot(self) -> Path:
+        if self._slot is not None:
+            return self._slot
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slot = 0
+        while fcntl is not None:
+            lock = open(self.directory / f"slot-{slot}.lock", "w")
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock.close()
+                slot += 1
+                continue
+            self._lock = lock
+            break
+        self._slot = self.directory / f"slot-{slot}"
+        return self._slot
+
+    def _index(self, website_id: int, model_id: int, tag: str) -> VectorIndex:
+        current = self._indexes.get((website_id, model_id))
+        if current is not None and current[0] == tag:
+            return current[1]
+        if current is not None:
+            current[1].close()
+        embedder = self.embedder
+        # The file name changes with the model version and the embedder
+        name = hashlib.sha256(f"{tag}|{embedder.name}".encode()).hexdigest()[:16]
+        website_dir = self._claim_slot() / str(website_id)
+        website_dir.mkdir(parents=True, exist_ok=True)
+        for stale in website_dir.glob(f"{model_id}-*"):
+            if not stale.name.startswith(f"{model_id}-{name}."):
+                stale.unlink(missing_ok=True)
+        index = VectorIndex(website_dir / f"{model_id}-{name}", embedder.dim, self.max_entries)
+        self._indexes[(website_id, model_id)] = (tag, index)
+        return index
+
+    def _website_stats(self, website_id: int) -> _WebsiteStats:
+        stats = self._stats.get(website_id)
+        if stats is None:
+            stats = self._stats[website_id] = _WebsiteStats()
+        return stats
+
+    @staticmethod
+    def context_key(question: str, context_hash: str) -> str:
+        """The conversation so far plus the question's numbers and negations"""
+        terms = guard_terms(question)
+        if not terms:
+            return context_hash
+        return hashlib.sha256(f"{context_hash}|{' '.join(terms)}".encode()).hexdigest()
+
+    @staticmethod
+    def _context(context_hash: str) -> int:
+        return int(context_hash[:15], 16)
+
+    def lookup(
+        self,
+        website_id: int,
+        model_id: int,
+        tag: str,
+        vector: "np.ndarray",
+        context_hash: str,
+        threshold: Optional[float] = None
+    ) -> Optional[SemanticHit]:
+        stats = self._website_stats(website_id)
+        hit = self._index(website_id, model_id, tag).search(
+            vector, self._context(context_hash), threshold or self.threshold
+        )
+        if hit is None:
+            stats.misses += 1
+            return None
+        stats.hits += 1
+        stats.saved_prompt_tokens += hit.prompt_tokens
+        stats.saved_completion_tokens += hit.completion_tokens
+        return hit
+
+    def put(
+        self,
+        website_id: int,
+        model_id: int,
+        tag: str,
+        vector: "np.ndarray",
+        context_hash: str,
+        content: str,
+        prompt_tokens: int,
+        completion_tokens: int
+    ) -> None:
+        self._index(website_id, model_id, tag).add(
+            vector, self._context(context_hash), content, prompt_tokens, completion_tokens
+        )
+
+    def invalidate_model(self, model_id: int) -> None:
+        """Close and delete a model's indexes, e.g. after a new version or training run"""
+        for key in [key for key in self._indexes if key[1] == model_id]:
+            self._indexes.pop(key)[1].close()
+        if self._slot is not None and self._slot.exists():
+            for path in self._slot.glob(f"*/{model_id}-*"):
+                path.unlink(missing_ok=True)
+
+    def invalidate_website(self, website_id: int) -> None:
+        for key in [key for key in self._indexes if key[0] == website_id]:
+            self._indexes.pop(key)[1].close()
+        if self._slot is not None:
+            shutil.rmtree(self._slot / str(website_id), ignore_errors=True)
+
+    def stats(self, website_id: Optional[int] = None) -> dict:
+        websites = {}
+        for stats_website_id, stats in self._stats.items():
+            if website_id is not None and stats_website_id != website_id:
+                continue
+            lookups = stats.hits + stats.misses
+            websites[stats_website_id] = {
+                "hits": stats.hits,
+                "misses": stats.misses,
+                "hit_rate": round(stats.hits / lookups, 4) if lookups else None,
+                "saved_tokens": stats.saved_prompt_tokens + stats.saved_completion_tokens,
+            }
+        indexed: List[dict] = [
+            {"website_id": key[0], "model_id": key[1], "entries": len(index.answers), "rows_mapped": len(index.vectors)}
+            for key, (_, index) in self._indexes.items()
+            if website_id is None or key[0] == website_id
+        ]
+        return {
+            "enabled": self.enabled,
+            "numpy_installed": np is not None,
+            "embedder": self._embedder.name if self._embedder else settings.SEMANTIC_CACHE_EMBEDDER,
+            "slot": str(self._slot) if self._slot else None,
+            "indexes": indexed,
+            "websites": websites,
+        }
+
+    def close(self) -> None:
+        for _, index in self._indexes.values():
+            index.close()
+        self._indexes.clear()
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+            self._slot = None
+
+
+semantic_cache = SemanticCache(
+    directory=settings.SEMANTIC_CACHE_DIR,
+    threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+    max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
+)
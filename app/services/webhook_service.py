@@ -0,0 +1,322 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import logging
+import socket
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+import orjson
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.outbox import enqueue, outbox_worker
+from app.models.website import Website
+
+try:
+    import h2  # noqa: F401
+except ImportError:  # h2 is optional; deliveries fall back to HTTP/1.1
+    h2 = None
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_JOB = "webhook.event"
+
+# Chat events
+CHAT_SESSION_STARTED = "chat.session.started"
+CHAT_MESSAGE_CREATED = "chat.message.created"
+CHAT_SESSION_ENDED = "chat.session.ended"
+
+
+def publish_event(db: AsyncSession, website: Website, event_type: str, data: dict) -> None:
+    """
+    Queue an event for the website's webhook in the caller's transaction.
+
+    Delivery waits WEBHOOK_BATCH_WINDOW_SECONDS so events of a busy site
+    are claimed, and POSTed, together.
+    """
+    if not website.webhook_url:
+        return
+    enqueue(
+        db,
+        WEBHOOK_JOB,
+        {
+            "website_id": website.id,
+            "event": {
+                "id": f"evt_{uuid.uuid4().hex}",
+                "type": event_type,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "data": data,
+            },
+        },
+        delay_seconds=settings.WEBHOOK_BATCH_WINDOW_SECONDS
+    )
+
+
+async def _resolve_public(hostname: str, port: int) -> Tuple[Optional[str], List[str]]:
+    """(why the host may not be used or None, its addresses)"""
+    try:
+        addresses = await asyncio.get_running_loop().getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, ValueError):
+        return f"Webhook host {hostname} does not resolve", []
+    resolved = []
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0])
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            return f"Webhook host {hostname} resolves to a non-public address", []
+        resolved.append(sockaddr[0])
+    return None, resolved
+
+
+async def check_webhook_url(url: str) -> Optional[str]:
+    """
+    Why a webhook URL may not be used, or None if it may.
+
+    Only https, and only hosts whose every address is public: private,
+    loopback, link-local and other special-purpose ranges are refused so
+    webhooks cannot reach the internal network. Checked when the URL is
+    saved; deliveries check again on every new connection, see
+    _PublicOnlyBackend.
+    """
+    if settings.WEBHOOK_ALLOW_LOCAL_DESTINATIONS:
+        return None
+    parts = urlsplit(url)
+    if parts.scheme != "https":
+        return "Webhook URL must use https"
+    if not parts.hostname:
+        return "Webhook URL has no host"
+    refused, _ = await _resolve_public(parts.hostname, parts.port or 443)
+    return refused
+
+
+class _PublicOnlyBackend(httpcore.AsyncNetworkBackend):
+    """
+    Resolves, vets and connects in one step, so the socket goes to an
+    address that was checked. Checking the URL and then letting the client
+    resolve the name again would leave a window for DNS rebinding. TLS
+    still uses the hostname for SNI and certificate checks, and the pool
+    keeps one connection per hostname.
+    """
+
+    def __init__(self):
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options=None
+    ) -> httpcore.AsyncNetworkStream:
+        if settings.WEBHOOK_ALLOW_LOCAL_DESTINATIONS:
+            return await self._backend.connect_tcp(host, port, timeout, local_address, socket_options)
+        refused, addresses = await _resolve_public(host, port)
+        if refused:
+            raise httpcore.ConnectError(refused)
+        error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        raise error
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options=None):
+        raise httpcore.ConnectError("Webhooks are only delivered over TCP")
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    """Value of the X-Webhook-Signature header: HMAC-SHA256 over "<timestamp>.<body>" """
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: after `threshold` consecutive failures the host is
+    skipped for `reset_seconds`, then a single trial request decides
+    whether it closes again.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial:
+            self._trial = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self._trial = False
+
+
+class WebhookDispatcher:
+    """
+    Delivers webhook events over one pooled keep-alive client (HTTP/2 when
+    h2 is installed).
+
+    Each host gets its own concurrency limit and circuit breaker, so a slow
+    or failing customer endpoint only ever holds its own slots: its
+    requests time out after WEBHOOK_TIMEOUT_SECONDS, and once its breaker
+    opens it fails fast until the reset period is over. Retries and backoff
+    are the outbox's.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = settings.WEBHOOK_HTTP2 and h2 is not None
+            transport = httpx.AsyncHTTPTransport(http2=http2)
+            # Same pool httpx builds, connecting through the address check
+            transport._pool = httpcore.AsyncConnectionPool(
+                ssl_context=httpx.create_ssl_context(),
+                max_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.WEBHOOK_MAX_CONNECTIONS,
+                keepalive_expiry=30.0,
+                http2=http2,
+                network_backend=_PublicOnlyBackend()
+            )
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(settings.WEBHOOK_TIMEOUT_SECONDS),
+                headers={"User-Agent": f"{settings.PROJECT_NAME} Webhooks/{settings.VERSION}"}
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(
+                settings.WEBHOOK_CIRCUIT_FAILURE_THRESHOLD,
+                settings.WEBHOOK_CIRCUIT_RESET_SECONDS
+            )
+        return breaker
+
+    def _limit(self, host: str) -> asyncio.Semaphore:
+        limit = self._limits.get(host)
+        if limit is None:
+            limit = self._limits[host] = asyncio.Semaphore(settings.WEBHOOK_MAX_CONCURRENCY_PER_HOST)
+        return limit
+
+    async def deliver(self, url: str, secret: str, events: List[dict]) -> Optional[str]:
+        """POST one batch of events; returns an error message, or None when accepted"""
+        # The host's addresses are checked when the connection is made
+        if not settings.WEBHOOK_ALLOW_LOCAL_DESTINATIONS and urlsplit(url).scheme != "https":
+            return "Webhook URL must use https"
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        body = orjson.dumps({"events": events})
+        timestamp = int(time.time())
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Id": events[0]["id"] if len(events) == 1 else f"batch_{uuid.uuid4().hex}",
+            "X-Webhook-Signature": sign(secret, timestamp, body),
+        }
+        try:
+            async with self._limit(host):
+                # Checked after the wait: the breaker may have opened meanwhile
+                if not breaker.allow():
+                    return f"Circuit open for {host}"
+                response = await self.client.post(url, content=body, headers=headers)
+        except httpx.HTTPError as e:
+            breaker.record_failure()
+            return f"{type(e).__name__}: {e}"
+        if response.status_code >= 300:
+            breaker.record_failure()
+            return f"HTTP {response.status_code}"
+        breaker.record_success()
+        return None
+
+    def status(self) -> dict:
+        return {
+            "http2": settings.WEBHOOK_HTTP2 and h2 is not None,
+            "hosts": {
+                host: {"state": breaker.state, "consecutive_failures": breaker.failures}
+                for host, breaker in self._breakers.items()
+            },
+        }
+
+
+webhook_dispatcher = WebhookDispatcher()
+
+
+@outbox_worker.handler(WEBHOOK_JOB, batch_size=200, partition_by=lambda payload: payload["website_id"])
+async def _deliver_webhooks(jobs: List[dict]) -> Dict[int, str]:
+    """
+    One website's claimed events. Runs detached from the outbox worker, so
+    a slow endpoint only delays its own website's events.
+    """
+    website_id = jobs[0]["website_id"]
+    async with AsyncSessionLocal() as db:
+        destination = (await db.execute(
+            select(Website.webhook_url, Website.webhook_secret)
+            .where(Website.id == website_id, Website.is_active == True)
+        )).one_or_none()
+    if destination is None or not destination.webhook_url or not destination.webhook_secret:
+        logger.info(f"Dropping {len(jobs)} webhook events for website {website_id}: no webhook configured")
+        return {}
+
+    # Chunks are POSTed concurrently, within the host's concurrency limit
+    size = settings.WEBHOOK_BATCH_MAX_EVENTS
+    chunks = [range(start, min(start + size, len(jobs))) for start in range(0, len(jobs), size)]
+    results = await asyncio.gather(*(
+        webhook_dispatcher.deliver(
+            destination.webhook_url,
+            destination.webhook_secret,
+            [jobs[i]["event"] for i in chunk]
+        )
+        for chunk in chunks
+    ))
+    failed: Dict[int, str] = {}
+    for chunk, error in zip(chunks, results):
+        if error is not None:
+            failed.update({i: error for i in chunk})
+    return failed
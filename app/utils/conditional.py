@@ -0,0 +1,104 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+# Clients may store responses but must revalidate them on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _variant(request: Request) -> str:
+    """Query parameters that change the representation (fields, page, filters)"""
+    return repr(sorted(request.query_params.multi_items()))
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the given version parts"""
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in (settings.VERSION, *parts)).encode("utf-8"),
+        digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+class CacheValidators:
+    """
+    ETag / Last-Modified for one representation.
+
+    Built from a cheap version pre-query, so a matching conditional request
+    can be answered with 304 before the entity is loaded or serialized.
+    """
+
+    def __init__(self, etag: str, last_modified: Optional[datetime] = None):
+        self.etag = etag
+        self.last_modified = _as_utc(last_modified) if last_modified else None
+
+    @classmethod
+    def for_entity(cls, request: Request, resource: str, version: Any) -> "CacheValidators":
+        """Validators from a (id, updated_at, created_at) version row"""
+        changed_at = version.updated_at or version.created_at
+        return cls(
+            make_etag(
+                resource, version.id, version.created_at, version.updated_at,
+                _variant(request)
+            ),
+            last_modified=changed_at
+        )
+
+    @classmethod
+    def for_collection(cls, request: Request, resource: str, version: Any) -> "CacheValidators":
+        """
+        Validators from a (count, last_changed) collection version.
+
+        No Last-Modified: a hard delete changes the count but not the newest
+        timestamp, which only the ETag captures.
+        """
+        return cls(make_etag(resource, version.count, version.last_changed, _variant(request)))
+
+    def _etag_matches(self, header: str) -> bool:
+        # Weak comparison (RFC 9110 13.1.2)
+        if header.strip() == "*":
+            return True
+        opaque = self.etag[2:]
+        for candidate in header.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == opaque:
+                return True
+        return False
+
+    def is_not_modified(self, request: Request) -> bool:
+        """Evaluate If-None-Match, falling back to If-Modified-Since"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return self._etag_matches(if_none_match)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def apply(self, response: Response) -> Response:
+        """Attach validators to a full response"""
+        response.headers["ETag"] = self.etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        if self.last_modified is not None:
+            response.headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return response
+
+    def not_modified(self) -> Response:
+        return self.apply(Response(status_code=status.HTTP_304_NOT_MODIFIED))
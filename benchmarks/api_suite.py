@@ -0,0 +1,298 @@
+"""
+API benchmark suite with a regression gate.
+
+Boots app.main:app in-process (httpx ASGI transport, one worker) and drives
+each scenario with a fixed number of requests at a fixed concurrency,
+recording p50/p95/p99 latency and throughput:
+
+    login, list_websites, search_websites, get_website, list_companies,
+    get_company, create_website_burst, widget_config
+
+Against a local Postgres (migrated; --setup seeds the benchmark tenant):
+
+    python -m benchmarks.api_suite --setup --update-baseline
+    python -m benchmarks.api_suite --max-regression 15
+
+Against a throwaway SQLite stand-in (needs aiosqlite):
+
+    python -m benchmarks.api_suite --sqlite /tmp/bench.db
+
+Results go to --output; with a baseline file present the run exits 1 when
+a scenario's p95 grows, or its throughput drops, by more than
+--max-regression percent. Baselines are machine-specific: record them on
+the machine that gates.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+class Context:
+    """Credentials and seeded ids shared by the scenarios"""
+
+    def __init__(self):
+        self.api = ""
+        self.company_headers: Dict[str, str] = {}
+        self.admin_headers: Dict[str, str] = {}
+        self.company_id = 0
+        self.website_ids: List[int] = []
+        self.widget_keys: List[str] = []
+        self.login_form: Dict[str, str] = {}
+        self.sequence = itertools.count()
+        self.run_id = f"{int(time.time())}-{os.getpid()}"
+
+
+Operation = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+
+async def _login(client, ctx):
+    return await client.post(f"{ctx.api}/auth/company/login", data=ctx.login_form)
+
+
+async def _list_websites(client, ctx):
+    return await client.get(f"{ctx.api}/websites?page_size=20", headers=ctx.company_headers)
+
+
+async def _search_websites(client, ctx):
+    return await client.get(f"{ctx.api}/websites/search", params={"q": "Site 1"}, headers=ctx.company_headers)
+
+
+async def _get_website(client, ctx):
+    website_id = random.choice(ctx.website_ids)
+    return await client.get(f"{ctx.api}/websites/{website_id}", headers=ctx.company_headers)
+
+
+async def _list_companies(client, ctx):
+    return await client.get(f"{ctx.api}/companies?page_size=20", headers=ctx.admin_headers)
+
+
+async def _get_company(client, ctx):
+    return await client.get(f"{ctx.api}/companies/{ctx.company_id}", headers=ctx.admin_headers)
+
+
+async def _create_website(client, ctx):
+    n = next(ctx.sequence)
+    return await client.post(
+        f"{ctx.api}/websites",
+        json={
+            "website_name": f"Burst {n}",
+            "website_url": f"https://burst-{ctx.run_id}-{n}.example.com",
+            "company_id": ctx.company_id
+        },
+        headers=ctx.company_headers
+    )
+
+
+async def _widget_config(client, ctx):
+    return await client.get(f"{ctx.api}/widget/{random.choice(ctx.widget_keys)}/config")
+
+
+# name -> (operation, requests at --scale 1, concurrency)
+SCENARIOS: Dict[str, tuple] = {
+    "login": (_login, 40, 4),
+    "list_websites": (_list_websites, 1000, 16),
+    "search_websites": (_search_websites, 1000, 16),
+    "get_website": (_get_website, 1000, 16),
+    "list_companies": (_list_companies, 1000, 16),
+    "get_company": (_get_company, 1000, 16),
+    "create_website_burst": (_create_website, 200, 32),
+    "widget_config": (_widget_config, 2000, 32),
+}
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, operation: Operation, requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    remaining = itertools.count()
+
+    async def worker():
+        while next(remaining) < requests:
+            start = time.perf_counter()
+            response = await operation(client, ctx)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+
+    # Warm up connections, caches and compiled statements
+    for _ in range(min(5, requests)):
+        await operation(client, ctx)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / elapsed, 2),
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> List[str]:
+    """Regressions of p95 latency or throughput beyond max_regression percent"""
+    failures = []
+    allowed = max_regression / 100
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if result["p95_ms"] > base["p95_ms"] * (1 + allowed):
+            failures.append(f"{name}: p95 {base['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if result["throughput_rps"] < base["throughput_rps"] * (1 - allowed):
+            failures.append(
+                f"{name}: throughput {base['throughput_rps']:.1f} -> {result['throughput_rps']:.1f} req/s"
+            )
+    return failures
+
+
+async def _setup(benchmark_websites: int) -> None:
+    from app.core.database import Base, engine
+    from app.core.init_db import init_db
+    import app.models  # noqa: F401  (register every table)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await init_db(benchmark_websites=benchmark_websites)
+
+
+async def _login_headers(client: httpx.AsyncClient, path: str, username: str, password: str) -> Dict[str, str]:
+    response = await client.post(path, data={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _context(client: httpx.AsyncClient, api: str) -> Context:
+    from app.core.config import settings
+    from app.core.init_db import BENCHMARK_PASSWORD, BENCHMARK_USERNAME
+
+    ctx = Context()
+    ctx.api = api
+    ctx.login_form = {"username": BENCHMARK_USERNAME, "password": BENCHMARK_PASSWORD}
+    ctx.company_headers = await _login_headers(client, f"{api}/auth/company/login", BENCHMARK_USERNAME, BENCHMARK_PASSWORD)
+    ctx.admin_headers = await _login_headers(
+        client, f"{api}/auth/admin/login", "superadmin", settings.FIRST_SUPERUSER_PASSWORD
+    )
+
+    response = await client.get(f"{api}/websites?page_size=100", headers=ctx.company_headers)
+    response.raise_for_status()
+    websites = response.json()["data"]
+    if not websites:
+        raise SystemExit("Benchmark tenant has no websites; run with --setup")
+    ctx.website_ids = [website["id"] for website in websites]
+
+    for website_id in ctx.website_ids[:20]:
+        response = await client.get(f"{api}/websites/{website_id}", headers=ctx.company_headers)
+        data = response.json()["data"]
+        ctx.company_id = data["company_id"]
+        ctx.widget_keys.append(data["widget_api_key"])
+    return ctx
+
+
+async def run(args: argparse.Namespace) -> int:
+    # Settings are read at import time, so configure before importing the app
+    if args.sqlite:
+        Path(args.sqlite).unlink(missing_ok=True)
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(args.sqlite).resolve()}"
+        args.setup = True
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("ENVIRONMENT", "test")
+
+    from app.core.config import settings
+    from app.core.database import engine
+    from app.main import app
+    from app.services.auth_service import login_bookkeeper
+
+    if args.setup:
+        await _setup(args.benchmark_websites)
+
+    await login_bookkeeper.start()
+    names = args.scenarios or list(SCENARIOS)
+    results = {
+        "recorded_at": datetime.utcnow().isoformat(),
+        "database": engine.dialect.name,
+        "python": platform.python_version(),
+        "scale": args.scale,
+        "scenarios": {},
+    }
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=60) as client:
+        ctx = await _context(client, settings.API_V1_STR)
+        for name in names:
+            operation, requests, concurrency = SCENARIOS[name]
+            result = await run_scenario(
+                client, ctx, operation, max(1, int(requests * args.scale)), concurrency
+            )
+            results["scenarios"][name] = result
+            print(
+                f"{name:22s} {result['throughput_rps']:9.1f} req/s  "
+                f"p50 {result['p50_ms']:8.2f}  p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms"
+                + (f"  errors {result['errors']}" if result["errors"] else "")
+            )
+
+    await login_bookkeeper.stop()
+    await engine.dispose()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"baseline written to {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        print(f"no baseline at {baseline_path}; run with --update-baseline to record one")
+        return 0
+
+    failures = compare(results, json.loads(baseline_path.read_text()), args.max_regression)
+    if failures:
+        print(f"REGRESSION (more than {args.max_regression}%):")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"no regression beyond {args.max_regression}% against {baseline_path}")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the API benchmark suite")
+    parser.add_argument("scenarios", nargs="*", help=f"Default: all of {', '.join(SCENARIOS)}")
+    parser.add_argument("--setup", action="store_true", help="Create tables and seed the benchmark tenant")
+    parser.add_argument("--sqlite", metavar="PATH", help="Use a fresh SQLite database at PATH (implies --setup)")
+    parser.add_argument("--benchmark-websites", type=int, default=200)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every scenario's request count")
+    parser.add_argument("--output", help="Write this run's results as JSON")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=10.0, help="Percent")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+bcrypt cost benchmark.
+
+Reports verify latency and hashes/sec per core for candidate round counts,
+plus the cost the startup calibration would pick for a target verify time.
+
+    python -m benchmarks.bcrypt_cost --rounds 10 11 12 13 --target-ms 100
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.hash import bcrypt
+
+
+def _hash_for(rounds: int, seconds: float) -> int:
+    """Hash repeatedly for `seconds` on one core; return the count"""
+    handler = bcrypt.using(rounds=rounds)
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        handler.hash("benchmark-password")
+        count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure bcrypt hashes/sec per core")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--seconds", type=float, default=3.0, help="Seconds per candidate")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--target-ms", type=float, default=None, help="Also show the calibrated cost")
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6} {'verify ms':>10} {'hash/s/core':>12} {'hash/s total':>13}  ({args.processes} processes)")
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        for rounds in args.rounds:
+            single = _hash_for(rounds, args.seconds)
+            per_core = single / args.seconds
+            counts = list(pool.map(_hash_for, [rounds] * args.processes, [args.seconds] * args.processes))
+            total = sum(counts) / args.seconds
+            print(f"{rounds:>6} {1000 / per_core:>10.1f} {per_core:>12.2f} {total:>13.2f}")
+
+    if args.target_ms:
+        from app.core.config import settings
+        from app.core.security import calibrate_bcrypt_rounds
+
+        chosen = calibrate_bcrypt_rounds(args.target_ms, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS)
+        print(f"calibrated cost for {args.target_ms:.0f} ms target: {chosen} rounds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Login throughput benchmark (logins/sec for a single worker).
+
+Runs the app in-process through httpx's ASGI transport, so the result is the
+capacity of one worker process against the configured database. Pass
+--base-url to measure a running deployment instead.
+
+    python -m benchmarks.login_throughput --username demo_master --password demo123
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+
+async def _worker(client: httpx.AsyncClient, path: str, form: dict, deadline: float, stats: dict) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post(path, data=form)
+        stats["latencies"].append(time.perf_counter() - start)
+        stats["status"][response.status_code] = stats["status"].get(response.status_code, 0) + 1
+
+
+async def run(args: argparse.Namespace) -> None:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        # Throttling would cap the measurement at the login rate limit
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+        from app.main import app
+        from app.services.auth_service import login_bookkeeper
+
+        await login_bookkeeper.start()
+        client = httpx.AsyncClient(app=app, base_url="http://bench", timeout=30)
+
+    from app.core.config import settings
+    path = f"{settings.API_V1_STR}/auth/{args.kind}/login"
+    form = {"username": args.username, "password": args.password}
+    stats = {"latencies": [], "status": {}}
+
+    async with client:
+        # Warm up the pool and the bcrypt backend
+        await client.post(path, data=form)
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            _worker(client, path, form, deadline, stats)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    if not args.base_url:
+        await login_bookkeeper.stop()
+
+    latencies = sorted(stats["latencies"])
+    count = len(latencies)
+    print(f"logins:      {count} in {elapsed:.2f}s (concurrency {args.concurrency})")
+    print(f"throughput:  {count / elapsed:.1f} logins/sec")
+    if count:
+        print(f"latency p50: {latencies[count // 2] * 1000:.1f} ms")
+        print(f"latency p99: {latencies[min(count - 1, int(count * 0.99))] * 1000:.1f} ms")
+    print(f"status:      {stats['status']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure logins/sec per worker")
+    parser.add_argument("--kind", choices=["company", "admin"], default="company")
+    parser.add_argument("--username", default="demo_master")
+    parser.add_argument("--password", default="demo123")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run")
+    parser.add_argument("--base-url", default=None, help="Benchmark a running server instead")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
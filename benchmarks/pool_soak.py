@@ -0,0 +1,169 @@
+"""
+Connection pool soak test: many concurrent clients against one worker.
+
+Starts a local TCP proxy in front of PostgreSQL that admits at most
+--server-connections upstream connections at a time (a stand-in for
+pgbouncer's server pool; it queues clients but does not multiplex
+transactions), points DATABASE_URL at it and drives GET /websites from
+--clients concurrent clients in-process. Compare the pool modes:
+
+    python -m benchmarks.pool_soak --pool-mode internal --clients 1000
+    python -m benchmarks.pool_soak --pool-mode external --clients 1000
+
+Pass --no-proxy to run against DATABASE_URL as configured (e.g. a real
+pgbouncer).
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+from sqlalchemy.engine import make_url
+
+
+class ConnectionCappingProxy:
+    """TCP forwarder with a cap on concurrent upstream connections"""
+
+    def __init__(self, upstream_host: str, upstream_port: int, max_connections: int):
+        self.upstream_host = upstream_host
+        self.upstream_port = upstream_port
+        self._slots = asyncio.Semaphore(max_connections)
+        self._server = None
+        self.port = None
+        self.accepted = 0
+        self.active = 0
+        self.peak = 0
+        self.queued_seconds = 0.0
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    @staticmethod
+    async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, client_reader, client_writer) -> None:
+        self.accepted += 1
+        waited = time.perf_counter()
+        async with self._slots:
+            self.queued_seconds += time.perf_counter() - waited
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection(
+                    self.upstream_host, self.upstream_port
+                )
+            except OSError:
+                self.active -= 1
+                client_writer.close()
+                return
+            try:
+                await asyncio.gather(
+                    self._pipe(client_reader, upstream_writer),
+                    self._pipe(upstream_reader, client_writer)
+                )
+            finally:
+                self.active -= 1
+
+
+async def _client(client: httpx.AsyncClient, path: str, headers: dict, deadline: float, stats: dict) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(path, headers=headers)
+            status = response.status_code
+        except Exception as e:
+            status = type(e).__name__
+        stats["latencies"].append(time.perf_counter() - start)
+        stats["status"][status] = stats["status"].get(status, 0) + 1
+
+
+async def run(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so configure before importing the app
+    os.environ["DB_POOL_MODE"] = args.pool_mode
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    from app.core.config import settings
+
+    proxy = None
+    if not args.no_proxy:
+        url = make_url(settings.DATABASE_URL)
+        proxy = ConnectionCappingProxy(url.host or "localhost", url.port or 5432, args.server_connections)
+        await proxy.start()
+        settings.DATABASE_URL = url.set(host="127.0.0.1", port=proxy.port).render_as_string(
+            hide_password=False
+        )
+
+    from app.core.database import engine
+    from app.main import app
+    from app.services.auth_service import login_bookkeeper
+
+    await login_bookkeeper.start()
+    api = settings.API_V1_STR
+    transport_limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    stats = {"latencies": [], "status": {}}
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=120, limits=transport_limits) as client:
+        response = await client.post(
+            f"{api}/auth/company/login",
+            data={"username": args.username, "password": args.password}
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        path = f"{api}/websites"
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            _client(client, path, headers, deadline, stats)
+            for _ in range(args.clients)
+        ))
+        elapsed = time.perf_counter() - started
+
+    await login_bookkeeper.stop()
+    await engine.dispose()
+    if proxy is not None:
+        await proxy.stop()
+
+    latencies = sorted(stats["latencies"])
+    count = len(latencies)
+    print(f"pool mode:   {args.pool_mode} ({engine.pool.__class__.__name__})")
+    print(f"requests:    {count} in {elapsed:.2f}s ({args.clients} clients)")
+    print(f"throughput:  {count / elapsed:.1f} req/sec")
+    if count:
+        print(f"latency p50: {latencies[count // 2] * 1000:.1f} ms")
+        print(f"latency p99: {latencies[min(count - 1, int(count * 0.99))] * 1000:.1f} ms")
+    print(f"status:      {stats['status']}")
+    if proxy is not None:
+        print(
+            f"proxy:       {proxy.accepted} client connections, peak {proxy.peak} upstream "
+            f"(cap {args.server_connections}), {proxy.queued_seconds:.1f}s queued in total"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Soak test the database pool configuration")
+    parser.add_argument("--pool-mode", choices=["internal", "external"], default="external")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--server-connections", type=int, default=20, help="Proxy upstream cap")
+    parser.add_argument("--no-proxy", action="store_true", help="Use DATABASE_URL as configured")
+    parser.add_argument("--username", default="demo_master")
+    parser.add_argument("--password", default="demo123")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
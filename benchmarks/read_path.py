@@ -0,0 +1,108 @@
+"""
+Read path benchmark: GET /websites with and without the read-only fast path.
+
+Runs the app in-process through httpx's ASGI transport and toggles
+DB_READ_ONLY_FAST_PATH between rounds. On PostgreSQL every statement asyncpg
+sends (BEGIN and COMMIT included) is counted through its query logger, so the
+round trips saved per request show up directly; on other databases only the
+statements SQLAlchemy executes are counted.
+
+    python -m benchmarks.read_path --username demo_master --password demo123
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+from sqlalchemy import event
+
+
+class _RoundTrips:
+    def __init__(self):
+        self.count = 0
+
+    def log_query(self, record) -> None:
+        self.count += 1
+
+    def attach(self, engine) -> None:
+        if engine.dialect.driver == "asyncpg":
+            @event.listens_for(engine.sync_engine, "connect")
+            def _connect(dbapi_connection, connection_record):
+                dbapi_connection._connection.add_query_logger(self.log_query)
+        else:
+            @event.listens_for(engine.sync_engine, "before_cursor_execute")
+            def _execute(conn, cursor, statement, parameters, context, executemany):
+                self.count += 1
+
+
+async def _round(client: httpx.AsyncClient, path: str, headers: dict, requests: int, trips: _RoundTrips) -> dict:
+    latencies = []
+    trips.count = 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+    latencies.sort()
+    return {
+        "round_trips": trips.count / requests,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    from app.core.config import settings
+    from app.core.database import engine
+    from app.main import app
+    from app.services.auth_service import login_bookkeeper
+
+    trips = _RoundTrips()
+    # Fresh pool so every connection gets the logger
+    await engine.dispose()
+    trips.attach(engine)
+    await login_bookkeeper.start()
+
+    api = settings.API_V1_STR
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=30) as client:
+        response = await client.post(
+            f"{api}/auth/company/login",
+            data={"username": args.username, "password": args.password}
+        )
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        path = f"{api}/websites?page_size={args.page_size}"
+
+        results = {}
+        for fast_path in (False, True):
+            settings.DB_READ_ONLY_FAST_PATH = fast_path
+            # Warm the pool and the compiled statement cache
+            await _round(client, path, headers, 10, trips)
+            results[fast_path] = await _round(client, path, headers, args.requests, trips)
+
+    await login_bookkeeper.stop()
+
+    print(f"driver: {engine.dialect.driver}  requests per mode: {args.requests}")
+    for fast_path, label in ((False, "transaction"), (True, "fast path")):
+        result = results[fast_path]
+        print(
+            f"{label:12s} {result['round_trips']:5.1f} round trips/request  "
+            f"p50 {result['p50'] * 1000:6.2f} ms  p99 {result['p99'] * 1000:6.2f} ms"
+        )
+    saved = results[False]["round_trips"] - results[True]["round_trips"]
+    print(f"saved:       {saved:5.1f} round trips/request")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare read-only fast path against transactional reads")
+    parser.add_argument("--username", default="demo_master")
+    parser.add_argument("--password", default="demo123")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Response serialization microbenchmark.
+
+Compares the legacy path (dict from paginated_response, re-validated against
+PaginatedResponse[WebsiteListResponse] by FastAPI, then jsonable_encoder and
+stdlib json) with the fast path (paginated_json) on a 100-item page.
+
+    python -m benchmarks.response_serialization --items 100 --iterations 2000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.schemas.responses import PaginatedResponse, paginated_json, paginated_response
+from app.schemas.website import WebsiteListResponse
+
+
+def _page(items: int):
+    now = datetime.utcnow()
+    return [
+        WebsiteListResponse(
+            id=i,
+            website_name=f"Website {i}",
+            website_url=f"https://site-{i}.example.com/",
+            domain=f"site-{i}.example.com",
+            domain_verified=bool(i % 2),
+            widget_status="active",
+            total_conversations=i * 17,
+            is_active=True,
+            created_at=now
+        )
+        for i in range(items)
+    ]
+
+
+async def _legacy(field, page, total: int) -> bytes:
+    content = paginated_response(data=page, total=total, page=1, page_size=len(page))
+    serialized = await serialize_response(field=field, response_content=content)
+    return JSONResponse(serialized).body
+
+
+def _fast(page, total: int) -> bytes:
+    return paginated_json(data=page, total=total, page=1, page_size=len(page)).body
+
+
+async def run(args: argparse.Namespace) -> None:
+    page = _page(args.items)
+    field = create_response_field(
+        name="response", type_=PaginatedResponse[WebsiteListResponse]
+    )
+
+    legacy_body = await _legacy(field, page, 1000)
+    fast_body = _fast(page, 1000)
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        await _legacy(field, page, 1000)
+    legacy = (time.perf_counter() - start) / args.iterations
+
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        _fast(page, 1000)
+    fast = (time.perf_counter() - start) / args.iterations
+
+    print(f"items per page: {args.items}")
+    print(f"legacy: {legacy * 1e6:9.1f} us/response  ({len(legacy_body)} bytes)")
+    print(f"fast:   {fast * 1e6:9.1f} us/response  ({len(fast_body)} bytes)")
+    print(f"speedup: {legacy / fast:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
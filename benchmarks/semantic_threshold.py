@@ -0,0 +1,94 @@
+"""
+Semantic cache threshold benchmark.
+
+Scores a labelled set of question pairs with the configured embedder:
+paraphrases (the cached answer is right for both) and near misses (it is
+wrong for one of them). Pairs whose number and negation words differ
+never reach the similarity check; the rest pick the threshold. Prints the
+score of every pair and, per candidate threshold, how many paraphrases
+hit and how many near misses would be answered wrongly.
+
+    python -m benchmarks.semantic_threshold --thresholds 0.8 0.85 0.9 0.95
+"""
+import argparse
+
+from app.services.semantic_cache import guard_terms, load_embedder
+from app.core.config import settings
+
+PARAPHRASES = [
+    ("What are your opening hours?", "What are your hours?"),
+    ("What are your opening hours?", "what are your opening hours"),
+    ("How do I reset my password?", "How can I reset my password?"),
+    ("How do I reset my password?", "how do i reset my password please"),
+    ("Do you ship to Canada?", "Do you ship to canada"),
+    ("Do you ship to Canada?", "Do you ship to Canada at all?"),
+    ("Can I return an item?", "Can I return items?"),
+    ("Where is my order?", "Where is my order right now?"),
+    ("How much does shipping cost?", "How much is shipping?"),
+    ("How much does shipping cost?", "how much does the shipping cost"),
+    ("Do you offer gift cards?", "Do you sell gift cards?"),
+    ("Do you offer gift cards?", "do you offer giftcards"),
+    ("How do I cancel my subscription?", "How can I cancel my subscription?"),
+    ("How do I cancel my subscription?", "How do I cancel the subscription?"),
+    ("What payment methods do you accept?", "Which payment methods do you accept?"),
+    ("Is there a student discount?", "Is there a discount for students?"),
+    ("Can I change my delivery address?", "Can I change the delivery address?"),
+    ("How long does delivery take?", "How long does the delivery take?"),
+    ("Refund within 30 days?", "Can I get a refund within 30 days?"),
+    ("I can't log in", "I cannot log in"),
+]
+
+NEAR_MISSES = [
+    ("Can I get a refund after 30 days?", "Can I get a refund after 60 days?"),
+    ("Do you deliver on weekends?", "Don't you deliver on weekends?"),
+    ("Is the warranty 1 year?", "Is the warranty 2 years?"),
+    ("I can log in", "I can't log in"),
+    ("How do I reset my password?", "How do I change my email?"),
+    ("Do you ship to Canada?", "Do you ship to Mexico?"),
+    ("Is the store open on Sunday?", "Is the store open on Monday?"),
+    ("How do I cancel my subscription?", "How do I upgrade my subscription?"),
+    ("Can I return an item?", "Can I exchange an item?"),
+    ("What payment methods do you accept?", "What shipping methods do you offer?"),
+    ("How much does shipping cost?", "How much does express shipping cost?"),
+    ("Do you offer gift cards?", "Do you accept gift cards?"),
+    ("Where is my order?", "Where is my refund?"),
+    ("Is there a student discount?", "Is there a senior discount?"),
+    ("How long does delivery take?", "How long does a refund take?"),
+    ("Can I change my delivery address?", "Can I change my billing address?"),
+]
+
+
+def _score(embedder, pairs):
+    """(similarity, blocked by the guard, pair) per pair"""
+    return [
+        (float(embedder.embed(a) @ embedder.embed(b)), guard_terms(a) != guard_terms(b), (a, b))
+        for a, b in pairs
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pick the semantic cache threshold from labelled pairs")
+    parser.add_argument("--embedder", default=settings.SEMANTIC_CACHE_EMBEDDER)
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.75, 0.8, 0.85, 0.88, 0.9, 0.92, 0.95])
+    args = parser.parse_args()
+
+    embedder = load_embedder(args.embedder)
+    paraphrases = _score(embedder, PARAPHRASES)
+    near_misses = _score(embedder, NEAR_MISSES)
+    for label, scored in (("paraphrase", paraphrases), ("near miss", near_misses)):
+        for similarity, blocked, (a, b) in sorted(scored, reverse=True):
+            print(f"{label:>10} {similarity:6.3f} {'guard' if blocked else '':>5}  {a!r} / {b!r}")
+
+    print(f"\n{embedder.name}, configured threshold {settings.SEMANTIC_CACHE_THRESHOLD}")
+    print(f"{'threshold':>9} {'paraphrase hits':>16} {'wrong answers':>14}")
+    for threshold in args.thresholds:
+        hits = sum(1 for similarity, blocked, _ in paraphrases if not blocked and similarity >= threshold)
+        wrong = sum(1 for similarity, blocked, _ in near_misses if not blocked and similarity >= threshold)
+        print(f"{threshold:>9.2f} {hits:>9}/{len(paraphrases):<6} {wrong:>7}/{len(near_misses):<6}")
+    unguarded = [similarity for similarity, blocked, _ in near_misses if not blocked]
+    if unguarded:
+        print(f"lowest threshold without a wrong answer: above {max(unguarded):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""
+Synthetic large-tenant data for performance testing.
+
+Adds a configurable population on top of an initialised database (the
+plans from init_db are reused): companies, users, websites, AI models,
+chat sessions, chat messages and daily usage analytics. Tenant sizes are
+skewed on purpose: one huge tenant takes --huge-share of every volume and
+the rest follow a Zipf curve (--skew), so most tenants are tiny.
+
+    python -m benchmarks.synthetic_data --companies 2000 --users 50000 \\
+        --websites 20000 --sessions 1000000 --messages 10000000
+
+On PostgreSQL (asyncpg) rows are streamed with binary COPY in batches of
+--batch-size, which loads millions of messages per minute; other drivers
+fall back to multi-row INSERTs. Ids are assigned up front, so no row is
+read back, and the sequences are moved past them afterwards. Every
+synthetic user's password is --password.
+
+A throwaway SQLite database works for trying the generator out:
+
+    python -m benchmarks.synthetic_data --sqlite /tmp/synthetic.db --messages 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import orjson
+from sqlalchemy import JSON, func, select, text
+
+# Generated volumes, in load order (children after parents)
+TABLES = (
+    "client_companies", "resource_allocations", "company_users", "websites",
+    "ai_models", "chat_sessions", "chat_messages", "usage_analytics",
+)
+
+INDUSTRIES = ("Retail", "Technology", "Healthcare", "Finance", "Education", "Travel", "Media")
+MODEL_TYPES = ("gpt-4o-mini", "gpt-4o", "claude-3-haiku", "llama-3-8b")
+USER_MESSAGES = (
+    "Hi, I need help with my order",
+    "What are your opening hours?",
+    "Can I change my delivery address?",
+    "Do you ship internationally?",
+    "How do I reset my password?",
+    "Is there a discount for annual plans?",
+    "My payment failed, what should I do?",
+    "Can I talk to a human agent?",
+)
+ASSISTANT_MESSAGES = (
+    "Sure, could you share your order number?",
+    "We are open Monday to Friday, 9am to 6pm.",
+    "You can update the address from your account page under Orders.",
+    "Yes, we ship to over 40 countries. Rates are shown at checkout.",
+    "Use the 'Forgot password' link on the login page to get a reset email.",
+    "Annual plans are billed at a 20% discount compared to monthly.",
+    "Please check the card details and try again, or use another payment method.",
+    "I'll connect you with an agent. Typical wait time is under five minutes.",
+)
+
+
+def tenant_weights(companies: int, huge_share: float, skew: float) -> List[float]:
+    """One tenant with huge_share of everything, the rest Zipf(skew) distributed"""
+    if companies == 1:
+        return [1.0]
+    tail = [1 / rank ** skew for rank in range(1, companies)]
+    scale = (1 - huge_share) / sum(tail)
+    return [huge_share] + [weight * scale for weight in tail]
+
+
+def allocate(total: int, weights: Sequence[float], minimum: int = 0) -> List[int]:
+    """Split total over weights (largest remainder), at least minimum each"""
+    rest = max(0, total - minimum * len(weights))
+    shares = [rest * weight for weight in weights]
+    counts = [int(share) for share in shares]
+    short = rest - sum(counts)
+    for i in sorted(range(len(weights)), key=lambda i: shares[i] - counts[i], reverse=True)[:short]:
+        counts[i] += 1
+    return [minimum + count for count in counts]
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _Writer:
+    """Streams generated rows into one table per call"""
+
+    def __init__(self, conn, batch_size: int):
+        self.conn = conn
+        self.batch_size = batch_size
+
+    async def _write_batch(self, table, columns: Sequence[str], batch: List[tuple]) -> None:
+        await self.conn.execute(table.insert(), [dict(zip(columns, row)) for row in batch])
+
+    async def write(self, table, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+        started = time.perf_counter()
+        written = 0
+        for batch in _batches(rows, self.batch_size):
+            await self._write_batch(table, columns, batch)
+            written += len(batch)
+        await self.conn.commit()
+        elapsed = time.perf_counter() - started
+        print(f"{table.name:22s} {written:>12,d} rows  {elapsed:8.1f}s  {written / max(elapsed, 1e-9):>12,.0f} rows/s")
+        return written
+
+
+class _CopyWriter(_Writer):
+    """asyncpg binary COPY; JSON columns are sent as text"""
+
+    async def _write_batch(self, table, columns: Sequence[str], batch: List[tuple]) -> None:
+        json_columns = [i for i, name in enumerate(columns) if isinstance(table.c[name].type, JSON)]
+        if json_columns:
+            batch = [
+                tuple(orjson.dumps(value).decode() if i in json_columns else value for i, value in enumerate(row))
+                for row in batch
+            ]
+        raw = await self.conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table.name, columns=list(columns), records=batch)
+
+
+class Generator:
+    def __init__(self, args: argparse.Namespace, first_ids: dict, plan_ids: List[int], password_hash: str):
+        self.args = args
+        self.first = first_ids
+        self.password_hash = password_hash
+        self.random = random.Random(args.seed)
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.span = args.days * 86400
+
+        weights = tenant_weights(args.companies, args.huge_share, args.skew)
+        self.users = allocate(args.users, weights, minimum=1)
+        self.websites = allocate(args.websites, weights, minimum=1)
+        self.sessions = allocate(args.sessions, weights)
+        # The huge tenant gets the largest plan, everyone else a random one
+        self.plans = [plan_ids[-1] if plan_ids else None] + [
+            self.random.choice(plan_ids) if plan_ids else None for _ in range(args.companies - 1)
+        ]
+
+        # Contiguous id ranges per company: (first id, count)
+        self.user_ranges = self._ranges(self.first["company_users"], self.users)
+        self.website_ranges = self._ranges(self.first["websites"], self.websites)
+        self.session_starts: List[float] = []
+
+    @staticmethod
+    def _ranges(first: int, counts: List[int]) -> List[Tuple[int, int]]:
+        ranges = []
+        for count in counts:
+            ranges.append((first, count))
+            first += count
+        return ranges
+
+    def _ago(self, seconds: float, aware: bool = True) -> datetime:
+        moment = self.now - timedelta(seconds=seconds)
+        return moment.replace(tzinfo=timezone.utc) if aware else moment
+
+    def companies(self):
+        columns = ("id", "company_name", "company_email", "contact_person", "industry", "company_size",
+                   "account_status", "resource_plan_id", "is_active", "created_at")
+
+        def rows():
+            for i in range(self.args.companies):
+                company_id = self.first["client_companies"] + i
+                yield (
+                    company_id, f"Synthetic Tenant {company_id}", f"tenant{company_id}@synthetic.example.com",
+                    f"Contact {company_id}", self.random.choice(INDUSTRIES),
+                    "enterprise" if i == 0 else self.random.choice(("small", "medium")),
+                    "active", self.plans[i], True, self._ago(self.random.uniform(0, self.span))
+                )
+        return columns, rows()
+
+    def allocations(self):
+        columns = ("id", "company_id", "plan_id", "current_ai_models", "current_users", "current_websites",
+                   "current_monthly_requests", "is_active")
+
+        def rows():
+            for i in range(self.args.companies):
+                yield (
+                    self.first["resource_allocations"] + i, self.first["client_companies"] + i,
+                    self.plans[i], self.websites[i] * self.args.models_per_website, self.users[i],
+                    self.websites[i], 0, True
+                )
+        return columns, rows()
+
+    def company_users(self):
+        columns = ("id", "username", "email", "password_hash", "first_name", "last_name", "role",
+                   "is_master_user", "company_id", "is_active", "custom_permissions", "failed_login_attempts",
+                   "created_at")
+
+        def rows():
+            for i, (first, count) in enumerate(self.user_ranges):
+                company_id = self.first["client_companies"] + i
+                for user_id in range(first, first + count):
+                    master = user_id == first
+                    yield (
+                        user_id, f"syn_user_{user_id}", f"user{user_id}@synthetic.example.com", self.password_hash,
+                        "Synthetic", f"User {user_id}", "admin" if master else "user", master, company_id, True,
+                        {}, 0, self._ago(self.random.uniform(0, self.span))
+                    )
+        return columns, rows()
+
+    def website_rows(self):
+        columns = ("id", "website_name", "website_url", "domain", "company_id", "widget_status",
+                   "widget_api_key", "allowed_file_types", "allowed_domains", "business_hours", "is_active",
+                   "total_visitors", "total_conversations", "created_at")
+
+        def rows():
+            for i, (first, count) in enumerate(self.website_ranges):
+                company_id = self.first["client_companies"] + i
+                for website_id in range(first, first + count):
+                    domain = f"site{website_id}.synthetic.example.com"
+                    yield (
+                        website_id, f"Site {website_id}", f"https://{domain}", domain, company_id, "active",
+                        f"wgt_syn_{website_id}_{self.random.getrandbits(64):016x}", [], [], {}, True,
+                        0, 0, self._ago(self.random.uniform(0, self.span))
+                    )
+        return columns, rows()
+
+    def models(self):
+        columns = ("model_id", "website_id", "model_name", "model_type", "model_version",
+                   "model_config", "training_data_config", "status")
+        per_website = self.args.models_per_website
+
+        def rows():
+            model_id = self.first["ai_models"]
+            for offset in range(sum(self.websites)):
+                for j in range(per_website):
+                    model_type = MODEL_TYPES[j % len(MODEL_TYPES)]
+                    yield (
+                        model_id, self.first["websites"] + offset, f"{model_type} assistant", model_type, "1.0",
+                        {"temperature": 0.7}, {}, "active"
+                    )
+                    model_id += 1
+        return columns, rows()
+
+    def chat_sessions(self):
+        columns = ("session_id", "website_id", "user_id", "model_id", "session_name", "started_at",
+                   "last_activity_at", "ended_at", "is_active", "session_metadata")
+        rnd = self.random
+        per_website = self.args.models_per_website
+        first_website = self.first["websites"]
+        first_model = self.first["ai_models"]
+
+        def rows():
+            session_id = self.first["chat_sessions"]
+            for i, sessions in enumerate(self.sessions):
+                user_first, user_count = self.user_ranges[i]
+                website_first, website_count = self.website_ranges[i]
+                for _ in range(sessions):
+                    website_id = website_first + rnd.randrange(website_count)
+                    model_id = first_model + (website_id - first_website) * per_website + rnd.randrange(per_website)
+                    ago = rnd.uniform(600, self.span)
+                    self.session_starts.append(ago)
+                    active = ago < 3600
+                    yield (
+                        session_id, website_id, user_first + rnd.randrange(user_count), model_id, None,
+                        self._ago(ago, aware=False), self._ago(ago - 300, aware=False),
+                        None if active else self._ago(ago - 600, aware=False), active, {}
+                    )
+                    session_id += 1
+        return columns, rows()
+
+    def chat_messages(self):
+        columns = ("message_id", "session_id", "message_type", "message_content", "message_metadata",
+                   "created_at", "response_time_ms", "tokens_used", "is_user_message")
+        rnd = self.random
+        tokens = [Decimal(n) for n in range(1000)]
+        average = self.args.messages / max(1, len(self.session_starts))
+        now = self.now
+
+        def rows():
+            message_id = self.first["chat_messages"]
+            remaining = self.args.messages
+            for offset, ago in enumerate(self.session_starts):
+                if remaining <= 0:
+                    break
+                session_id = self.first["chat_sessions"] + offset
+                count = min(remaining, max(1, int(rnd.expovariate(1 / average) + 0.5)))
+                remaining -= count
+                at = now - timedelta(seconds=ago)
+                for n in range(count):
+                    user = n % 2 == 0
+                    pick = rnd.randrange(len(USER_MESSAGES))
+                    at += timedelta(seconds=rnd.randrange(2, 30))
+                    yield (
+                        message_id, session_id, "user" if user else "assistant",
+                        USER_MESSAGES[pick] if user else ASSISTANT_MESSAGES[pick], {}, at,
+                        None if user else rnd.randrange(200, 3000), tokens[rnd.randrange(5, 60 if user else 600)], user
+                    )
+                    message_id += 1
+        return columns, rows()
+
+    def analytics(self):
+        columns = ("analytics_id", "company_id", "website_id", "user_id", "usage_date", "total_requests",
+                   "total_tokens_used", "total_sessions", "avg_response_time_ms")
+        rnd = self.random
+        today = date.today()
+
+        def rows():
+            analytics_id = self.first["usage_analytics"]
+            for i, (website_first, website_count) in enumerate(self.website_ranges):
+                company_id = self.first["client_companies"] + i
+                daily = self.sessions[i] / website_count / max(1, self.args.days)
+                for website_id in range(website_first, website_first + website_count):
+                    for day in range(self.args.analytics_days):
+                        sessions = int(rnd.uniform(0.5, 1.5) * daily + 0.5)
+                        requests = sessions * rnd.randint(2, 12)
+                        yield (
+                            analytics_id, company_id, website_id, None, today - timedelta(days=day), requests,
+                            Decimal(requests * rnd.randint(50, 400)), sessions,
+                            Decimal(rnd.randint(300, 2500)) if requests else Decimal(0)
+                        )
+                        analytics_id += 1
+        return columns, rows()
+
+
+async def _next_ids(conn, tables) -> dict:
+    first = {}
+    for name in TABLES:
+        table = tables[name]
+        pk = list(table.primary_key.columns)[0]
+        first[name] = (await conn.scalar(select(func.coalesce(func.max(pk), 0)))) + 1
+    return first
+
+
+async def _reset_sequences(conn, tables) -> None:
+    for name in TABLES:
+        pk = list(tables[name].primary_key.columns)[0].name
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{name}', '{pk}'), "
+            f"(SELECT COALESCE(MAX({pk}), 1) FROM {name}))"
+        ))
+    await conn.commit()
+
+
+async def run(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so configure before importing the app
+    if args.sqlite:
+        Path(args.sqlite).unlink(missing_ok=True)
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(args.sqlite).resolve()}"
+
+    from app.core.database import Base, engine
+    from app.core.init_db import init_db
+    from app.core.partitions import chat_partition_maintainer
+    from app.core.security import security_service
+    from app.models.resource_plan import ResourcePlan
+    import app.models  # noqa: F401  (register every table)
+
+    if args.sqlite:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await init_db()
+
+    tables = Base.metadata.tables
+    copy = engine.dialect.driver == "asyncpg"
+    # Back-dated messages need their months' partitions (no-op when unpartitioned)
+    await chat_partition_maintainer.maintain(since=(datetime.utcnow() - timedelta(days=args.days + 1)).date())
+    started = time.perf_counter()
+
+    async with engine.connect() as conn:
+        first_ids = await _next_ids(conn, tables)
+        plan_ids = list((await conn.scalars(
+            select(ResourcePlan.id).where(ResourcePlan.is_active.is_(True)).order_by(ResourcePlan.max_websites)
+        )).all())
+        await conn.commit()
+
+        generator = Generator(args, first_ids, plan_ids, security_service.get_password_hash(args.password))
+        writer = (_CopyWriter if copy else _Writer)(conn, args.batch_size)
+        print(
+            f"{'COPY' if copy else 'multi-row INSERT'} into {engine.dialect.name}; largest tenant: "
+            f"{generator.users[0]} users, {generator.websites[0]} websites, {generator.sessions[0]} sessions"
+        )
+
+        total = 0
+        for name, produce in (
+            ("client_companies", generator.companies),
+            ("resource_allocations", generator.allocations),
+            ("company_users", generator.company_users),
+            ("websites", generator.website_rows),
+            ("ai_models", generator.models),
+            ("chat_sessions", generator.chat_sessions),
+            ("chat_messages", generator.chat_messages),
+            ("usage_analytics", generator.analytics),
+        ):
+            columns, rows = produce()
+            total += await writer.write(tables[name], columns, rows)
+
+        if engine.dialect.name == "postgresql":
+            await _reset_sequences(conn, tables)
+            await conn.execute(text(f"ANALYZE {', '.join(TABLES)}"))
+            await conn.commit()
+
+    await engine.dispose()
+    elapsed = time.perf_counter() - started
+    print(f"{'total':22s} {total:>12,d} rows  {elapsed:8.1f}s  {total / max(elapsed, 1e-9):>12,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed skewed synthetic tenants for performance testing")
+    parser.add_argument("--companies", type=int, default=500)
+    parser.add_argument("--users", type=int, default=5000, help="Total, at least one per company")
+    parser.add_argument("--websites", type=int, default=2000, help="Total, at least one per company")
+    parser.add_argument("--models-per-website", type=int, default=1)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--messages", type=int, default=1000000, help="Upper bound; the load prints the actual count")
+    parser.add_argument("--analytics-days", type=int, default=30, help="Daily usage rows per website")
+    parser.add_argument("--days", type=int, default=90, help="Spread activity over the last N days")
+    parser.add_argument("--huge-share", type=float, default=0.3, help="Fraction of every volume in the largest tenant")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent for the remaining tenants")
+    parser.add_argument("--password", default="synthetic123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--sqlite", metavar="PATH", help="Use a fresh SQLite database at PATH (creates tables)")
+    args = parser.parse_args()
+    if args.companies < 1 or args.models_per_website < 1:
+        parser.error("--companies and --models-per-website must be at least 1")
+    if not 0 <= args.huge_share < 1:
+        parser.error("--huge-share must be in [0, 1)")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
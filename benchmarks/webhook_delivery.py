@@ -0,0 +1,233 @@
+"""
+Webhook delivery through the outbox, against local stub receivers.
+
+Starts stub HTTP endpoints on localhost (plain asyncio, keep-alive aware,
+signatures verified), adds a website for a healthy destination and one
+for a slow or failing destination, enqueues events for both plus as many
+jobs of another type, and drives outbox_worker.run_once until nothing is
+due. The report shows that neither the healthy destination nor the other
+jobs wait for the bad destination, and how its circuit breaker behaves:
+
+    python -m benchmarks.webhook_delivery --sqlite /tmp/webhooks.db --events 2000 --slow-ms 8000
+    python -m benchmarks.webhook_delivery --sqlite /tmp/webhooks.db --events 2000 --fail-rate 1
+
+Without --sqlite the configured database is used (it needs a company);
+the benchmark's websites and jobs are deleted afterwards.
+
+To receive a running app's webhooks (started with
+WEBHOOK_ALLOW_LOCAL_DESTINATIONS=true), serve one stub and point a
+website's webhook_url at it:
+
+    python -m benchmarks.webhook_delivery --serve 9000 --secret whsec_...
+"""
+import argparse
+import asyncio
+import hashlib
+import hmac
+import os
+import random
+import secrets
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import orjson
+
+SECRET = "whsec_benchmark"
+OTHER_JOB = "benchmark.other"
+
+
+class StubReceiver:
+    """Minimal HTTP/1.1 webhook endpoint: verifies signatures, counts events"""
+
+    def __init__(self, secret: str, delay: float = 0.0, fail_rate: float = 0.0, verbose: bool = False):
+        self.secret = secret
+        self.delay = delay
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        self.requests = 0
+        self.events = 0
+        self.bad_signatures = 0
+        self.connections = 0
+        self.last_accepted: Optional[float] = None
+
+    def verify(self, header: str, body: bytes) -> bool:
+        parts = dict(part.split("=", 1) for part in header.split(",") if "=" in part)
+        expected = hmac.new(
+            self.secret.encode(), f"{parts.get('t', '')}.".encode() + body, hashlib.sha256
+        ).hexdigest()
+        return hmac.compare_digest(expected, parts.get("v1", ""))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                if not self.verify(headers.get("x-webhook-signature", ""), body):
+                    self.bad_signatures += 1
+                    status = "401 Unauthorized"
+                elif random.random() < self.fail_rate:
+                    status = "503 Service Unavailable"
+                else:
+                    events = orjson.loads(body)["events"]
+                    self.events += len(events)
+                    self.last_accepted = time.perf_counter()
+                    status = "204 No Content"
+                    if self.verbose:
+                        for event in events:
+                            print(f"{event['created_at']}  {event['type']:24s} {orjson.dumps(event['data']).decode()}")
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n\r\n".encode())
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, port: int = 0) -> int:
+        server = await asyncio.start_server(self.handle, "127.0.0.1", port)
+        return server.sockets[0].getsockname()[1]
+
+
+def _event(n: int) -> dict:
+    return {"id": f"evt_{n}", "type": "chat.message.created", "created_at": "", "data": {"message_id": n}}
+
+
+def _since(started: float, at: Optional[float]) -> str:
+    return f"{at - started:7.2f}s" if at is not None else "      -"
+
+
+async def run(args: argparse.Namespace) -> None:
+    # Settings are read at import time, so configure before importing the app
+    os.environ.setdefault("WEBHOOK_TIMEOUT_SECONDS", str(args.timeout))
+    os.environ.setdefault("WEBHOOK_BATCH_MAX_EVENTS", str(args.batch))
+    # The stubs are plain http on loopback, which production settings refuse
+    os.environ.setdefault("WEBHOOK_ALLOW_LOCAL_DESTINATIONS", "true")
+    if args.sqlite:
+        Path(args.sqlite).unlink(missing_ok=True)
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(args.sqlite).resolve()}"
+
+    from sqlalchemy import delete, func, select
+    from app.core.database import AsyncSessionLocal, Base, engine
+    from app.core.init_db import init_db
+    from app.core.outbox import enqueue, outbox_worker
+    from app.models.client_company import ClientCompany
+    from app.models.outbox_job import OutboxJob
+    from app.models.website import Website
+    from app.services.webhook_service import WEBHOOK_JOB, webhook_dispatcher
+    import app.models  # noqa: F401  (register every table)
+
+    if args.sqlite:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await init_db()
+
+    # Stands in for emails and other jobs that share the outbox workers
+    other_done: List[float] = []
+
+    @outbox_worker.handler(OTHER_JOB, batch_size=50)
+    async def _other(payloads: List[dict]) -> None:
+        other_done.append(time.perf_counter())
+
+    healthy = StubReceiver(SECRET)
+    bad = StubReceiver(SECRET, delay=args.slow_ms / 1000, fail_rate=args.fail_rate)
+    urls = {
+        "healthy": f"http://127.0.0.1:{await healthy.start()}/hook",
+        # A different host name gives the bad destination its own limit and breaker
+        "bad": f"http://localhost:{await bad.start()}/hook",
+    }
+
+    async with AsyncSessionLocal() as db:
+        company_id = await db.scalar(select(ClientCompany.id).order_by(ClientCompany.id).limit(1))
+        websites = [
+            Website(
+                company_id=company_id,
+                website_name=f"webhook benchmark {name}",
+                website_url=f"https://{name}.webhook-benchmark.invalid",
+                widget_api_key=secrets.token_urlsafe(32),
+                webhook_url=url,
+                webhook_secret=SECRET
+            )
+            for name, url in urls.items()
+        ]
+        db.add_all(websites)
+        await db.flush()
+        jobs = []
+        for n in range(args.events):
+            # Interleaved, as if both sites were busy at the same time
+            for website in websites:
+                jobs.append(enqueue(db, WEBHOOK_JOB, {"website_id": website.id, "event": _event(n)}))
+            jobs.append(enqueue(db, OTHER_JOB, {"n": n}))
+        await db.commit()
+        website_ids = [website.id for website in websites]
+        job_ids = [job.id for job in jobs]
+
+    started = time.perf_counter()
+    claims = 0
+    while await outbox_worker.run_once():
+        claims += 1
+    claimed_at = time.perf_counter()
+    await outbox_worker.drain()
+    total = time.perf_counter() - started
+    await webhook_dispatcher.close()
+
+    async with AsyncSessionLocal() as db:
+        statuses = dict((await db.execute(
+            select(OutboxJob.status, func.count())
+            .where(OutboxJob.id.in_(job_ids))
+            .group_by(OutboxJob.status)
+        )).all())
+        await db.execute(delete(OutboxJob).where(OutboxJob.id.in_(job_ids)))
+        await db.execute(delete(Website).where(Website.id.in_(website_ids)))
+        await db.commit()
+
+    print(
+        f"events per destination {args.events}, batch {args.batch}, claims {claims}, "
+        f"claiming done {claimed_at - started:.2f}s, total {total:.2f}s"
+    )
+    print(f"other jobs  last done {_since(started, max(other_done, default=None))}")
+    for name, receiver in (("healthy", healthy), ("bad", bad)):
+        print(
+            f"{name:8s}    last accepted {_since(started, receiver.last_accepted)}  posts {receiver.requests:5d}  "
+            f"received {receiver.events:6d} events over {receiver.connections} connections  "
+            f"bad signatures {receiver.bad_signatures}"
+        )
+    print(f"job statuses {statuses}")
+    print(webhook_dispatcher.status())
+
+
+async def serve(port: int, secret: str) -> None:
+    receiver = StubReceiver(secret, verbose=True)
+    await receiver.start(port)
+    print(f"webhook stub listening on http://127.0.0.1:{port}/")
+    await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exercise webhook delivery against local stubs")
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=10, help="Events per POST (WEBHOOK_BATCH_MAX_EVENTS)")
+    parser.add_argument("--sqlite", metavar="PATH", help="Use a fresh SQLite database at PATH (creates tables)")
+    parser.add_argument("--slow-ms", type=float, default=0.0, help="Response delay of the bad destination")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of 503s from the bad destination")
+    parser.add_argument("--timeout", type=float, default=2.0, help="WEBHOOK_TIMEOUT_SECONDS for this run")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="Only run a verbose stub on PORT")
+    parser.add_argument("--secret", default=SECRET, help="Signing secret the stub verifies (--serve)")
+    args = parser.parse_args()
+    if args.serve:
+        asyncio.run(serve(args.serve, args.secret))
+    else:
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
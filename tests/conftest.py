@@ -0,0 +1,64 @@
+"""
+Shared fixtures: the app on a fresh SQLite database seeded by init_db.
+
+Settings are read at import time, so the environment is set here, before
+anything from app is imported. Tests run with the strict query settings
+meant for CI: an endpoint over its QueryBudget, or an implicit lazy load,
+turns into a 500.
+"""
+import os
+import tempfile
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="chatbot-saas-tests-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["QUERY_BUDGET_STRICT"] = "true"
+os.environ["QUERY_RAISE_ON_LAZY_LOAD"] = "true"
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["INFERENCE_DEFAULT_BACKEND"] = "fake"
+
+import httpx
+import pytest
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def application():
+    from app.core.database import Base, engine
+    from app.core.init_db import init_db
+    from app.main import app
+    from app import models  # noqa: F401  (register every table)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await init_db()
+    yield app
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def client(application):
+    async with httpx.AsyncClient(app=application, base_url="http://test") as client:
+        yield client
+
+
+async def _login(client: httpx.AsyncClient, path: str, username: str, password: str) -> dict:
+    response = await client.post(path, data={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+async def company_headers(client):
+    """Demo master user of the demo company (id 1)"""
+    return await _login(client, "/api/v1/auth/company/login", "demo_master", "demo123")
+
+
+@pytest.fixture(scope="session")
+async def admin_headers(client):
+    from app.core.config import settings
+    return await _login(client, "/api/v1/auth/admin/login", "superadmin", settings.FIRST_SUPERUSER_PASSWORD)
@@ -0,0 +1,156 @@
+"""
+chat_messages partitioning on Postgres: the migration, a maintenance pass
+creating and expiring partitions, and the downgrade.
+
+Needs a Postgres server, so it is skipped unless TEST_POSTGRES_URLS lists
+one or more superuser URLs (space separated, e.g. one per major version,
+since DETACH CONCURRENTLY only exists from 14):
+
+    TEST_POSTGRES_URLS="postgresql+asyncpg://postgres@localhost:5413/postgres
+                        postgresql+asyncpg://postgres@localhost:5416/postgres" pytest tests/test_partitions.py
+
+Each run creates (and finally drops) the database chatbot_partitions_test.
+"""
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import anyio
+import pytest
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import partitions
+from app.core.config import settings
+from app.core.partitions import ChatPartitionMaintainer, _month, class_partition, month_partition
+
+pytestmark = pytest.mark.anyio
+
+POSTGRES_URLS = os.environ.get("TEST_POSTGRES_URLS", "").split()
+TEST_DATABASE = "chatbot_partitions_test"
+# The revision before f3a8c5d19b60 partitions chat_messages
+UNPARTITIONED = "c41e7a9b2d58"
+
+
+def _alembic(action: str, revision: str) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(Path(__file__).parent.parent / "alembic"))
+    getattr(command, action)(config, revision)
+
+
+@pytest.fixture(params=POSTGRES_URLS or [None])
+async def postgres(request, monkeypatch):
+    if request.param is None:
+        pytest.skip("TEST_POSTGRES_URLS is not set")
+    admin = create_async_engine(request.param, isolation_level="AUTOCOMMIT", poolclass=NullPool)
+    async with admin.connect() as conn:
+        await conn.execute(text(f"DROP DATABASE IF EXISTS {TEST_DATABASE}"))
+        await conn.execute(text(f"CREATE DATABASE {TEST_DATABASE}"))
+    url = make_url(request.param).set(database=TEST_DATABASE)
+    # alembic/env.py takes the URL from the environment
+    monkeypatch.setenv("DATABASE_URL", url.render_as_string(hide_password=False))
+    bind = create_async_engine(url, poolclass=NullPool)
+    yield bind
+    await bind.dispose()
+    async with admin.connect() as conn:
+        await conn.execute(text(f"DROP DATABASE IF EXISTS {TEST_DATABASE} WITH (FORCE)"))
+    await admin.dispose()
+
+
+async def _seed(bind, statements) -> None:
+    async with bind.begin() as conn:
+        # Sessions without the websites, users and models their foreign keys want
+        await conn.execute(text("SET LOCAL session_replication_role = replica"))
+        for statement, params in statements:
+            await conn.execute(text(statement), params)
+
+
+async def _messages(bind) -> list:
+    async with bind.connect() as conn:
+        return (await conn.execute(text(
+            "SELECT message_content, tableoid::regclass::text AS partition FROM chat_messages ORDER BY message_id"
+        ))).all()
+
+
+async def test_migrate_maintain_and_downgrade(postgres, monkeypatch):
+    now = datetime.utcnow()
+    today = now.date()
+    old = now - timedelta(days=150)
+    session = (
+        "INSERT INTO chat_sessions (session_id, website_id, user_id, model_id, started_at, last_activity_at, "
+        "is_active) VALUES (:id, 1, 1, 1, :at, :at, true)"
+    )
+    message = (
+        "INSERT INTO chat_messages (session_id, message_type, message_content, created_at, is_user_message) "
+        "VALUES (:session, 'user', :content, :at, true)"
+    )
+
+    await anyio.to_thread.run_sync(_alembic, "upgrade", UNPARTITIONED)
+    await _seed(postgres, [
+        (session, {"id": 1, "at": old}),
+        (message, {"session": 1, "content": "old", "at": old}),
+        (message, {"session": 1, "content": "new", "at": now}),
+    ])
+
+    await anyio.to_thread.run_sync(_alembic, "upgrade", "head")
+    assert await _messages(postgres) == [
+        ("old", month_partition(0, _month(old.date()))),
+        ("new", month_partition(0, _month(today))),
+    ]
+
+    # A 30 day session whose first month has long expired
+    await _seed(postgres, [
+        (
+            "INSERT INTO chat_sessions (session_id, website_id, user_id, model_id, started_at, last_activity_at, "
+            "is_active, retention_days) VALUES (2, 1, 1, 1, :at, :at, true, 30)",
+            {"at": old}
+        ),
+        (
+            "INSERT INTO chat_messages (session_id, message_type, message_content, created_at, is_user_message, "
+            "retention_days) VALUES (2, 'user', 'expired', :at, true, 30)",
+            {"at": old}
+        ),
+    ])
+
+    # A class added after the migration gets its partitions on the next pass
+    monkeypatch.setattr(settings, "CHAT_RETENTION_CLASSES_DAYS", settings.CHAT_RETENTION_CLASSES_DAYS + [60])
+    maintainer = ChatPartitionMaintainer(interval_hours=1, premake_months=3, lock_timeout=5, bind=postgres)
+    result = await maintainer.maintain(today=today)
+    assert result["partitioned"]
+    assert class_partition(60) in result["created"]
+    assert month_partition(60, _month(today, 3)) in result["created"]
+    assert month_partition(30, _month(old.date())) in result["dropped"]
+    assert not any(name.startswith(class_partition(0) + "_") for name in result["dropped"])
+    assert 60 in maintainer.usable_classes and 0 in maintainer.usable_classes
+    assert result["running_out"] == {}
+    assert [row.message_content for row in await _messages(postgres)] == ["old", "new"]
+
+    # Months ahead are created as time goes on
+    later = _month(today, 2)
+    result = await maintainer.maintain(today=later)
+    assert month_partition(0, _month(later, 3)) in result["created"]
+
+    # Nothing made ahead: every class runs out within the month
+    stalled = ChatPartitionMaintainer(interval_hours=1, premake_months=0, lock_timeout=5, bind=postgres)
+    result = await stalled.maintain(today=_month(today, 6))
+    assert set(result["running_out"]) == {0, 30, 60, 90, 180, 365, 730, 1825}
+    assert stalled.usable_classes == set()
+
+    await anyio.to_thread.run_sync(_alembic, "downgrade", UNPARTITIONED)
+    assert [row.message_content for row in await _messages(postgres)] == ["old", "new"]
+    async with postgres.connect() as conn:
+        assert not await ChatPartitionMaintainer.is_partitioned(conn)
+
+
+def test_retention_class_skips_classes_without_partitions(monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_RETENTION_CLASSES_DAYS", [30, 60, 90])
+    monkeypatch.setattr(partitions.chat_partition_maintainer, "usable_classes", None)
+    assert partitions.retention_class(45) == 60
+    monkeypatch.setattr(partitions.chat_partition_maintainer, "usable_classes", {30, 90, 0})
+    assert partitions.retention_class(45) == 90
+    assert partitions.retention_class(100) == 0
+    assert partitions.retention_class(None) == 0
@@ -0,0 +1,90 @@
+"""
+Every endpoint that declares a QueryBudget, run under QUERY_BUDGET_STRICT
+and QUERY_RAISE_ON_LAZY_LOAD (see conftest): going over the budget,
+repeating a query N+1 style or lazy loading a relationship fails the
+request with a 500.
+"""
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+API = "/api/v1"
+
+
+@pytest.fixture(scope="module")
+async def website(client, company_headers):
+    response = await client.post(
+        f"{API}/websites",
+        json={"website_name": "Budget", "website_url": "https://budget.example.com", "company_id": 1},
+        headers=company_headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["data"]
+
+
+@pytest.fixture(scope="module")
+async def chat_session(client, company_headers, website):
+    from app.core.database import AsyncSessionLocal
+    from app.models.ai_model import AiModel
+
+    async with AsyncSessionLocal() as db:
+        db.add(AiModel(
+            website_id=website["id"],
+            model_name="Budget model",
+            model_type="gpt-test",
+            model_version="v1",
+            status="active",
+            model_config={}
+        ))
+        await db.commit()
+    response = await client.post(
+        f"{API}/chat/sessions", json={"website_id": website["id"]}, headers=company_headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["data"]
+
+
+async def test_company_user_reads(client, company_headers, website):
+    paths = [
+        "/websites",
+        f"/websites/{website['id']}",
+        f"/websites/{website['id']}?fields=website_name,webhook_url",
+        "/websites/search?q=Bud",
+        "/users",
+        "/users/1",
+    ]
+    for path in paths:
+        response = await client.get(f"{API}{path}", headers=company_headers)
+        assert response.status_code == 200, f"{path}: {response.text}"
+
+
+async def test_admin_reads(client, admin_headers):
+    for path in ["/companies", "/companies/search?q=Demo", "/companies/1", "/websites/admin/company/1"]:
+        response = await client.get(f"{API}{path}", headers=admin_headers)
+        assert response.status_code == 200, f"{path}: {response.text}"
+
+
+async def test_widget_config(client, website):
+    response = await client.get(f"{API}/widget/{website['widget_api_key']}/config")
+    assert response.status_code == 200, response.text
+
+
+async def test_website_update(client, company_headers, website):
+    # ORM UPDATEs pass through the lazy-load guard too
+    response = await client.put(
+        f"{API}/websites/{website['id']}",
+        json={"description": "Updated under strict query settings"},
+        headers=company_headers
+    )
+    assert response.status_code == 200, response.text
+
+
+async def test_chat(client, company_headers, chat_session):
+    session_id = chat_session["session_id"]
+    for content in ("Hello", "What are your opening hours?"):
+        response = await client.post(
+            f"{API}/chat/sessions/{session_id}/messages", json={"content": content}, headers=company_headers
+        )
+        assert response.status_code == 200, response.text
+    response = await client.post(f"{API}/chat/sessions/{session_id}/end", headers=company_headers)
+    assert response.status_code == 200, response.text